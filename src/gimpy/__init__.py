@@ -4,6 +4,12 @@ from . import graph
 from . import examples
 from .tree import Tree
 from .tree import BinaryTree
+from .frozen_graph import FrozenGraph
+from .landmarks import Landmarks
+from .contraction import ContractionHierarchy
+from .bucket_queue import BucketQueue
+from .indexed_heap import IndexedHeap
+from .dynamic_mst import DynamicMST
 
 Graph = graph.Graph
 DisjointSet = graph.DisjointSet
@@ -12,3 +18,4 @@ DOT2TEX_INSTALLED = graph.DOT2TEX_INSTALLED
 PIL_INSTALLED = graph.PIL_INSTALLED
 XDOT_INSTALLED = graph.XDOT_INSTALLED
 ETREE_INSTALLED = graph.ETREE_INSTALLED
+NUMPY_INSTALLED = graph.NUMPY_INSTALLED
@@ -0,0 +1,127 @@
+'''
+Bucket priority queue for Dijkstra's algorithm with small integer costs
+(Dial's algorithm).
+
+When arc costs are integers in [0, C], every priority in Dijkstra's queue is
+between the smallest priority d and d+C. BucketQueue keeps C+1 buckets in a
+circular array, an item with priority p is kept in bucket p mod (C+1). Push,
+decrease and removal take O(1) time and finding the smallest priority moves a
+cursor forward over empty buckets, O(nC) in total over a search, instead of
+O(log n) heap operations.
+
+Buckets are insertion ordered dictionaries, so items with the same priority
+come out in the order they were (last) pushed, as in blimpy's PriorityQueue.
+BucketQueue has the methods of PriorityQueue that Graph.search() uses and can
+be passed as its q argument.
+'''
+from __future__ import absolute_import
+from builtins import object
+from builtins import range
+
+class BucketQueue(object):
+    '''
+    Circular array of buckets, see module documentation.
+    '''
+    def __init__(self, max_cost):
+        '''
+        API: __init__(self, max_cost)
+        Description:
+        Creates an empty queue.
+        Input:
+            max_cost: Largest arc cost C. Priorities in the queue should be
+            within C of each other and should not be smaller than the last
+            smallest priority.
+        Post:
+            Sets self.buckets, self.priority, self.cursor and self.size.
+        '''
+        self.buckets = [{} for i in range(int(max_cost)+1)]
+        # key -> priority
+        self.priority = {}
+        # smallest priority that can be in the queue
+        self.cursor = 0
+        self.size = 0
+
+    def isEmpty(self):
+        '''
+        API: isEmpty(self)
+        Description:
+        Returns True if the queue has no items, False otherwise.
+        '''
+        return self.size == 0
+
+    def push(self, key, priority = None):
+        '''
+        API: push(self, key, priority = None)
+        Description:
+        Inserts key with priority or changes the priority of key.
+        Input:
+            key: Item to insert.
+            priority: Integer priority, key is used if not given. Raises
+            Exception if it is not an integer.
+        '''
+        if priority is None:
+            priority = key
+        if int(priority) != priority:
+            raise Exception('Priority %s is not an integer!' %str(priority))
+        priority = int(priority)
+        if self.size == 0:
+            self.cursor = priority
+        elif (priority < self.cursor or
+              priority >= self.cursor + len(self.buckets)):
+            raise Exception('Priority %s is out of the range of the bucket '
+                            'queue!' %str(priority))
+        if key in self.priority:
+            self.remove(key)
+        self.priority[key] = priority
+        self.buckets[priority % len(self.buckets)][key] = None
+        self.size += 1
+
+    def remove(self, key):
+        '''
+        API: remove(self, key)
+        Description:
+        Removes key from the queue. Raises KeyError if key is not in the
+        queue.
+        '''
+        priority = self.priority.pop(key)
+        del self.buckets[priority % len(self.buckets)][key]
+        self.size -= 1
+
+    def peek(self, key = None):
+        '''
+        API: peek(self, key = None)
+        Description:
+        Returns the item with the smallest priority if key is not given,
+        priority of key otherwise (None if key is not in the queue).
+        '''
+        if key is not None:
+            return self.priority.get(key)
+        if self.size == 0:
+            raise KeyError('peek at an empty bucket queue')
+        buckets = self.buckets
+        num = len(buckets)
+        while not buckets[self.cursor % num]:
+            self.cursor += 1
+        return next(iter(buckets[self.cursor % num]))
+
+    def pop(self, key = None):
+        '''
+        API: pop(self, key = None)
+        Description:
+        Removes and returns the item with the smallest priority if key is not
+        given, removes key otherwise.
+        '''
+        if key is not None:
+            self.remove(key)
+            return
+        key = self.peek()
+        self.remove(key)
+        return key
+
+    def get_priority(self, key):
+        '''
+        API: get_priority(self, key)
+        Description:
+        Returns priority of key, None if key is not in the queue.
+        '''
+        return self.priority.get(key)
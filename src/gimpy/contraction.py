@@ -0,0 +1,372 @@
+'''
+Contraction hierarchy index for point to point shortest path queries.
+
+Nodes are contracted one at a time in the order of their priority. When
+node v is contracted, a shortcut arc (u,w) with cost c(u,v)+c(v,w) is added
+for every pair of remaining neighbors u and w unless a witness search, a
+local Dijkstra search from u that does not use v, finds a path from u to w
+that is not longer. The priority of a node is its edge difference (number
+of shortcuts its contraction adds minus the number of its arcs) plus the
+number of its contracted neighbors. Priorities are updated lazily, a node is
+contracted only if its updated priority is still the smallest one.
+
+The rank of a node is its position in the contraction order. A query runs
+Dijkstra forward from the source on arcs that go up in rank and backward
+from the destination on arcs that come down in rank. The shortest path goes
+up and then down, so both searches meet on its highest node and they only
+scan a small part of the graph. Shortcuts on the path are replaced by the
+two arcs they were made of.
+
+The index keeps the upward and downward graphs in CSR form, in arrays, and
+shortcut middle nodes in three arrays. It can be written to a file with
+save() and read back with load(). It is not updated when the graph changes.
+'''
+from __future__ import absolute_import
+from builtins import object
+from builtins import range
+
+from array import array
+import heapq
+import pickle # for dump(), load()
+
+class ContractionHierarchy(object):
+    '''
+    Contraction hierarchy of a graph. See module documentation.
+    '''
+    def __init__(self, names, rank, up, down, shortcuts):
+        '''
+        API: __init__(self, names, rank, up, down, shortcuts)
+        Description:
+        Should not be called directly, see Graph.contraction_hierarchy(),
+        build() and load().
+        Input:
+            names: List of node names, node ids are positions in this list.
+            rank: Array of ranks indexed by node ids.
+            up: (offsets, targets, costs) arrays of arcs (i,j) with
+            rank[i] < rank[j], listed at i.
+            down: (offsets, sources, costs) arrays of arcs (j,i) with
+            rank[j] > rank[i], listed at i.
+            shortcuts: (tails, heads, middles) arrays of shortcut arcs.
+        Post:
+            Sets self.names, self.index, self.rank, self.up, self.down and
+            self.middle.
+        '''
+        self.names = names
+        self.index = dict((name, i) for i, name in enumerate(names))
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.shortcuts = shortcuts
+        tails, heads, middles = shortcuts
+        self.middle = dict(((tails[k], heads[k]), middles[k])
+                           for k in range(len(tails)))
+
+    @staticmethod
+    def build(fg, witness_limit = 100):
+        '''
+        API: build(fg, witness_limit = 100)
+        Description:
+        Contracts nodes of frozen graph fg and returns the hierarchy.
+        Input:
+            fg: FrozenGraph instance with 'cost' edge column.
+            witness_limit: Number of nodes a witness search can settle. Small
+            limits add more shortcuts but make preprocessing faster.
+        Pre:
+            Costs should be nonnegative.
+        Return:
+            Returns ContractionHierarchy instance.
+        '''
+        n = len(fg.names)
+        cost = fg.edge_columns['cost']
+        # remaining graph, out_arcs[i][j] and in_arcs[j][i] are cost of (i,j)
+        out_arcs = [{} for i in range(n)]
+        in_arcs = [{} for i in range(n)]
+        offsets = fg.out_offsets
+        targets = fg.out_targets
+        edges = fg.out_edges
+        for i in range(n):
+            for k in range(offsets[i], offsets[i+1]):
+                j = targets[k]
+                c = cost[edges[k]]
+                if i != j and c < out_arcs[i].get(j, float('inf')):
+                    out_arcs[i][j] = c
+                    in_arcs[j][i] = c
+        middle = {}
+        deleted = array('l', [0])*n
+        rank = array('l', [-1])*n
+        up_arcs = [None]*n
+        down_arcs = [None]*n
+        witness = ContractionHierarchy.witness_search
+        def contract(v, simulate):
+            # returns shortcuts needed to contract v as (u, w, cost) tuples
+            shortcuts = []
+            out_v = out_arcs[v]
+            if not out_v:
+                return shortcuts
+            max_out = max(out_v.values())
+            for u, c_uv in in_arcs[v].items():
+                limit = c_uv + max_out
+                distance = witness(out_arcs, u, v, limit, witness_limit)
+                for w, c_vw in out_v.items():
+                    if w == u:
+                        continue
+                    c = c_uv + c_vw
+                    if distance.get(w, float('inf')) > c:
+                        shortcuts.append((u, w, c))
+                        if simulate and len(shortcuts) > 4*len(out_v):
+                            return shortcuts
+            return shortcuts
+        def priority(v):
+            return (len(contract(v, True)) - len(in_arcs[v]) -
+                    len(out_arcs[v]) + deleted[v])
+        heap = [(priority(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            p, v = heapq.heappop(heap)
+            p = priority(v)
+            if heap and p > heap[0][0]:
+                # lazy update, priority grew
+                heapq.heappush(heap, (p, v))
+                continue
+            for u, w, c in contract(v, False):
+                if c < out_arcs[u].get(w, float('inf')):
+                    out_arcs[u][w] = c
+                    in_arcs[w][u] = c
+                    middle[(u, w)] = v
+            rank[v] = order
+            order += 1
+            up_arcs[v] = out_arcs[v]
+            down_arcs[v] = in_arcs[v]
+            for u in in_arcs[v]:
+                del out_arcs[u][v]
+                deleted[u] += 1
+            for w in out_arcs[v]:
+                del in_arcs[w][v]
+                deleted[w] += 1
+            out_arcs[v] = {}
+            in_arcs[v] = {}
+        # keep only shortcuts that are arcs of the hierarchy
+        shortcuts = (array('l'), array('l'), array('l'))
+        for v in range(n):
+            for w in up_arcs[v]:
+                if (v, w) in middle:
+                    shortcuts[0].append(v)
+                    shortcuts[1].append(w)
+                    shortcuts[2].append(middle[(v, w)])
+            for u in down_arcs[v]:
+                if (u, v) in middle:
+                    shortcuts[0].append(u)
+                    shortcuts[1].append(v)
+                    shortcuts[2].append(middle[(u, v)])
+        return ContractionHierarchy(list(fg.names), rank,
+                                    ContractionHierarchy.make_csr(up_arcs),
+                                    ContractionHierarchy.make_csr(down_arcs),
+                                    shortcuts)
+
+    @staticmethod
+    def witness_search(out_arcs, source, avoid, limit, settle_limit):
+        '''
+        API: witness_search(out_arcs, source, avoid, limit, settle_limit)
+        Description:
+        Dijkstra search from source in the remaining graph that does not use
+        node avoid. Stops when the smallest label is larger than limit or
+        settle_limit nodes are settled. Used by build().
+        Return:
+            Returns dictionary of distance labels.
+        '''
+        distance = {source:0}
+        done = set()
+        heap = [(0, source)]
+        while heap and len(done) < settle_limit:
+            d, i = heapq.heappop(heap)
+            if i in done:
+                continue
+            if d > limit:
+                break
+            done.add(i)
+            for j, c in out_arcs[i].items():
+                if j == avoid:
+                    continue
+                estimate = d + c
+                if estimate < distance.get(j, float('inf')):
+                    distance[j] = estimate
+                    heapq.heappush(heap, (estimate, j))
+        return distance
+
+    @staticmethod
+    def make_csr(arcs):
+        '''
+        API: make_csr(arcs)
+        Description:
+        Converts a list of {node: cost} dictionaries to (offsets, nodes,
+        costs) arrays. Used by build().
+        '''
+        offsets = array('l', [0])
+        nodes = array('l')
+        costs = array('d')
+        for a in arcs:
+            for j, c in a.items():
+                nodes.append(j)
+                costs.append(c)
+            offsets.append(len(nodes))
+        return (offsets, nodes, costs)
+
+    def get_shortcut_num(self):
+        '''
+        API: get_shortcut_num(self)
+        Description:
+        Returns number of shortcut arcs in the hierarchy.
+        '''
+        return len(self.shortcuts[0])
+
+    def query_search(self, source, destination):
+        '''
+        API: query_search(self, source, destination)
+        Description:
+        Runs upward searches from source and destination. Used by
+        distance() and query().
+        Input:
+            source: Source node id.
+            destination: Destination node id.
+        Return:
+            Returns (mu, meet, pred, pred_back) where mu is the shortest
+            distance (inf if there is no path), meet is the highest node on
+            the shortest path and pred and pred_back are predecessor
+            dictionaries of the forward and backward searches.
+        '''
+        inf = float('inf')
+        sides = (self.up, self.down)
+        distance = ({source:0}, {destination:0})
+        pred = ({}, {})
+        done = (set(), set())
+        heap = ([(0, source)], [(0, destination)])
+        mu = inf
+        meet = None
+        if source == destination:
+            mu = 0
+            meet = source
+        while heap[0] or heap[1]:
+            # scan the side with the smaller label, a side stops when its
+            # smallest label is at least mu
+            if heap[0] and (not heap[1] or heap[0][0][0] <= heap[1][0][0]):
+                side = 0
+            else:
+                side = 1
+            d, i = heapq.heappop(heap[side])
+            if d >= mu:
+                del heap[side][:]
+                continue
+            if i in done[side]:
+                continue
+            done[side].add(i)
+            offsets, nodes, costs = sides[side]
+            distance_side = distance[side]
+            distance_other = distance[1-side]
+            for k in range(offsets[i], offsets[i+1]):
+                j = nodes[k]
+                estimate = d + costs[k]
+                if estimate < distance_side.get(j, inf):
+                    distance_side[j] = estimate
+                    pred[side][j] = i
+                    heapq.heappush(heap[side], (estimate, j))
+                    if j in distance_other:
+                        length = estimate + distance_other[j]
+                        if length < mu:
+                            mu = length
+                            meet = j
+            if i in distance_other and d + distance_other[i] < mu:
+                mu = d + distance_other[i]
+                meet = i
+        return mu, meet, pred[0], pred[1]
+
+    def distance(self, source, destination):
+        '''
+        API: distance(self, source, destination)
+        Description:
+        Returns shortest distance from source to destination.
+        Input:
+            source: Source node name.
+            destination: Destination node name.
+        Return:
+            Returns the distance, inf if there is no path.
+        '''
+        return self.query_search(self.index[source],
+                                 self.index[destination])[0]
+
+    def query(self, source, destination):
+        '''
+        API: query(self, source, destination)
+        Description:
+        Finds a shortest path from source to destination.
+        Input:
+            source: Source node name.
+            destination: Destination node name.
+        Return:
+            Returns list of node names in a shortest path from source to
+            destination, None if there is no path.
+        '''
+        s = self.index[source]
+        t = self.index[destination]
+        mu, meet, pred, pred_back = self.query_search(s, t)
+        if meet is None:
+            return None
+        # arcs of the hierarchy on the path
+        arcs = []
+        current = meet
+        while current != s:
+            arcs.append((pred[current], current))
+            current = pred[current]
+        arcs.reverse()
+        current = meet
+        while current != t:
+            arcs.append((current, pred_back[current]))
+            current = pred_back[current]
+        path = [s]
+        middle = self.middle
+        stack = list(reversed(arcs))
+        while stack:
+            u, w = stack.pop()
+            if (u, w) in middle:
+                v = middle[(u, w)]
+                stack.append((v, w))
+                stack.append((u, v))
+            else:
+                path.append(w)
+        return [self.names[i] for i in path]
+
+    def save(self, filename):
+        '''
+        API: save(self, filename)
+        Description:
+        Writes the hierarchy to file filename.
+        Input:
+            filename: Name of the file.
+        '''
+        data = {'names':self.names, 'rank':self.rank, 'up':self.up,
+                'down':self.down, 'shortcuts':self.shortcuts}
+        f = open(filename, 'wb')
+        try:
+            pickle.dump(data, f, 2)
+        finally:
+            f.close()
+
+    @staticmethod
+    def load(filename):
+        '''
+        API: load(filename)
+        Description:
+        Reads a hierarchy written by save(). Only read files from trusted
+        sources, the file is unpickled.
+        Input:
+            filename: Name of the file.
+        Return:
+            Returns ContractionHierarchy instance.
+        '''
+        f = open(filename, 'rb')
+        try:
+            data = pickle.load(f)
+        finally:
+            f.close()
+        return ContractionHierarchy(data['names'], data['rank'], data['up'],
+                                    data['down'], data['shortcuts'])
@@ -0,0 +1,368 @@
+'''
+Minimum spanning tree (forest) that is updated when edges are added,
+removed or repriced, instead of being recomputed.
+
+The forest is kept as rooted trees with parent pointers. Every node also
+keeps the edge to its parent, its tree neighbors and its non-tree neighbors.
+Path between two nodes of a tree is found by climbing from both ends in
+turns until a node seen by the other end is reached. This takes time in the
+order of the path length and needs no depths, so nothing below a node is
+touched when the tree changes. Rerooting a tree at node w reverses parent
+pointers on the path from w to the root.
+
+  Adding edge (u,v) or decreasing its cost: If u and v are in different
+      trees, the trees are linked with (u,v). Otherwise (u,v) closes a cycle
+      with the tree path from u to v. If the most expensive edge on the path
+      costs more than (u,v), it is replaced with (u,v). Either way the work
+      is in the order of the path length.
+  Removing a tree edge or increasing its cost: The tree is cut in two. Both
+      parts are searched in turns, so the search stops after the smaller
+      part is found. The cheapest non-tree edge leaving the smaller part
+      reconnects the tree, if there is one.
+
+Non-tree edges that are removed or get more expensive and tree edges that
+get cheaper do not change the forest.
+'''
+from __future__ import absolute_import
+from builtins import object
+
+from .global_constants import *
+
+class DynamicMST(object):
+    '''
+    Minimum spanning forest of an undirected graph under edge updates. See
+    module documentation.
+    '''
+    def __init__(self, nodes, costs, tree):
+        '''
+        API: __init__(self, nodes, costs, tree)
+        Description:
+        Should not be called directly, see
+        Graph.dynamic_minimum_spanning_tree().
+        Input:
+            nodes: List of node names.
+            costs: Dictionary of edge costs keyed by (source,sink) tuples.
+            tree: List of edges of a minimum spanning forest, keys of costs.
+        Post:
+            Sets self.cost, self.parent, self.up, self.tree, self.others and
+            self.weight.
+        '''
+        self.cost = dict(costs)
+        # parent[n] is None for roots, up[n] is the edge to the parent
+        self.parent = {}
+        self.up = {}
+        # tree and non-tree neighbors
+        self.tree = {}
+        self.others = {}
+        self.weight = 0
+        for n in nodes:
+            self.add_node(n)
+        in_tree = set(tree)
+        for e in self.cost:
+            if e not in in_tree:
+                self.others[e[0]].add(e[1])
+                self.others[e[1]].add(e[0])
+        for e in tree:
+            self.tree[e[0]].add(e[1])
+            self.tree[e[1]].add(e[0])
+            self.weight += self.cost[e]
+        # root every tree
+        rooted = set()
+        for root in nodes:
+            if root in rooted:
+                continue
+            rooted.add(root)
+            stack = [root]
+            while stack:
+                current = stack.pop()
+                for n in self.tree[current]:
+                    if n not in rooted:
+                        rooted.add(n)
+                        self.parent[n] = current
+                        self.up[n] = self.get_key(n, current)
+                        stack.append(n)
+
+    def add_node(self, name):
+        '''
+        API: add_node(self, name)
+        Description:
+        Adds node name as a tree of its own.
+        Input:
+            name: Node name.
+        '''
+        if name in self.parent:
+            raise MultipleNodeException
+        self.parent[name] = None
+        self.up[name] = None
+        self.tree[name] = set()
+        self.others[name] = set()
+
+    def get_key(self, name1, name2):
+        '''
+        API: get_key(self, name1, name2)
+        Description:
+        Returns the edge between name1 and name2 in the orientation it is
+        stored, None if there is no such edge.
+        '''
+        if (name1, name2) in self.cost:
+            return (name1, name2)
+        if (name2, name1) in self.cost:
+            return (name2, name1)
+        return None
+
+    def check_tree_edge(self, e):
+        '''
+        API: check_tree_edge(self, e)
+        Description:
+        Returns True if edge e is in the forest, False otherwise.
+        '''
+        e = self.get_key(e[0], e[1])
+        return e is not None and (self.up[e[0]] == e or self.up[e[1]] == e)
+
+    def get_edge_list(self):
+        '''
+        API: get_edge_list(self)
+        Description:
+        Returns list of edges of the forest in (source,sink) format.
+        '''
+        return [e for e in self.up.values() if e is not None]
+
+    def get_weight(self):
+        '''
+        API: get_weight(self)
+        Description:
+        Returns total cost of the forest.
+        '''
+        return self.weight
+
+    def add_edge(self, name1, name2, cost):
+        '''
+        API: add_edge(self, name1, name2, cost)
+        Description:
+        Adds edge (name1,name2) and updates the forest. Nodes that do not
+        exist are added.
+        Input:
+            name1: Source node name.
+            name2: Sink node name.
+            cost: Cost of the edge.
+        '''
+        for n in (name1, name2):
+            if n not in self.parent:
+                self.add_node(n)
+        if self.get_key(name1, name2) is not None:
+            raise MultipleEdgeException
+        self.cost[(name1, name2)] = cost
+        self.insert((name1, name2))
+
+    def del_edge(self, e):
+        '''
+        API: del_edge(self, e)
+        Description:
+        Removes edge e and updates the forest.
+        Input:
+            e: Edge in (source,sink) format.
+        '''
+        key = self.get_key(e[0], e[1])
+        if key is None:
+            raise Exception('Edge %s does not exist!' %str(e))
+        if self.check_tree_edge(key):
+            self.cut(key)
+            del self.cost[key]
+            self.reconnect(key)
+        else:
+            self.others[key[0]].discard(key[1])
+            self.others[key[1]].discard(key[0])
+            del self.cost[key]
+
+    def set_edge_cost(self, e, cost):
+        '''
+        API: set_edge_cost(self, e, cost)
+        Description:
+        Changes cost of edge e and updates the forest.
+        Input:
+            e: Edge in (source,sink) format.
+            cost: New cost.
+        '''
+        key = self.get_key(e[0], e[1])
+        if key is None:
+            raise Exception('Edge %s does not exist!' %str(e))
+        old = self.cost[key]
+        if self.check_tree_edge(key):
+            self.cost[key] = cost
+            self.weight += cost - old
+            if cost > old:
+                # the edge competes with non-tree edges of the cut
+                self.cut(key)
+                self.others[key[0]].add(key[1])
+                self.others[key[1]].add(key[0])
+                self.reconnect(key)
+        elif cost < old:
+            self.others[key[0]].discard(key[1])
+            self.others[key[1]].discard(key[0])
+            self.cost[key] = cost
+            self.insert(key)
+        else:
+            self.cost[key] = cost
+
+    def insert(self, key):
+        '''
+        API: insert(self, key)
+        Description:
+        Adds edge key, which is not in the forest, to the forest if it
+        links two trees or if it is cheaper than the most expensive edge on
+        the cycle it closes. Used by add_edge() and set_edge_cost().
+        '''
+        u, v = key
+        cost = self.cost[key]
+        path = self.find_path(u, v)
+        if path is None:
+            self.link(u, v, key)
+            return
+        # the most expensive edge on the cycle, as (cost, side, node) where
+        # node is the lower end of the edge
+        worst = None
+        for side in (0, 1):
+            for n in path[side]:
+                c = self.cost[self.up[n]]
+                if worst is None or c > worst[0]:
+                    worst = (c, side, n)
+        if worst is None or cost >= worst[0]:
+            self.others[u].add(v)
+            self.others[v].add(u)
+            return
+        c, side, n = worst
+        removed = self.up[n]
+        self.cut(removed)
+        self.others[removed[0]].add(removed[1])
+        self.others[removed[1]].add(removed[0])
+        # the end of key on the side of n is now in the tree rooted at n
+        if side == 0:
+            self.link(u, v, key)
+        else:
+            self.link(v, u, key)
+
+    def find_path(self, u, v):
+        '''
+        API: find_path(self, u, v)
+        Description:
+        Climbs from u and v in turns until a node seen from the other end is
+        reached. Used by insert().
+        Return:
+            Returns None if u and v are in different trees. Otherwise
+            returns (u_side, v_side), lists of nodes on the path from u (v)
+            up to their lowest common ancestor, excluding the ancestor. Edges
+            of the path are the up edges of these nodes.
+        '''
+        if u == v:
+            return ([], [])
+        parent = self.parent
+        paths = ([u], [v])
+        seen = ({u:0}, {v:0})
+        ends = [u, v]
+        while ends[0] is not None or ends[1] is not None:
+            for side in (0, 1):
+                if ends[side] is None:
+                    continue
+                n = ends[side]
+                if n in seen[1-side]:
+                    other = seen[1-side][n]
+                    if side == 0:
+                        return (paths[0][:-1], paths[1][:other])
+                    return (paths[0][:other], paths[1][:-1])
+                n = parent[n]
+                ends[side] = n
+                if n is not None:
+                    seen[side][n] = len(paths[side])
+                    paths[side].append(n)
+        return None
+
+    def evert(self, w):
+        '''
+        API: evert(self, w)
+        Description:
+        Makes w the root of its tree by reversing parent pointers on the
+        path from w to the root. Used by link().
+        '''
+        parent = self.parent
+        up = self.up
+        previous = None
+        previous_edge = None
+        current = w
+        while current is not None:
+            next_node = parent[current]
+            next_edge = up[current]
+            parent[current] = previous
+            up[current] = previous_edge
+            previous = current
+            previous_edge = next_edge
+            current = next_node
+
+    def link(self, u, v, key):
+        '''
+        API: link(self, u, v, key)
+        Description:
+        Joins the tree of u to the tree of v with edge key, whose end nodes
+        are u and v. Used by insert() and reconnect().
+        '''
+        self.evert(u)
+        self.parent[u] = v
+        self.up[u] = key
+        self.tree[u].add(v)
+        self.tree[v].add(u)
+        self.weight += self.cost[key]
+
+    def cut(self, key):
+        '''
+        API: cut(self, key)
+        Description:
+        Removes forest edge key from the forest. The lower end of key
+        becomes a root. Used by del_edge(), set_edge_cost() and insert().
+        '''
+        u, v = key
+        if self.up[u] != key:
+            u, v = v, u
+        self.parent[u] = None
+        self.up[u] = None
+        self.tree[u].discard(v)
+        self.tree[v].discard(u)
+        self.weight -= self.cost.get(key, 0)
+
+    def reconnect(self, key):
+        '''
+        API: reconnect(self, key)
+        Description:
+        Searches the trees of the end nodes of key in turns until one of
+        them is exhausted and links the two trees with the cheapest non-tree
+        edge leaving the smaller one. Used by del_edge() and
+        set_edge_cost().
+        '''
+        queues = ([key[0]], [key[1]])
+        seen = (set(queues[0]), set(queues[1]))
+        positions = [0, 0]
+        small = None
+        while small is None:
+            for side in (0, 1):
+                if positions[side] == len(queues[side]):
+                    small = side
+                    break
+                current = queues[side][positions[side]]
+                positions[side] += 1
+                for n in self.tree[current]:
+                    if n not in seen[side]:
+                        seen[side].add(n)
+                        queues[side].append(n)
+        part = seen[small]
+        best = None
+        for s in part:
+            for t in self.others[s]:
+                if t in part:
+                    continue
+                e = self.get_key(s, t)
+                if best is None or self.cost[e] < self.cost[best[2]]:
+                    best = (s, t, e)
+        if best is None:
+            return
+        s, t, e = best
+        self.others[s].discard(t)
+        self.others[t].discard(s)
+        self.link(s, t, e)
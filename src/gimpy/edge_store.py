@@ -0,0 +1,305 @@
+'''
+Typed column store for declared numeric edge attributes.
+
+By default Graph keeps the attributes of every edge in a dictionary, so each
+numeric value is a boxed Python object and every edge pays for a dictionary.
+Attributes that are declared using Graph.declare_edge_attr() are instead kept
+in typed arrays (array module, 'q' for int64 and 'd' for float64) indexed by
+edge id. Edge ids are dense, 0, 1, ..., m-1.
+
+Once an attribute is declared, Graph.edge_attr maps edges to EdgeAttributes
+instances instead of dictionaries. EdgeAttributes is a dictionary-like view
+that reads and writes declared attributes from the columns and keeps any
+other attribute in a small dictionary of its own. Code that uses
+Graph.edge_attr, get_edge_attr() or set_edge_attr() keeps working. Code that
+needs speed can get the columns with Graph.get_edge_column() and the id of an
+edge with Graph.get_edge_id(). Graph.search_headless(),
+bidirectional_dijkstra(), max flow and the pricing steps of network simplex
+read declared 'cost', 'capacity' and 'flow' columns this way, and FrozenGraph
+copies declared columns without boxing.
+
+Edge ids are not stable under deletion. When an edge is deleted the edge with
+the largest id takes its id so that columns stay dense.
+'''
+from __future__ import absolute_import
+from builtins import object
+
+from array import array
+
+class EdgeColumnStore(object):
+    '''
+    Typed columns of declared edge attributes. See module documentation.
+    '''
+    def __init__(self):
+        '''
+        API: __init__(self)
+        Description:
+        Creates an empty store.
+        Post:
+            Sets self.columns, self.defaults and self.views.
+        '''
+        # attribute name -> typed array indexed by edge id
+        self.columns = {}
+        # attribute name -> value of attribute for new edges
+        self.defaults = {}
+        # edge id -> EdgeAttributes instance of edge
+        self.views = []
+
+    def declare(self, attr, typecode = 'd', default = 0):
+        '''
+        API: declare(self, attr, typecode = 'd', default = 0)
+        Description:
+        Adds a column for attr. Values of attr that are already set on edges
+        in the store are moved to the column.
+        Input:
+            attr: Attribute name.
+            typecode: 'q' for int64 or 'd' for float64 values.
+            default: Value of attr for edges that do not set it.
+        Pre:
+            attr should not be declared already.
+        Post:
+            self.columns and self.defaults are updated.
+        '''
+        if attr in self.columns:
+            raise Exception('Edge attribute %s is already declared!' %str(attr))
+        if typecode not in ('q', 'd'):
+            raise Exception('Unknown typecode %s, use q or d!' %str(typecode))
+        column = array(typecode)
+        for view in self.views:
+            extra = view.extra
+            if extra is not None and attr in extra:
+                column.append(extra.pop(attr))
+            else:
+                column.append(default)
+        self.columns[attr] = column
+        self.defaults[attr] = default
+
+    def add(self, attr):
+        '''
+        API: add(self, attr)
+        Description:
+        Adds a new edge with attributes attr to the store.
+        Input:
+            attr: Attribute dictionary of the edge. Declared attributes are
+            removed from this dictionary.
+        Return:
+            EdgeAttributes instance of the new edge.
+        '''
+        k = len(self.views)
+        defaults = self.defaults
+        for a, column in self.columns.items():
+            column.append(attr.pop(a, defaults[a]))
+        if attr:
+            view = EdgeAttributes(self, k, attr)
+        else:
+            view = EdgeAttributes(self, k, None)
+        self.views.append(view)
+        return view
+
+    def remove(self, view):
+        '''
+        API: remove(self, view)
+        Description:
+        Removes edge of view from the store. The edge with the largest id
+        takes the id of the removed edge.
+        Input:
+            view: EdgeAttributes instance of the edge.
+        Post:
+            view is detached, it keeps its values in its own dictionary.
+        '''
+        k = view.id
+        last = len(self.views) - 1
+        detached = dict(view.items())
+        if k != last:
+            moved = self.views[last]
+            self.views[k] = moved
+            moved.id = k
+            for column in self.columns.values():
+                column[k] = column[last]
+        self.views.pop()
+        for column in self.columns.values():
+            column.pop()
+        view.store = EdgeColumnStore()
+        view.id = -1
+        view.extra = detached
+
+class EdgeAttributes(object):
+    '''
+    Dictionary-like attributes of an edge whose declared attributes live in
+    an EdgeColumnStore. See module documentation.
+    '''
+    __slots__ = ('store', 'id', 'extra')
+
+    def __init__(self, store, id, extra):
+        '''
+        API: __init__(self, store, id, extra)
+        Description:
+        Should not be called directly, see EdgeColumnStore.add().
+        Input:
+            store: EdgeColumnStore instance.
+            id: Edge id.
+            extra: Dictionary of attributes that are not declared, or None.
+        '''
+        self.store = store
+        self.id = id
+        self.extra = extra
+
+    def __getitem__(self, key):
+        '''
+        API: __getitem__(self, key)
+        Description:
+        Returns value of attribute key, from its column if key is declared.
+        Raises KeyError if the edge does not have key.
+        '''
+        column = self.store.columns.get(key)
+        if column is not None:
+            return column[self.id]
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        '''
+        API: __setitem__(self, key, value)
+        Description:
+        Sets attribute key to value, in its column if key is declared.
+        '''
+        column = self.store.columns.get(key)
+        if column is not None:
+            column[self.id] = value
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        '''
+        API: __delitem__(self, key)
+        Description:
+        Deletes attribute key of the edge. Declared attributes can not be
+        deleted, raises Exception for them. Raises KeyError if the edge does
+        not have key.
+        '''
+        if key in self.store.columns:
+            raise Exception('Declared edge attribute %s can not be deleted!'
+                            %str(key))
+        if self.extra is None:
+            raise KeyError(key)
+        del self.extra[key]
+
+    def __contains__(self, key):
+        '''
+        API: __contains__(self, key)
+        Description:
+        Returns True if the edge has attribute key. Every edge has the
+        declared attributes.
+        '''
+        return (key in self.store.columns or
+                (self.extra is not None and key in self.extra))
+
+    def __iter__(self):
+        '''
+        API: __iter__(self)
+        Description:
+        Returns iterator over attribute names in the order of keys().
+        '''
+        return iter(self.keys())
+
+    def __len__(self):
+        '''
+        API: __len__(self)
+        Description:
+        Returns number of attributes of the edge, declared ones included.
+        '''
+        if self.extra is None:
+            return len(self.store.columns)
+        return len(self.store.columns) + len(self.extra)
+
+    def __eq__(self, other):
+        '''
+        API: __eq__(self, other)
+        Description:
+        Returns True if the edge has the same attributes and values as
+        dictionary or EdgeAttributes instance other.
+        '''
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        '''
+        API: __ne__(self, other)
+        Description:
+        Returns True if __eq__() returns False.
+        '''
+        return not self == other
+
+    def __repr__(self):
+        '''
+        API: __repr__(self)
+        Description:
+        Returns representation of the attribute dictionary of the edge.
+        '''
+        return repr(dict(self.items()))
+
+    def get(self, key, default = None):
+        '''
+        API: get(self, key, default = None)
+        Description:
+        Returns value of attribute key, default if the edge does not have
+        key.
+        '''
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        '''
+        API: keys(self)
+        Description:
+        Returns list of attribute names, declared attributes first.
+        '''
+        if self.extra is None:
+            return list(self.store.columns)
+        return list(self.store.columns) + list(self.extra)
+
+    def values(self):
+        '''
+        API: values(self)
+        Description:
+        Returns list of attribute values in the order of keys().
+        '''
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        '''
+        API: items(self)
+        Description:
+        Returns list of (name, value) pairs of attributes in the order of
+        keys().
+        '''
+        return [(key, self[key]) for key in self.keys()]
+
+    def update(self, other = (), **attr):
+        '''
+        API: update(self, other = (), **attr)
+        Description:
+        Sets attributes from dictionary or (name, value) pairs other and from
+        keyword arguments, as dict.update() does.
+        '''
+        if hasattr(other, 'keys'):
+            for key in other.keys():
+                self[key] = other[key]
+        else:
+            for key, value in other:
+                self[key] = value
+        for key in attr:
+            self[key] = attr[key]
+
+    def copy(self):
+        '''
+        API: copy(self)
+        Description:
+        Returns a new dictionary of attributes of the edge. Changes to the
+        dictionary do not change the edge.
+        '''
+        return dict(self.items())
@@ -0,0 +1,1989 @@
+'''
+Read-only compressed sparse row (CSR) snapshot of a Graph.
+
+Graph keeps adjacency lists in dictionaries keyed by node names and edge
+attributes in a dictionary keyed by (source, sink) tuples. This is convenient
+for building and displaying graphs but every attribute lookup in an algorithm
+goes through a tuple hash and one or two dictionary lookups. FrozenGraph maps
+node names to dense integer ids (0, 1, ..., n-1) and edges to dense integer
+ids (0, 1, ..., m-1) and keeps adjacency and numeric attributes in contiguous
+arrays (array module).
+
+Layout:
+  out_offsets, out_targets, out_edges: Neighbors of node i are
+      out_targets[out_offsets[i]:out_offsets[i+1]] and the corresponding edge
+      ids are out_edges[out_offsets[i]:out_offsets[i+1]]. Neighbor order is
+      the same as in the Graph that is frozen.
+  in_offsets, in_sources, in_edges: Same for in neighbors. For undirected
+      graphs these are the out arrays.
+  edge_tail, edge_head: End points of edge ids, in the orientation the edge
+      is stored in Graph.edge_attr.
+  node_column, edge_column: Attribute columns, indexed by node id and edge id
+      respectively. Integer attributes are kept in array('q'), real valued
+      attributes in array('d'), anything else in a list.
+
+A snapshot never changes after it is created. Algorithms return their results
+as arrays indexed by node/edge ids. These can be written back to the mutable
+Graph in one step using write_back().
+
+Methods that take node arguments expect node names, as in Graph.
+'''
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+from builtins import range
+from builtins import object
+
+from .global_constants import *
+from .indexed_heap import IndexedHeap
+try:
+    from src.blimpy import PriorityQueue
+except ImportError:
+    from coinor.blimpy import PriorityQueue
+from array import array
+from collections import deque
+import heapq
+import multiprocessing # for Pool()
+
+try:
+    import numpy # for argsort(), minimum.reduceat()
+except ImportError:
+    NUMPY_INSTALLED = False
+else:
+    NUMPY_INSTALLED = True
+
+try:
+    from multiprocessing import shared_memory # for SharedMemory()
+except ImportError:
+    shared_memory = None
+
+class FrozenGraph(object):
+    '''
+    Read-only CSR snapshot of a Graph. See module documentation.
+    '''
+    def __init__(self, graph, node_attrs = None, edge_attrs = None):
+        '''
+        API: __init__(self, graph, node_attrs = None, edge_attrs = None)
+        Description:
+        Builds snapshot of graph. It is recommended to use Graph.freeze()
+        instead of calling the constructor directly.
+        Input:
+            graph: Graph instance to freeze.
+            node_attrs: List of node attributes to keep as columns. If not
+            given, all attributes whose values are all numeric are kept.
+            edge_attrs: List of edge attributes to keep as columns. If not
+            given, all attributes whose values are all numeric are kept.
+        Post:
+            Sets adjacency arrays and attribute columns.
+        '''
+        self.graph_type = graph.graph_type
+        self.names = list(graph.neighbors)
+        index = dict((name, i) for i, name in enumerate(self.names))
+        self.index = index
+        n = len(self.names)
+        # edge ids, in the order of edge_attr
+        edges = list(graph.edge_attr)
+        edge_tail = [index[e[0]] for e in edges]
+        edge_head = [index[e[1]] for e in edges]
+        self.edge_tail = array('l', edge_tail)
+        self.edge_head = array('l', edge_head)
+        # adjacency dictionaries and edge_attr are both insertion ordered, so
+        # sorting edge ids by end node keeps the neighbor order of graph
+        if self.graph_type is DIRECTED_GRAPH:
+            edge_ids = range(len(edges))
+            (self.out_offsets, self.out_targets,
+             self.out_edges) = self.make_csr(n, edge_tail, edge_head, edge_ids)
+            (self.in_offsets, self.in_sources,
+             self.in_edges) = self.make_csr(n, edge_head, edge_tail, edge_ids)
+        else:
+            # undirected edges are neighbors of both end nodes
+            tails = []
+            heads = []
+            edge_ids = []
+            for k in range(len(edges)):
+                i = edge_tail[k]
+                j = edge_head[k]
+                tails.append(i)
+                heads.append(j)
+                edge_ids.append(k)
+                if i != j:
+                    tails.append(j)
+                    heads.append(i)
+                    edge_ids.append(k)
+            (self.out_offsets, self.out_targets,
+             self.out_edges) = self.make_csr(n, tails, heads, edge_ids)
+            self.in_offsets = self.out_offsets
+            self.in_sources = self.out_targets
+            self.in_edges = self.out_edges
+        # attribute columns
+        if node_attrs is None:
+            node_attrs = self.numeric_attributes(
+                graph.nodes[name]._attr or {} for name in self.names)
+        if edge_attrs is None:
+            edge_attrs = self.numeric_attributes(graph.edge_attr.values())
+        self.node_columns = {}
+        for a in node_attrs:
+            self.node_columns[a] = self.make_column(
+                graph.nodes[name].get_attr(a) for name in self.names)
+        self.edge_columns = {}
+        store = graph.edge_store
+        for a in edge_attrs:
+            if store is not None and a in store.columns:
+                # declared attribute, copy typed column in edge_attr order
+                column = store.columns[a]
+                self.edge_columns[a] = array(column.typecode,
+                    [column[graph.edge_attr[e].id] for e in graph.edge_attr])
+            else:
+                self.edge_columns[a] = self.make_column(
+                    graph.edge_attr[e].get(a) for e in graph.edge_attr)
+
+    @staticmethod
+    def numeric_attributes(attr_dicts):
+        '''
+        API: numeric_attributes(attr_dicts)
+        Description:
+        Returns names of attributes that only have numeric values in the given
+        attribute dictionaries. Used by constructor.
+        Input:
+            attr_dicts: Iterable of attribute dictionaries.
+        Return:
+            List of attribute names.
+        '''
+        numeric = {}
+        for attr in attr_dicts:
+            for a in attr:
+                value = attr[a]
+                if isinstance(value, bool) or not isinstance(value,
+                                                             (int, float)):
+                    numeric[a] = False
+                elif a not in numeric:
+                    numeric[a] = True
+        return [a for a in numeric if numeric[a]]
+
+    @staticmethod
+    def make_csr(n, tails, heads, edge_ids):
+        '''
+        API: make_csr(n, tails, heads, edge_ids)
+        Description:
+        Sorts arcs by tail node with a counting sort. Arcs with the same tail
+        keep their relative order. Used by constructor.
+        Input:
+            n: Number of nodes.
+            tails: Tail node ids of arcs.
+            heads: Head node ids of arcs.
+            edge_ids: Edge ids of arcs.
+        Return:
+            Returns (offsets, targets, edges) arrays.
+        '''
+        offsets = [0]*(n+1)
+        for i in tails:
+            offsets[i+1] += 1
+        for i in range(n):
+            offsets[i+1] += offsets[i]
+        position = offsets[:n]
+        targets = [0]*len(tails)
+        edges = [0]*len(tails)
+        for k in range(len(tails)):
+            i = tails[k]
+            p = position[i]
+            targets[p] = heads[k]
+            edges[p] = edge_ids[k]
+            position[i] = p + 1
+        return array('l', offsets), array('l', targets), array('l', edges)
+
+    @staticmethod
+    def make_column(values):
+        '''
+        API: make_column(values)
+        Description:
+        Creates an attribute column from values. Uses array('q') if all
+        values are integers, array('d') if all values are numbers and a list
+        otherwise (ie. some values are missing or not numeric).
+        Input:
+            values: Iterable of attribute values.
+        Return:
+            Returns the column.
+        '''
+        values = list(values)
+        integer = True
+        for v in values:
+            if isinstance(v, bool) or not isinstance(v, (int, float)):
+                return values
+            if not isinstance(v, int):
+                integer = False
+        try:
+            if integer:
+                return array('q', values)
+            return array('d', values)
+        except OverflowError:
+            return values
+
+    def get_node_num(self):
+        '''
+        API: get_node_num(self)
+        Description:
+        Returns number of nodes.
+        Return:
+            Number of nodes.
+        '''
+        return len(self.names)
+
+    def get_edge_num(self):
+        '''
+        API: get_edge_num(self)
+        Description:
+        Returns number of edges.
+        Return:
+            Number of edges.
+        '''
+        return len(self.edge_tail)
+
+    def get_node_id(self, name):
+        '''
+        API: get_node_id(self, name)
+        Description:
+        Returns dense integer id of node.
+        Input:
+            name: Node name.
+        Return:
+            Node id.
+        '''
+        return self.index[name]
+
+    def get_node_name(self, i):
+        '''
+        API: get_node_name(self, i)
+        Description:
+        Returns name of the node with id i.
+        Input:
+            i: Node id.
+        Return:
+            Node name.
+        '''
+        return self.names[i]
+
+    def get_edge(self, k):
+        '''
+        API: get_edge(self, k)
+        Description:
+        Returns edge with id k in (source, sink) form using node names.
+        Input:
+            k: Edge id.
+        Return:
+            Edge tuple.
+        '''
+        return (self.names[self.edge_tail[k]], self.names[self.edge_head[k]])
+
+    def node_column(self, attr):
+        '''
+        API: node_column(self, attr)
+        Description:
+        Returns the column of node attribute attr.
+        Input:
+            attr: Node attribute.
+        Pre:
+            attr should be frozen.
+        Return:
+            Column indexed by node id.
+        '''
+        return self.node_columns[attr]
+
+    def edge_column(self, attr):
+        '''
+        API: edge_column(self, attr)
+        Description:
+        Returns the column of edge attribute attr.
+        Input:
+            attr: Edge attribute.
+        Pre:
+            attr should be frozen.
+        Return:
+            Column indexed by edge id.
+        '''
+        return self.edge_columns[attr]
+
+    def to_dict(self, values):
+        '''
+        API: to_dict(self, values)
+        Description:
+        Converts a column indexed by node id to a dictionary keyed by node
+        names.
+        Input:
+            values: Column indexed by node id.
+        Return:
+            Dictionary, keys are node names.
+        '''
+        return dict(zip(self.names, values))
+
+    def get_path(self, pred, source, destination):
+        '''
+        API: get_path(self, pred, source, destination)
+        Description:
+        Returns path from source to destination using predecessor array.
+        Input:
+            pred: Predecessor array indexed by node ids, -1 for no
+            predecessor.
+            source: Source node name.
+            destination: Destination node name.
+        Return:
+            Returns list of node names in the path, None if destination is
+            not reached.
+        '''
+        s = self.index[source]
+        current = self.index[destination]
+        path = [current]
+        while current != s:
+            current = pred[current]
+            if current == -1:
+                return None
+            path.append(current)
+        path.reverse()
+        return [self.names[i] for i in path]
+
+    def write_back(self, graph, node_values = None, edge_values = None):
+        '''
+        API: write_back(self, graph, node_values = None, edge_values = None)
+        Description:
+        Writes columns back to node and edge attributes of graph in one bulk
+        step.
+        Input:
+            graph: Graph that is frozen.
+            node_values: Dictionary, keys are node attributes, values are
+            columns indexed by node id.
+            edge_values: Dictionary, keys are edge attributes, values are
+            columns indexed by edge id.
+        Pre:
+            Nodes and edges of graph should not change after freeze().
+        Post:
+            Node and edge attributes of graph are updated.
+        '''
+        if node_values is not None:
+            nodes = graph.nodes
+            for a in node_values:
+                for name, value in zip(self.names, node_values[a]):
+                    nodes[name].set_attr(a, value)
+        if edge_values is not None:
+            names = self.names
+            edge_attr = graph.edge_attr
+            for a in edge_values:
+                for t, h, value in zip(self.edge_tail, self.edge_head,
+                                       edge_values[a]):
+                    edge_attr[(names[t], names[h])][a] = value
+
+    def search(self, source, destination = None, algo = 'DFS',
+               reverse = False):
+        '''
+        API: search(self, source, destination = None, algo = 'DFS',
+                    reverse = False)
+        Description:
+        Same search as Graph.search() without display. Visits nodes in the
+        same order and finds the same predecessor tree.
+        Input:
+            source: Search starts from node with this name.
+            destination: Search stops when node with this name is reached.
+            algo: 'DFS', 'BFS', 'UnweightedSPT', 'Dijkstra' or 'Prim'.
+            reverse: Search goes in reverse arc directions if True.
+        Pre:
+            'cost' edge column should exist for 'Dijkstra' and 'Prim'.
+        Return:
+            Returns (pred, distance) where pred is the predecessor array (-1
+            for source and nodes not reached) and distance is the list of
+            distance labels (None for nodes not reached). For 'Prim' distance
+            label of a node is the cost of its tree edge.
+        '''
+        if reverse:
+            offsets = self.in_offsets
+            targets = self.in_sources
+            edges = self.in_edges
+        else:
+            offsets = self.out_offsets
+            targets = self.out_targets
+            edges = self.out_edges
+        n = len(self.names)
+        s = self.index[source]
+        if destination is None:
+            d = -1
+        else:
+            d = self.index[destination]
+        pred = array('l', [-1])*n
+        distance = [None]*n
+        done = bytearray(n)
+        if algo == 'DFS':
+            distance[s] = 0
+            stack = [s]
+            while stack:
+                current = stack[-1]
+                if done[current]:
+                    stack.pop()
+                    continue
+                if current == d:
+                    break
+                stack.pop()
+                dist = distance[current] + 1
+                for k in range(offsets[current], offsets[current+1]):
+                    j = targets[k]
+                    if not done[j]:
+                        distance[j] = dist
+                        stack.append(j)
+                        pred[j] = current
+                done[current] = 1
+        elif algo == 'BFS' or algo == 'UnweightedSPT':
+            distance[s] = 0
+            q = deque([s])
+            while q:
+                current = q.popleft()
+                if current == d:
+                    break
+                dist = distance[current] + 1
+                for k in range(offsets[current], offsets[current+1]):
+                    j = targets[k]
+                    if distance[j] is None:
+                        distance[j] = dist
+                        q.append(j)
+                        pred[j] = current
+                done[current] = 1
+        elif algo == 'Dijkstra' or algo == 'Prim':
+            cost = self.edge_columns['cost']
+            prim = algo == 'Prim'
+            distance[s] = 0
+            # entries are [priority, count, node], node is -1 if removed
+            count = 0
+            entry = {s:[0, count, s]}
+            heap = [entry[s]]
+            while heap:
+                priority, c, current = heapq.heappop(heap)
+                if current == -1:
+                    continue
+                del entry[current]
+                distance[current] = priority
+                if current == d:
+                    break
+                for k in range(offsets[current], offsets[current+1]):
+                    j = targets[k]
+                    if done[j]:
+                        continue
+                    if prim:
+                        estimate = cost[edges[k]]
+                    else:
+                        estimate = priority + cost[edges[k]]
+                    if j in entry:
+                        if estimate >= entry[j][0]:
+                            continue
+                        entry[j][2] = -1
+                    elif j == s or pred[j] != -1:
+                        continue
+                    pred[j] = current
+                    distance[j] = estimate
+                    count += 1
+                    entry[j] = [estimate, count, j]
+                    heapq.heappush(heap, entry[j])
+                done[current] = 1
+        else:
+            raise Exception('Unknown search algorithm %s' %str(algo))
+        return (pred, distance)
+
+    def max_flow(self, source, sink, algo = 'DFS'):
+        '''
+        API: max_flow(self, source, sink, algo = 'DFS')
+        Description:
+        Finds maximum flow from source to sink by the augmenting path
+        algorithm of Graph.max_flow(). Edges without capacity have capacity
+        INF.
+        Input:
+            source: Source node name.
+            sink: Sink node name.
+            algo: 'DFS' or 'BFS', search used to find augmenting paths.
+        Pre:
+            Directed graph. 'capacity' edge column should exist.
+        Return:
+            Returns (value, flow) where value is the maximum flow amount and
+            flow is the flow column indexed by edge ids.
+        '''
+        if self.graph_type is not DIRECTED_GRAPH:
+            raise Exception('max_flow is defined for directed graphs.')
+        supply = [0]*len(self.names)
+        supply[self.index[source]] = float('inf')
+        supply[self.index[sink]] = -float('inf')
+        return self.augment(supply, algo)
+
+    def feasible_flow(self, algo = 'DFS'):
+        '''
+        API: feasible_flow(self, algo = 'DFS')
+        Description:
+        Finds a flow that satisfies demands of nodes, as Graph.max_flow()
+        from a source with an arc to every supply node to a sink with an arc
+        from every demand node would. The source and the sink are virtual,
+        the snapshot is not changed. Used by Graph.find_feasible_flow().
+        Edges without capacity have capacity INF.
+        Input:
+            algo: 'DFS' or 'BFS', search used to find augmenting paths.
+        Pre:
+            Directed graph. 'capacity' edge column and 'demand' node column
+            should exist. Demand is positive for supply nodes, negative for
+            demand nodes.
+        Return:
+            Returns (feasible, flow) where feasible is False if the demands
+            can not be satisfied and flow is the flow column indexed by edge
+            ids.
+        '''
+        if self.graph_type is not DIRECTED_GRAPH:
+            raise Exception('feasible flow is defined for directed graphs.')
+        supply = [0 if b is None else b for b in self.node_columns['demand']]
+        value, flow = self.augment(supply, algo)
+        # supply is updated in place, supply nodes that still have supply
+        # could not send it
+        feasible = all(b <= 0 for b in supply)
+        return (feasible, flow)
+
+    def augment(self, supply, algo = 'DFS'):
+        '''
+        API: augment(self, supply, algo = 'DFS')
+        Description:
+        Augmenting path algorithm of max_flow() and feasible_flow(). Every
+        search starts from the nodes that have positive supply, as from a
+        virtual source with an arc to each of them, and stops at the first
+        node with negative supply that is scanned, as at a virtual sink with
+        an arc from each of them. Flow along the path is bounded by residual
+        capacities and by supplies of its end nodes.
+        Input:
+            supply: List of supplies indexed by node ids, positive for
+            sources and negative for sinks. Updated in place by the amounts
+            sent.
+            algo: 'DFS' or 'BFS', search used to find augmenting paths.
+        Pre:
+            'capacity' edge column should exist.
+        Return:
+            Returns (value, flow) where value is the total amount sent and
+            flow is the flow column indexed by edge ids.
+        '''
+        n = len(self.names)
+        m = len(self.edge_tail)
+        capacity = [INF if c is None else c
+                    for c in self.edge_columns.get('capacity', [None]*m)]
+        flow = [0]*m
+        out_offsets = self.out_offsets
+        out_targets = self.out_targets
+        out_edges = self.out_edges
+        in_offsets = self.in_offsets
+        in_sources = self.in_sources
+        in_edges = self.in_edges
+        value = 0
+        while True:
+            sources = [i for i in range(n) if supply[i] > 0]
+            explored = bytearray(n)
+            for i in sources:
+                explored[i] = 1
+            # pred_edge[i] is edge used to reach i, pred_dir[i] is 1 if it
+            # is used in forward direction
+            pred_edge = array('l', [-1])*n
+            pred_dir = bytearray(n)
+            q = deque(sources)
+            if algo == 'DFS':
+                next_node = q.pop
+            elif algo == 'BFS':
+                next_node = q.popleft
+            else:
+                raise Exception('Unknown algorithm %s' %str(algo))
+            t = -1
+            while q:
+                current = next_node()
+                if supply[current] < 0:
+                    t = current
+                    break
+                for k in range(out_offsets[current], out_offsets[current+1]):
+                    j = out_targets[k]
+                    if explored[j]:
+                        continue
+                    e = out_edges[k]
+                    if capacity[e] - flow[e] > 0:
+                        explored[j] = 1
+                        pred_edge[j] = e
+                        pred_dir[j] = 1
+                        q.append(j)
+                for k in range(in_offsets[current], in_offsets[current+1]):
+                    j = in_sources[k]
+                    if explored[j]:
+                        continue
+                    e = in_edges[k]
+                    if flow[e] > 0:
+                        explored[j] = 1
+                        pred_edge[j] = e
+                        pred_dir[j] = 0
+                        q.append(j)
+            if t == -1:
+                break
+            # find capacity of the path
+            min_capacity = -supply[t]
+            current = t
+            while pred_edge[current] != -1:
+                e = pred_edge[current]
+                if pred_dir[current]:
+                    residual = capacity[e] - flow[e]
+                    current = self.edge_tail[e]
+                else:
+                    residual = flow[e]
+                    current = self.edge_head[e]
+                if residual < min_capacity:
+                    min_capacity = residual
+            s = current
+            min_capacity = min(min_capacity, supply[s])
+            # update flows on the path
+            current = t
+            while current != s:
+                e = pred_edge[current]
+                if pred_dir[current]:
+                    flow[e] += min_capacity
+                    current = self.edge_tail[e]
+                else:
+                    flow[e] -= min_capacity
+                    current = self.edge_head[e]
+            supply[s] -= min_capacity
+            supply[t] += min_capacity
+            value += min_capacity
+        return (value, flow)
+
+    def max_flow_preflowpush(self, source, sink, algo = 'FIFO'):
+        '''
+        API: max_flow_preflowpush(self, source, sink, algo = 'FIFO')
+        Description:
+        Finds maximum flow from source to sink by the preflow push algorithm
+        of Graph.max_flow_preflowpush(). Active nodes are selected, pushed
+        and relabelled in the same order, so the same flow is found. Edges
+        without capacity have capacity INF.
+        Input:
+            source: Source node name.
+            sink: Sink node name.
+            algo: Algorithm choice, 'FIFO', 'SAP' or 'HighestLabel'.
+        Pre:
+            Directed graph. 'capacity' edge column should exist. There are
+            no arcs (i,j) and (j,i) for any pair of nodes i and j.
+        Return:
+            Returns (flow, excess, distance) where flow is the flow column
+            indexed by edge ids, excess and distance are final excesses and
+            distance labels indexed by node ids.
+        '''
+        if self.graph_type is not DIRECTED_GRAPH:
+            raise Exception('max_flow is defined for directed graphs.')
+        if algo not in ('FIFO', 'SAP', 'HighestLabel'):
+            raise Exception('Unknown algorithm %s' %str(algo))
+        n = len(self.names)
+        m = len(self.edge_tail)
+        capacity = [INF if c is None else c
+                    for c in self.edge_columns.get('capacity', [None]*m)]
+        flow = [0]*m
+        excess = [0]*n
+        out_offsets = self.out_offsets
+        out_targets = self.out_targets
+        out_edges = self.out_edges
+        in_offsets = self.in_offsets
+        in_sources = self.in_sources
+        in_edges = self.in_edges
+        s = self.index[source]
+        t = self.index[sink]
+        # distance labels are BFS distances to the sink
+        distance = list(sweep(self.sweep_arcs(reverse = True), t)[0])
+        max_distance = 2*n + 1
+        if -1 in distance:
+            print('Warning: graph contains nodes not connected to the sink...')
+            distance = [max_distance if d == -1 else d for d in distance]
+        # active nodes, FIFO and SAP never keep a node in q twice
+        if algo == 'HighestLabel':
+            q = PriorityQueue()
+        else:
+            q = deque()
+            in_q = bytearray(n)
+        for k in range(out_offsets[s], out_offsets[s+1]):
+            j = out_targets[k]
+            e = out_edges[k]
+            flow[e] = capacity[e]
+            excess[j] = capacity[e]
+            excess[s] -= capacity[e]
+            if algo == 'HighestLabel':
+                q.push(j, -1)
+            else:
+                q.append(j)
+                in_q[j] = 1
+        distance[s] = n
+        while True:
+            if algo == 'HighestLabel':
+                if q.isEmpty():
+                    break
+                current = q.peek()
+            elif not q:
+                break
+            elif algo == 'FIFO':
+                current = q[0]
+            else:
+                current = q[-1]
+            # out arcs are used forward (mult 1), in arcs backward (mult -1)
+            arcs = ([(out_targets[k], out_edges[k], 1) for k in
+                     range(out_offsets[current], out_offsets[current+1])] +
+                    [(in_sources[k], in_edges[k], -1) for k in
+                     range(in_offsets[current], in_offsets[current+1])])
+            relabel = True
+            pushed = False
+            for j, e, mult in arcs:
+                # push along (current, j) if it is admissible
+                pushed = False
+                if distance[current] == distance[j] + 1:
+                    if mult == 1:
+                        residual_capacity = capacity[e] - flow[e]
+                    else:
+                        residual_capacity = flow[e]
+                    if residual_capacity != 0:
+                        push_amount = min(excess[current], residual_capacity)
+                        flow[e] += mult*push_amount
+                        excess[current] -= push_amount
+                        excess[j] += push_amount
+                        pushed = True
+                if pushed:
+                    if algo == 'FIFO':
+                        if not in_q[j] and j != s and j != t:
+                            q.append(j)
+                            in_q[j] = 1
+                        if excess[current] > 0:
+                            continue
+                    relabel = False
+                    break
+            if algo == 'FIFO':
+                q.popleft()
+                in_q[current] = 0
+            elif algo == 'SAP':
+                q.pop()
+                in_q[current] = 0
+            else:
+                q.remove(current)
+            if current != t:
+                if relabel:
+                    min_distance = max_distance
+                    for j, e, mult in arcs:
+                        if mult == 1:
+                            residual_capacity = capacity[e] - flow[e]
+                        else:
+                            residual_capacity = flow[e]
+                        if (distance[j] < min_distance and
+                            residual_capacity > 0):
+                            min_distance = distance[j]
+                    distance[current] = min_distance + 1
+                if excess[current] > 0:
+                    if algo == 'HighestLabel':
+                        q.push(current, -distance[current])
+                    else:
+                        q.append(current)
+                        in_q[current] = 1
+            if pushed and j != s:
+                if algo == 'SAP' and not in_q[j]:
+                    q.append(j)
+                    in_q[j] = 1
+                elif algo == 'HighestLabel' and q.peek(j) is None:
+                    q.push(j, -distance[j])
+        return (flow, excess, distance)
+
+    def network_simplex(self, pivot = 'dantzig'):
+        '''
+        API: network_simplex(self, pivot = 'dantzig')
+        Description:
+        Solves minimum cost flow problem using network simplex algorithm.
+        Starts from an artificial strongly feasible spanning tree (an
+        artificial root node connected to every node with big-M cost arcs)
+        and uses the last blocking arc on the pivot cycle as leaving arc, so
+        the spanning trees stay strongly feasible. Optimal flow may differ
+        from the one found by Graph.network_simplex() but has the same cost.
+        Edges without capacity have capacity INF.
+        Input:
+            pivot: 'dantzig' (most violating arc) or 'first_eligible'.
+        Pre:
+            Directed graph. 'cost' and 'capacity' edge columns and 'demand'
+            node column should exist. Demand is positive for supply nodes,
+            negative for demand nodes.
+        Return:
+            Returns (feasible, flow) where feasible is False if the problem
+            is infeasible and flow is the flow column indexed by edge ids.
+            The flow should be considered as junk when feasible is False.
+        '''
+        if self.graph_type is not DIRECTED_GRAPH:
+            raise Exception('network simplex is defined for directed graphs.')
+        if pivot not in ('dantzig', 'first_eligible'):
+            raise Exception('Unknown pivot rule.')
+        n = len(self.names)
+        m = len(self.edge_tail)
+        demand = self.node_columns['demand']
+        # arcs m, ..., m+n-1 are artificial arcs between node i and root n
+        tail = list(self.edge_tail)
+        head = list(self.edge_head)
+        cost = list(self.edge_columns['cost'])
+        capacity = [INF if c is None else c
+                    for c in self.edge_columns.get('capacity', [None]*m)]
+        flow = [0]*m
+        big_m = 1 + n*max([abs(c) for c in cost] + [0])
+        root = n
+        parent = [root]*n + [-1]
+        parent_edge = [0]*n + [-1]
+        depth = [1]*n + [0]
+        children = [set() for i in range(n)] + [set(range(n))]
+        potential = [0]*(n+1)
+        demand = [0 if b is None else b for b in demand]
+        for i in range(n):
+            # zero flow arcs are directed away from root
+            if demand[i] > 0:
+                tail.append(i)
+                head.append(root)
+                flow.append(demand[i])
+                potential[i] = big_m
+            else:
+                tail.append(root)
+                head.append(i)
+                flow.append(-demand[i])
+                potential[i] = -big_m
+            cost.append(big_m)
+            capacity.append(float('inf'))
+            parent_edge[i] = m + i
+        in_tree = bytearray(m + n)
+        for i in range(n):
+            in_tree[m+i] = 1
+        while True:
+            # select entering arc
+            entering = -1
+            violation = 0
+            for e in range(m):
+                if in_tree[e] or capacity[e] == 0:
+                    continue
+                cpi = cost[e] - potential[tail[e]] + potential[head[e]]
+                if flow[e] == 0:
+                    if cpi >= 0:
+                        continue
+                elif flow[e] == capacity[e]:
+                    if cpi <= 0:
+                        continue
+                else:
+                    continue
+                if abs(cpi) > violation:
+                    entering = e
+                    violation = abs(cpi)
+                    if pivot == 'first_eligible':
+                        break
+            if entering == -1:
+                break
+            # flow is sent from u to v along entering arc
+            if flow[entering] == 0:
+                u, v = tail[entering], head[entering]
+            else:
+                u, v = head[entering], tail[entering]
+            # find apex of the cycle
+            i, j = u, v
+            while i != j:
+                if depth[i] > depth[j]:
+                    i = parent[i]
+                elif depth[i] < depth[j]:
+                    j = parent[j]
+                else:
+                    i = parent[i]
+                    j = parent[j]
+            apex = i
+            # cycle is apex -> ... -> u -> v -> ... -> apex, tail path goes
+            # down from apex to u, head path goes up from v to apex.
+            path_u = []
+            i = u
+            while i != apex:
+                path_u.append(i)
+                i = parent[i]
+            path_v = []
+            j = v
+            while j != apex:
+                path_v.append(j)
+                j = parent[j]
+            # scan the cycle backwards, first minimum found is the last
+            # blocking arc
+            delta = None
+            for j in reversed(path_v):
+                e = parent_edge[j]
+                if tail[e] == j:
+                    residual = capacity[e] - flow[e]
+                else:
+                    residual = flow[e]
+                if delta is None or residual < delta:
+                    delta = residual
+                    leaving = e
+                    leaving_node = j
+                    v_side = True
+            if delta is None or capacity[entering] < delta:
+                delta = capacity[entering]
+                leaving = entering
+            for i in path_u:
+                e = parent_edge[i]
+                if head[e] == i:
+                    residual = capacity[e] - flow[e]
+                else:
+                    residual = flow[e]
+                if residual < delta:
+                    delta = residual
+                    leaving = e
+                    leaving_node = i
+                    v_side = False
+            # augment along the cycle
+            if delta > 0:
+                if u == tail[entering]:
+                    flow[entering] += delta
+                else:
+                    flow[entering] -= delta
+                for j in path_v:
+                    e = parent_edge[j]
+                    if tail[e] == j:
+                        flow[e] += delta
+                    else:
+                        flow[e] -= delta
+                for i in path_u:
+                    e = parent_edge[i]
+                    if head[e] == i:
+                        flow[e] += delta
+                    else:
+                        flow[e] -= delta
+            if leaving == entering:
+                continue
+            # update tree, subtree under leaving_node is attached to the
+            # other end point of the entering arc
+            if v_side:
+                x, new_parent = v, u
+            else:
+                x, new_parent = u, v
+            subtree_root = x
+            new_edge = entering
+            while True:
+                old_parent = parent[x]
+                old_edge = parent_edge[x]
+                children[old_parent].discard(x)
+                children[new_parent].add(x)
+                parent[x] = new_parent
+                parent_edge[x] = new_edge
+                if x == leaving_node:
+                    break
+                new_parent = x
+                new_edge = old_edge
+                x = old_parent
+            in_tree[entering] = 1
+            in_tree[leaving] = 0
+            # update depth and potentials of the moved subtree
+            stack = [subtree_root]
+            while stack:
+                i = stack.pop()
+                p = parent[i]
+                e = parent_edge[i]
+                depth[i] = depth[p] + 1
+                if tail[e] == i:
+                    potential[i] = potential[p] + cost[e]
+                else:
+                    potential[i] = potential[p] - cost[e]
+                stack.extend(children[i])
+        feasible = True
+        for e in range(m, m+n):
+            if flow[e] != 0:
+                feasible = False
+        return (feasible, flow[:m])
+
+    def strong_components(self):
+        '''
+        API: strong_components(self)
+        Description:
+        Finds strongly connected components with an iterative version of
+        Tarjan's algorithm. Nodes are visited in node id order and neighbors
+        in adjacency order, so components are numbered in the order the
+        recursive version would close them. Runs in O(n+m) time, stack
+        membership is kept in a bitmap.
+        Return:
+            Returns (num_components, component) where component is the array
+            of component numbers indexed by node ids.
+        '''
+        n = len(self.names)
+        out_offsets = self.out_offsets
+        out_targets = self.out_targets
+        index = array('l', [-1])*n
+        lowlink = array('l', [0])*n
+        component = array('l', [-1])*n
+        on_stack = bytearray(n)
+        stack = []
+        counter = 0
+        num_components = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            # call stack of the recursive algorithm, node and position of the
+            # next neighbor to process
+            call_node = [root]
+            call_pos = [out_offsets[root]]
+            while call_node:
+                v = call_node[-1]
+                k = call_pos[-1]
+                if k < out_offsets[v+1]:
+                    call_pos[-1] = k + 1
+                    w = out_targets[k]
+                    if index[w] == -1:
+                        index[w] = lowlink[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        call_node.append(w)
+                        call_pos.append(out_offsets[w])
+                    elif on_stack[w] and index[w] < lowlink[v]:
+                        lowlink[v] = index[w]
+                    continue
+                call_node.pop()
+                call_pos.pop()
+                if lowlink[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component[w] = num_components
+                        if w == v:
+                            break
+                    num_components += 1
+                if call_node:
+                    u = call_node[-1]
+                    if lowlink[v] < lowlink[u]:
+                        lowlink[u] = lowlink[v]
+        return num_components, component
+
+    def johnson_potentials(self):
+        '''
+        API: johnson_potentials(self)
+        Description:
+        Computes node potentials for Johnson's algorithm. Potentials are
+        shortest distances from a virtual source that has a 0 cost arc to
+        every node, found with queue based Bellman-Ford (FIFO label
+        correcting) in O(nm) time worst case. Reduced costs
+        cost(i,j)+potential[i]-potential[j] of arcs are nonnegative.
+        Pre:
+            'cost' edge column should exist.
+        Return:
+            Returns array of potentials indexed by node ids, or None if the
+            graph has a negative cycle.
+        '''
+        n = len(self.names)
+        offsets = self.out_offsets
+        targets = self.out_targets
+        edges = self.out_edges
+        cost = self.edge_columns['cost']
+        potential = array('d', [0])*n
+        # number of arcs on the labelled path, a path of n arcs repeats a node
+        # and the labels on it can only decrease on a negative cycle
+        length = array('l', [0])*n
+        in_q = bytearray(b'\x01')*n
+        q = deque(range(n))
+        while q:
+            i = q.popleft()
+            in_q[i] = 0
+            potential_i = potential[i]
+            for k in range(offsets[i], offsets[i+1]):
+                j = targets[k]
+                estimate = potential_i + cost[edges[k]]
+                if estimate < potential[j]:
+                    potential[j] = estimate
+                    length[j] = length[i] + 1
+                    if length[j] >= n:
+                        return None
+                    if not in_q[j]:
+                        in_q[j] = 1
+                        q.append(j)
+        return potential
+
+    def reduced_costs(self, potential):
+        '''
+        API: reduced_costs(self, potential)
+        Description:
+        Computes reduced costs of arcs in out_targets order. Undirected edges
+        have an arc in both directions.
+        Input:
+            potential: Array of node potentials indexed by node ids.
+        Pre:
+            'cost' edge column should exist.
+        Return:
+            Returns array of reduced costs, entry k is the reduced cost of arc
+            from node i to out_targets[k] where out_offsets[i] <= k <
+            out_offsets[i+1].
+        '''
+        offsets = self.out_offsets
+        targets = self.out_targets
+        edges = self.out_edges
+        cost = self.edge_columns['cost']
+        arc_cost = array('d', [0])*len(targets)
+        for i in range(len(self.names)):
+            potential_i = potential[i]
+            for k in range(offsets[i], offsets[i+1]):
+                arc_cost[k] = (cost[edges[k]] + potential_i -
+                               potential[targets[k]])
+        return arc_cost
+
+    def johnson(self, sources = None, processes = None, potential = None):
+        '''
+        API: johnson(self, sources = None, processes = None,
+                     potential = None)
+        Description:
+        Johnson's all pairs shortest path algorithm. Costs are reweighted
+        once using johnson_potentials() and Dijkstra's algorithm is run from
+        every source on the reduced costs, in O(nm log n) time in total.
+        Rows are computed lazily, one source at a time, so only the rows that
+        are in use are kept in memory.
+        Input:
+            sources: Iterable of source node names. All nodes in node id
+            order if not given.
+            processes: If given, Dijkstra runs are distributed to a
+            multiprocessing.Pool with this many worker processes. Rows are
+            still yielded in sources order.
+            potential: Return value of johnson_potentials(), computed if
+            not given.
+        Pre:
+            (1) 'cost' edge column should exist.
+            (2) Graph should not have a negative cycle.
+        Return:
+            Returns an iterator of (source, pred, distance) tuples, where
+            pred is the predecessor array of the shortest path tree of source
+            (-1 for source and nodes not reached) and distance is the array of
+            shortest distances from source (inf for nodes not reached), both
+            indexed by node ids.
+        '''
+        if potential is None:
+            potential = self.johnson_potentials()
+        if potential is None:
+            raise Exception('Graph has a negative cycle!')
+        if sources is None:
+            sources = self.names
+        source_ids = [self.index[s] for s in sources]
+        arcs = (self.out_offsets, self.out_targets,
+                self.reduced_costs(potential), potential)
+        if processes is None:
+            for s in source_ids:
+                pred, distance = johnson_row(arcs, s)
+                yield (self.names[s], pred, distance)
+            return
+        pool = multiprocessing.Pool(processes, worker_init, (arcs,))
+        try:
+            rows = pool.imap(johnson_worker, source_ids,
+                             max(1, len(source_ids)//(4*processes)))
+            for s, (pred, distance) in zip(source_ids, rows):
+                yield (self.names[s], pred, distance)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def sweep_arcs(self, weighted = False, reverse = False):
+        '''
+        API: sweep_arcs(self, weighted = False, reverse = False)
+        Description:
+        Returns arcs argument of sweep() and multi_sweep(). Used by
+        eccentricity(), diameter(), multi_source_search(), distance_rows()
+        and Graph.landmarks().
+        Input:
+            weighted: Arc costs are taken from 'cost' edge column if True.
+            reverse: Arcs are reversed if True, so sweep() finds distances
+            to the source instead of from the source.
+        '''
+        if reverse:
+            arcs = (self.in_offsets, self.in_sources, self.in_edges)
+        else:
+            arcs = (self.out_offsets, self.out_targets, self.out_edges)
+        if not weighted:
+            return (arcs[0], arcs[1], None)
+        cost = self.edge_columns['cost']
+        arc_cost = array('d', [cost[e] for e in arcs[2]])
+        return (arcs[0], arcs[1], arc_cost)
+
+    def eccentricity(self, source, weighted = False):
+        '''
+        API: eccentricity(self, source, weighted = False)
+        Description:
+        Finds eccentricity of source, the largest shortest path distance from
+        source to any node, with one BFS (Dijkstra if weighted).
+        Input:
+            source: Node name.
+            weighted: Distances are computed using 'cost' edge column if
+            True, number of arcs otherwise.
+        Return:
+            Returns eccentricity of source, inf if some node is not reachable
+            from source.
+        '''
+        distance, pred, order = sweep(self.sweep_arcs(weighted),
+                                      self.index[source])
+        if len(order) < len(self.names):
+            return float('inf')
+        return distance[order[-1]]
+
+    def diameter(self, weighted = False, processes = None):
+        '''
+        API: diameter(self, weighted = False, processes = None)
+        Description:
+        Finds diameter of the graph, the largest eccentricity of its nodes.
+        For undirected graphs keeps lower and upper bounds on eccentricity of
+        every node (BoundingDiameters method of Takes and Kosters, a
+        refinement of double sweep and iFUB bounds). A search from v with
+        eccentricity e gives max(d(v,w), e-d(v,w)) <= ecc(w) <= e+d(v,w) for
+        every node w. Nodes whose bounds show that they can not change the
+        diameter bounds are dropped and searches alternate between the node
+        with the largest upper bound and the node with the smallest lower
+        bound. On sparse graphs only a small number of searches are needed
+        instead of n. For directed graphs eccentricities of all nodes are
+        computed.
+        Input:
+            weighted: Distances are computed using 'cost' edge column if
+            True, number of arcs otherwise.
+            processes: If given, searches are run by this many worker
+            processes, in batches.
+        Pre:
+            'cost' edge column should exist and be nonnegative if weighted.
+        Return:
+            Returns diameter of the graph, inf if graph is not (strongly)
+            connected.
+        '''
+        n = len(self.names)
+        inf = float('inf')
+        if n == 0:
+            return 0
+        arcs = self.sweep_arcs(weighted)
+        if processes is None:
+            pool = None
+            batch = 1
+        else:
+            pool = multiprocessing.Pool(processes, worker_init, (arcs,))
+            batch = processes
+        try:
+            if self.graph_type is DIRECTED_GRAPH:
+                lower = 0
+                for start in range(0, n, 4*batch):
+                    sources = range(start, min(start+4*batch, n))
+                    for distance, ecc, reached in self.sweeps(arcs, sources,
+                                                              pool):
+                        if reached < n:
+                            return inf
+                        lower = max(lower, ecc)
+                return lower
+            lower_ecc = [0]*n
+            upper_ecc = [inf]*n
+            candidates = set(range(n))
+            lower = 0
+            upper = inf
+            offsets = self.out_offsets
+            sources = [max(range(n), key=lambda i: offsets[i+1]-offsets[i])]
+            pick_high = True
+            while lower < upper and candidates:
+                for distance, ecc, reached in self.sweeps(arcs, sources, pool):
+                    if reached < n:
+                        return inf
+                    lower = max(lower, ecc)
+                    upper = min(upper, 2*ecc)
+                    dropped = []
+                    for w in candidates:
+                        d = distance[w]
+                        low = max(lower_ecc[w], d, ecc-d)
+                        up = min(upper_ecc[w], ecc+d)
+                        lower_ecc[w] = low
+                        upper_ecc[w] = up
+                        if low > lower:
+                            lower = low
+                        if low == up or (up <= lower and 2*low >= upper):
+                            dropped.append(w)
+                    candidates.difference_update(dropped)
+                if not candidates:
+                    break
+                upper = min(upper, max(lower,
+                                       max(upper_ecc[w] for w in candidates)))
+                # alternate between largest upper and smallest lower bounds
+                high = heapq.nlargest(batch, candidates,
+                                      key=lambda w: (upper_ecc[w],
+                                                     -lower_ecc[w]))
+                low = heapq.nsmallest(batch, candidates,
+                                      key=lambda w: (lower_ecc[w],
+                                                     upper_ecc[w]))
+                if not pick_high:
+                    high, low = low, high
+                pick_high = not pick_high
+                sources = []
+                for w in [w for pair in zip(high, low) for w in pair]:
+                    if w not in sources and len(sources) < batch:
+                        sources.append(w)
+            return lower
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+    def sweeps(self, arcs, sources, pool = None):
+        '''
+        API: sweeps(self, arcs, sources, pool = None)
+        Description:
+        Runs sweep() from every source. Used by diameter().
+        Input:
+            arcs: Return value of sweep_arcs().
+            sources: List of source node ids.
+            pool: multiprocessing.Pool initialized with worker_init(arcs),
+            searches are run in the current process if not given.
+        Return:
+            Returns list of (distance, eccentricity, number of nodes reached)
+            tuples, one for every source.
+        '''
+        if pool is not None:
+            return pool.map(sweep_worker, sources)
+        return [sweep_summary(arcs, s) for s in sources]
+
+    def multi_source_search(self, sources, algo = 'Dijkstra',
+                            reverse = False):
+        '''
+        API: multi_source_search(self, sources, algo = 'Dijkstra',
+                                 reverse = False)
+        Description:
+        Runs one search that starts from all nodes in sources at distance 0,
+        see multi_sweep(). Every node gets its distance from the nearest
+        source and the nearest source itself, in the time of a single
+        search.
+        Input:
+            sources: List of source node names.
+            algo: 'Dijkstra' or 'BFS'.
+            reverse: Search goes in reverse arc directions if True, so
+            distances to the nearest source are found.
+        Pre:
+            'cost' edge column should exist and be nonnegative for
+            'Dijkstra'.
+        Return:
+            Returns (nearest, pred, distance) arrays indexed by node ids.
+            nearest is the id of the nearest source and pred is the
+            predecessor (-1 for nodes not reached, pred is -1 for sources
+            too). distance is -1 (BFS) or inf (Dijkstra) for nodes not
+            reached.
+        '''
+        if algo == 'Dijkstra':
+            arcs = self.sweep_arcs(True, reverse)
+        elif algo == 'BFS':
+            arcs = self.sweep_arcs(False, reverse)
+        else:
+            raise Exception('Unknown search algorithm %s' %str(algo))
+        distance, pred, order = multi_sweep(arcs,
+                                            [self.index[s] for s in sources])
+        nearest = array('l', [-1])*len(self.names)
+        # predecessors come before their successors in order
+        for i in order:
+            if pred[i] == -1:
+                nearest[i] = i
+            else:
+                nearest[i] = nearest[pred[i]]
+        return (nearest, pred, distance)
+
+    def distance_rows(self, sources = None, weighted = True, reverse = False,
+                      processes = None):
+        '''
+        API: distance_rows(self, sources = None, weighted = True,
+                           reverse = False, processes = None)
+        Description:
+        Runs a single source search from every source independently and
+        returns the distance rows, see distance_row(). Searches only read
+        the arrays of the snapshot, no node or edge state is reset between
+        them.
+        Input:
+            sources: List of source node names. All nodes in node id order
+            if not given.
+            weighted: Dijkstra on 'cost' edge column if True, BFS otherwise.
+            reverse: Search goes in reverse arc directions if True.
+            processes: If given, searches are distributed to a
+            multiprocessing.Pool with this many worker processes. The arcs
+            are sent once to every worker. Rows are still returned in
+            sources order.
+        Pre:
+            'cost' edge column should exist and be nonnegative if weighted.
+        Return:
+            Returns list of array('d') distance rows indexed by node ids, one
+            for every source, inf for nodes not reached.
+        '''
+        if sources is None:
+            sources = self.names
+        source_ids = [self.index[s] for s in sources]
+        arcs = self.sweep_arcs(weighted, reverse)
+        if processes is None:
+            return [distance_row(arcs, s) for s in source_ids]
+        pool = multiprocessing.Pool(processes, worker_init, (arcs,))
+        try:
+            return pool.map(distance_worker, source_ids,
+                            max(1, len(source_ids)//(4*processes)))
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def minimum_spanning_tree(self, algo = 'Kruskal', base_size = 1024,
+                              processes = None):
+        '''
+        API: minimum_spanning_tree(self, algo = 'Kruskal', base_size = 1024,
+                                   processes = None)
+        Description:
+        Finds a minimum spanning tree (forest if the graph is not connected)
+        with Kruskal's algorithm. Edge ids are sorted by 'cost' column
+        (numpy.argsort() if NumPy is installed) and scanned with a union-find
+        on node ids that halves paths and unites by size. Arcs of directed
+        graphs are treated as undirected edges.
+        'FilterKruskal' (Osipov, Sanders and Singler) partitions edges around
+        a pivot cost instead of sorting all of them. Light edges are
+        processed first, then heavy edges whose end nodes are already
+        connected are filtered out before they are partitioned further.
+        Edges that can not enter the tree are mostly never sorted, which
+        helps on dense graphs.
+        Both find the same tree as Graph.minimum_spanning_tree_kruskal(),
+        ties are broken by edge id in both. 'Boruvka' finds the same tree
+        too, see boruvka().
+        Input:
+            algo: 'Kruskal', 'FilterKruskal' or 'Boruvka'.
+            base_size: 'FilterKruskal' sorts parts with at most this many
+            edges.
+            processes: Number of worker processes of 'Boruvka'.
+        Pre:
+            'cost' edge column should exist.
+        Return:
+            Returns (edges, weight) where edges is the array of tree edge
+            ids in the order they are added and weight is their total cost.
+        '''
+        if algo == 'Boruvka':
+            return self.boruvka(processes)
+        if algo != 'Kruskal' and algo != 'FilterKruskal':
+            raise Exception('Unknown minimum spanning tree algorithm %s'
+                            %str(algo))
+        cost = self.edge_columns['cost']
+        tail = self.edge_tail
+        head = self.edge_head
+        n = len(self.names)
+        parent = list(range(n))
+        size = [1]*n
+        tree = array('l')
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        def scan(edges):
+            # adds edges that join two components, returns True when the
+            # tree is complete
+            for k in edges:
+                i = find(tail[k])
+                j = find(head[k])
+                if i == j:
+                    continue
+                if size[i] <= size[j]:
+                    parent[i] = j
+                    size[j] += size[i]
+                else:
+                    parent[j] = i
+                    size[i] += size[j]
+                tree.append(k)
+                if len(tree) == n-1:
+                    return True
+            return False
+        if algo == 'Kruskal':
+            scan(self.sort_edges(range(len(cost)), cost))
+        else:
+            # stack of (edges, filter) parts, light parts are on top
+            stack = [(list(range(len(cost))), False)]
+            while stack:
+                edges, heavy = stack.pop()
+                if heavy:
+                    edges = [k for k in edges if find(tail[k]) != find(head[k])]
+                if len(edges) > base_size:
+                    sample = sorted(cost[k] for k in
+                                    edges[::max(1, len(edges)//31)])
+                    pivot = sample[len(sample)//2]
+                    light = [k for k in edges if cost[k] <= pivot]
+                    if len(light) < len(edges):
+                        stack.append(([k for k in edges if cost[k] > pivot],
+                                      True))
+                        stack.append((light, False))
+                        continue
+                if scan(self.sort_edges(edges, cost)):
+                    break
+        weight = 0
+        for k in tree:
+            weight += cost[k]
+        return (tree, weight)
+
+    def boruvka(self, processes = None, parallel_size = 1000000):
+        '''
+        API: boruvka(self, processes = None, parallel_size = 1000000)
+        Description:
+        Finds a minimum spanning tree (forest if the graph is not connected)
+        with Boruvka's algorithm on NumPy arrays. Every edge is listed as an
+        arc at both of its end components and arcs are kept in CSR order,
+        grouped by tail component. In every round the cheapest arc of every
+        component is found with numpy.minimum.reduceat() over the groups
+        (segment minimum, ties broken by edge id), chosen edges are added to
+        the tree, components joined by them are contracted with pointer
+        jumping and arcs inside components are dropped. Number of
+        components at least halves in every round, so there are O(log n)
+        rounds of O(m) vectorized work. Since ties are broken by edge id it
+        finds the same tree as minimum_spanning_tree() with 'Kruskal'.
+        Input:
+            processes: If given, segment minimums of rounds with at least
+            parallel_size arcs are computed by this many worker processes.
+            Arcs of a round are written to shared memory
+            (multiprocessing.shared_memory, Python 3.8 or later) that the
+            workers attach to once, every worker gets a range of components.
+            parallel_size: See processes.
+        Pre:
+            (1) 'cost' edge column should exist.
+            (2) NumPy should be installed.
+        Return:
+            Returns (edges, weight) where edges is the array of tree edge
+            ids in the order they are found and weight is their total cost.
+        '''
+        if not NUMPY_INSTALLED:
+            raise Exception('Boruvka requires NumPy!')
+        if processes is not None and shared_memory is None:
+            raise Exception('Parallel Boruvka requires '
+                            'multiprocessing.shared_memory!')
+        n = len(self.names)
+        cost = numpy.asarray(self.edge_columns['cost'])
+        tail = numpy.asarray(self.edge_tail, dtype=numpy.intp)
+        head = numpy.asarray(self.edge_head, dtype=numpy.intp)
+        m = len(tail)
+        # arcs (tail component, head component, edge id), grouped by tail
+        edge_ids = numpy.arange(m, dtype=numpy.intp)
+        arc_tail = numpy.concatenate((tail, head))
+        arc_head = numpy.concatenate((head, tail))
+        arc_edge = numpy.concatenate((edge_ids, edge_ids))
+        keep = arc_tail != arc_head
+        arc_tail = arc_tail[keep]
+        arc_head = arc_head[keep]
+        arc_edge = arc_edge[keep]
+        order = numpy.argsort(arc_tail, kind='stable')
+        arc_tail = arc_tail[order]
+        arc_head = arc_head[order]
+        arc_edge = arc_edge[order]
+        arc_cost = cost[arc_edge]
+        # component of every node
+        component = numpy.arange(n, dtype=numpy.intp)
+        num = n
+        tree = []
+        pool = None
+        blocks = None
+        try:
+            if processes is not None and len(arc_edge) >= parallel_size:
+                blocks = (shared_memory.SharedMemory(create=True,
+                                                     size=arc_cost.nbytes),
+                          shared_memory.SharedMemory(create=True,
+                                                     size=arc_edge.nbytes))
+                pool = multiprocessing.Pool(processes, boruvka_init,
+                    ((blocks[0].name, arc_cost.dtype.str, len(arc_cost)),
+                     (blocks[1].name, arc_edge.dtype.str, len(arc_edge))))
+            while len(arc_edge):
+                # groups start where tail component changes
+                starts = numpy.flatnonzero(numpy.concatenate(
+                    ([True], arc_tail[1:] != arc_tail[:-1])))
+                groups = arc_tail[starts]
+                if pool is not None and len(arc_edge) >= parallel_size:
+                    chosen = self.boruvka_parallel(pool, blocks, arc_cost,
+                                                   arc_edge, starts,
+                                                   processes)
+                else:
+                    chosen = cheapest_arcs(arc_cost, arc_edge, starts,
+                                           len(arc_edge))
+                # parent of a component is the other end of its edge
+                ends = (component[tail[chosen]], component[head[chosen]])
+                ids = numpy.arange(num, dtype=numpy.intp)
+                parent = ids.copy()
+                parent[groups] = numpy.where(ends[0] == groups, ends[1],
+                                             ends[0])
+                # components that chose each other chose the same edge, the
+                # smaller one becomes the root
+                mutual = (parent[parent] == ids) & (ids < parent)
+                parent[mutual] = ids[mutual]
+                # edge of a mutual pair is added once, by the larger one
+                tree.append(chosen[parent[groups] != groups])
+                while True:
+                    grand = parent[parent]
+                    if numpy.array_equal(grand, parent):
+                        break
+                    parent = grand
+                roots = parent == ids
+                relabel = (numpy.cumsum(roots) - 1)[parent]
+                num = int(roots.sum())
+                component = relabel[component]
+                arc_tail = relabel[arc_tail]
+                arc_head = relabel[arc_head]
+                keep = arc_tail != arc_head
+                order = numpy.flatnonzero(keep)[
+                    numpy.argsort(arc_tail[keep], kind='stable')]
+                arc_tail = arc_tail[order]
+                arc_head = arc_head[order]
+                arc_edge = arc_edge[order]
+                arc_cost = arc_cost[order]
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            if blocks is not None:
+                for block in blocks:
+                    block.close()
+                    block.unlink()
+        if tree:
+            tree = numpy.concatenate(tree)
+        else:
+            tree = numpy.zeros(0, dtype=numpy.intp)
+        weight = 0
+        if len(tree):
+            weight = cost[tree].sum().item()
+        return (array('l', tree.tolist()), weight)
+
+    @staticmethod
+    def boruvka_parallel(pool, blocks, arc_cost, arc_edge, starts,
+                         processes):
+        '''
+        API: boruvka_parallel(pool, blocks, arc_cost, arc_edge, starts,
+                              processes)
+        Description:
+        Copies arcs of a round to shared memory blocks and computes
+        cheapest_arcs() of ranges of groups in worker processes. Used by
+        boruvka().
+        Return:
+            Returns array of chosen edge ids, one for every group.
+        '''
+        length = len(arc_edge)
+        numpy.ndarray(length, arc_cost.dtype, blocks[0].buf)[:] = arc_cost
+        numpy.ndarray(length, arc_edge.dtype, blocks[1].buf)[:] = arc_edge
+        # split groups so that workers get about the same number of arcs
+        bounds = numpy.searchsorted(starts, numpy.linspace(0, length,
+                                    processes+1)[1:-1])
+        tasks = []
+        for part in numpy.split(starts, bounds):
+            if len(part):
+                tasks.append(part)
+        stops = [part[0] for part in tasks[1:]] + [length]
+        return numpy.concatenate(pool.map(boruvka_worker,
+                                          list(zip(tasks, stops))))
+
+    def prim(self, source):
+        '''
+        API: prim(self, source)
+        Description:
+        Finds a minimum spanning tree of nodes reachable from source with
+        Prim's algorithm. Nodes waiting to enter the tree are kept in an
+        IndexedHeap keyed by the cost of their cheapest arc from the tree,
+        the key is decreased in place when a cheaper arc is found. Nodes in
+        the tree are never pushed again. Runs in O(m log n) time.
+        Input:
+            source: Name of source node.
+        Pre:
+            'cost' edge column should exist.
+        Return:
+            Returns (pred, weight) where pred is the predecessor array (-1
+            for source and nodes not reached) and weight is the total cost
+            of the tree.
+        '''
+        cost = self.edge_columns['cost']
+        offsets = self.out_offsets
+        targets = self.out_targets
+        edges = self.out_edges
+        n = len(self.names)
+        pred = array('l', [-1])*n
+        done = bytearray(n)
+        heap = IndexedHeap(n)
+        heap.push(self.index[source], 0)
+        weight = 0
+        while heap.size:
+            i, c = heap.pop()
+            done[i] = 1
+            weight += c
+            for k in range(offsets[i], offsets[i+1]):
+                j = targets[k]
+                if done[j]:
+                    continue
+                c = cost[edges[k]]
+                p = heap.get_priority(j)
+                if p is None or c < p:
+                    pred[j] = i
+                    heap.push(j, c)
+        return (pred, weight)
+
+    @staticmethod
+    def sort_edges(edges, cost):
+        '''
+        API: sort_edges(edges, cost)
+        Description:
+        Returns edge ids in edges stably sorted by cost, using
+        numpy.argsort() if NumPy is installed. Used by
+        minimum_spanning_tree().
+        '''
+        if NUMPY_INSTALLED and len(edges) > 1:
+            edges = numpy.asarray(edges, dtype=numpy.intp)
+            order = numpy.argsort(numpy.asarray(cost)[edges], kind='stable')
+            return edges[order].tolist()
+        return sorted(edges, key=cost.__getitem__)
+
+    def page_rank(self, damping_factor=0.85, max_iterations=100,
+                  min_delta=0.00001):
+        '''
+        API: page_rank(self, damping_factor=0.85, max_iterations=100,
+                       min_delta=0.00001)
+        Description:
+        Computes page-rank of a directed graph. Same computation as
+        Graph.page_rank().
+        Input:
+            damping_factor: Damping factor.
+            max_iterations: Maximum number of iterations.
+            min_delta: Smallest variation required to have a new iteration.
+        Pre:
+            Graph should be a directed graph.
+        Return:
+            Returns array of page-ranks indexed by node ids.
+        '''
+        graph_size = len(self.names)
+        if graph_size == 0:
+            return array('d')
+        min_value = (1.0-damping_factor)/graph_size
+        pagerank = array('d', [1.0/graph_size])*graph_size
+        out_offsets = self.out_offsets
+        out_degree = [out_offsets[i+1]-out_offsets[i]
+                      for i in range(graph_size)]
+        in_offsets = self.in_offsets
+        in_sources = self.in_sources
+        for _ in range(max_iterations):
+            diff = 0
+            for node in range(graph_size):
+                rank = min_value
+                for k in range(in_offsets[node], in_offsets[node+1]):
+                    referring_page = in_sources[k]
+                    rank += (damping_factor * pagerank[referring_page] /
+                             out_degree[referring_page])
+                diff += abs(pagerank[node] - rank)
+                pagerank[node] = rank
+            if diff < min_delta:
+                break
+        return pagerank
+
+def johnson_row(arcs, source):
+    '''
+    API: johnson_row(arcs, source)
+    Description:
+    Runs Dijkstra's algorithm from source on reduced costs and converts
+    distances back to original costs. Used by FrozenGraph.johnson().
+    Input:
+        arcs: (out_offsets, out_targets, reduced_costs, potential) tuple.
+        source: Source node id.
+    Return:
+        Returns (pred, distance) arrays indexed by node ids.
+    '''
+    offsets, targets, arc_cost, potential = arcs
+    n = len(potential)
+    inf = float('inf')
+    pred = array('l', [-1])*n
+    distance = array('d', [inf])*n
+    done = bytearray(n)
+    distance[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, i = heapq.heappop(heap)
+        if done[i]:
+            continue
+        done[i] = 1
+        for k in range(offsets[i], offsets[i+1]):
+            j = targets[k]
+            estimate = d + arc_cost[k]
+            if estimate < distance[j]:
+                distance[j] = estimate
+                pred[j] = i
+                heapq.heappush(heap, (estimate, j))
+    # d(s,j) = reduced distance - potential[s] + potential[j]
+    potential_s = potential[source]
+    for j in range(n):
+        if done[j]:
+            distance[j] += potential[j] - potential_s
+    return pred, distance
+
+# arcs of the graph in a worker process of FrozenGraph.johnson(),
+# FrozenGraph.sweeps(), FrozenGraph.distance_rows() or FrozenGraph.boruvka()
+WORKER_ARCS = None
+
+def worker_init(arcs):
+    '''
+    API: worker_init(arcs)
+    Description:
+    Keeps arcs in the worker process so that they are sent once per worker.
+    Used by FrozenGraph.johnson(), FrozenGraph.sweeps() and
+    FrozenGraph.distance_rows().
+    '''
+    global WORKER_ARCS
+    WORKER_ARCS = arcs
+
+def johnson_worker(source):
+    '''
+    API: johnson_worker(source)
+    Description:
+    Returns johnson_row() of source in a worker process. Used by
+    FrozenGraph.johnson().
+    '''
+    return johnson_row(WORKER_ARCS, source)
+
+def sweep(arcs, source):
+    '''
+    API: sweep(arcs, source)
+    Description:
+    Finds shortest distances from source with BFS, or with Dijkstra's
+    algorithm if arc costs are given. Used by FrozenGraph.eccentricity() and
+    sweep_summary().
+    Input:
+        arcs: (out_offsets, out_targets, arc_cost) tuple, arc_cost is None
+        for unweighted distances or the array of arc costs in out_targets
+        order.
+        source: Source node id.
+    Return:
+        Returns (distance, pred, order) where distance and pred are arrays
+        indexed by node ids (-1 or inf distance and -1 pred for nodes not
+        reached) and order is the list of reached nodes in nondecreasing
+        distance order.
+    '''
+    return multi_sweep(arcs, [source])
+
+def multi_sweep(arcs, sources):
+    '''
+    API: multi_sweep(arcs, sources)
+    Description:
+    Same as sweep() but the search starts from all nodes in sources at
+    distance 0, so distance of a node is its distance from the nearest
+    source. Used by sweep() and FrozenGraph.multi_source_search().
+    Input:
+        arcs: Return value of FrozenGraph.sweep_arcs().
+        sources: List of source node ids.
+    Return:
+        Returns (distance, pred, order) as sweep(). pred is -1 for sources.
+    '''
+    offsets, targets, arc_cost = arcs
+    n = len(offsets) - 1
+    pred = array('l', [-1])*n
+    if arc_cost is None:
+        distance = array('l', [-1])*n
+        order = []
+        for s in sources:
+            if distance[s] == -1:
+                distance[s] = 0
+                order.append(s)
+        # order is the BFS queue, nodes are appended while it is iterated
+        for i in order:
+            d = distance[i] + 1
+            for j in targets[offsets[i]:offsets[i+1]]:
+                if distance[j] == -1:
+                    distance[j] = d
+                    pred[j] = i
+                    order.append(j)
+        return distance, pred, order
+    distance = array('d', [float('inf')])*n
+    for s in sources:
+        distance[s] = 0
+    done = bytearray(n)
+    order = []
+    heap = [(0, s) for s in sources]
+    while heap:
+        d, i = heapq.heappop(heap)
+        if done[i]:
+            continue
+        done[i] = 1
+        order.append(i)
+        for k in range(offsets[i], offsets[i+1]):
+            j = targets[k]
+            estimate = d + arc_cost[k]
+            if estimate < distance[j]:
+                distance[j] = estimate
+                pred[j] = i
+                heapq.heappush(heap, (estimate, j))
+    return distance, pred, order
+
+def sweep_summary(arcs, source):
+    '''
+    API: sweep_summary(arcs, source)
+    Description:
+    Runs sweep() from source. Used by FrozenGraph.sweeps().
+    Return:
+        Returns (distance, eccentricity, number of nodes reached).
+    '''
+    distance, pred, order = sweep(arcs, source)
+    return distance, distance[order[-1]], len(order)
+
+def sweep_worker(source):
+    '''
+    API: sweep_worker(source)
+    Description:
+    Returns sweep_summary() of source in a worker process. Used by
+    FrozenGraph.sweeps().
+    '''
+    return sweep_summary(WORKER_ARCS, source)
+
+def distance_row(arcs, source):
+    '''
+    API: distance_row(arcs, source)
+    Description:
+    Runs sweep() from source. Used by FrozenGraph.distance_rows().
+    Return:
+        Returns array('d') of distances indexed by node ids, inf for nodes
+        not reached.
+    '''
+    distance = sweep(arcs, source)[0]
+    if arcs[2] is not None:
+        return distance
+    inf = float('inf')
+    return array('d', [inf if d == -1 else d for d in distance])
+
+def distance_worker(source):
+    '''
+    API: distance_worker(source)
+    Description:
+    Returns distance_row() of source in a worker process. Used by
+    FrozenGraph.distance_rows().
+    '''
+    return distance_row(WORKER_ARCS, source)
+
+def cheapest_arcs(arc_cost, arc_edge, starts, stop):
+    '''
+    API: cheapest_arcs(arc_cost, arc_edge, starts, stop)
+    Description:
+    Finds the cheapest arc of every group of arcs with two segment minimums,
+    the smallest cost first and then the smallest edge id among arcs with
+    that cost. Used by FrozenGraph.boruvka() and boruvka_worker().
+    Input:
+        arc_cost: NumPy array of arc costs.
+        arc_edge: NumPy array of edge ids of arcs.
+        starts: Increasing NumPy array of group start positions, groups are
+        not empty.
+        stop: End position of the last group.
+    Return:
+        Returns NumPy array of edge ids, one for every group.
+    '''
+    first = starts[0]
+    arc_cost = arc_cost[first:stop]
+    arc_edge = arc_edge[first:stop]
+    starts = starts - first
+    lengths = numpy.diff(numpy.append(starts, stop - first))
+    group_min = numpy.repeat(numpy.minimum.reduceat(arc_cost, starts),
+                             lengths)
+    key = numpy.where(arc_cost == group_min, arc_edge,
+                      numpy.iinfo(arc_edge.dtype).max)
+    return numpy.minimum.reduceat(key, starts)
+
+def boruvka_init(cost_block, edge_block):
+    '''
+    API: boruvka_init(cost_block, edge_block)
+    Description:
+    Attaches to shared memory blocks of arc costs and edge ids and keeps
+    them in the worker process. Used by FrozenGraph.boruvka().
+    Input:
+        cost_block: (name, dtype, length) of the cost block.
+        edge_block: (name, dtype, length) of the edge id block.
+    '''
+    global WORKER_ARCS
+    arcs = []
+    for name, dtype, length in (cost_block, edge_block):
+        block = shared_memory.SharedMemory(name=name)
+        arcs.append((block, numpy.ndarray(length, dtype, block.buf)))
+    WORKER_ARCS = arcs
+
+def boruvka_worker(task):
+    '''
+    API: boruvka_worker(task)
+    Description:
+    Returns cheapest_arcs() of a range of groups in a worker process. Used
+    by FrozenGraph.boruvka_parallel().
+    Input:
+        task: (starts, stop) of the groups.
+    '''
+    starts, stop = task
+    return cheapest_arcs(WORKER_ARCS[0][1], WORKER_ARCS[1][1], starts, stop)
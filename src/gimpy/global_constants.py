@@ -65,6 +65,7 @@ DOT2TEX_INSTALLED = None # it wil be set when we try to import
 PIL_INSTALLED = None
 XDOT_INSTALLED = None
 ETREE_INSTALLED = None
+NUMPY_INSTALLED = None
 INF = 10000
 
 DOT2TEX_TEMPLATE = r'''
@@ -11,6 +11,10 @@ One deviation from standard Graph implementations is to keep in neighbors in
 an other adjacency list. We do this for efficiency reasons considering
 traversing residual graphs.
 
+Adjacency lists are insertion ordered dictionaries that map neighbor names to
+None. They iterate like lists but let us remove edges and nodes in constant
+time per edge.
+
 We have a class for Graph and a class for Node. Edges are not represented as
 objects. They are kept in a dictionary which also keeps their attributes.
 
@@ -58,6 +62,14 @@ from past.utils import old_div
 from builtins import object
 
 from .global_constants import *
+from .frozen_graph import FrozenGraph
+from .edge_store import EdgeColumnStore
+from .pair_matrix import PairMatrix
+from .landmarks import Landmarks
+from .contraction import ContractionHierarchy
+from .bucket_queue import BucketQueue
+from .dynamic_mst import DynamicMST
+from .frozen_graph import sweep
 try:
     from src.blimpy import Stack, Queue, PriorityQueue
 except ImportError:
@@ -70,6 +82,10 @@ import random     # for seed, random, randint
 import tempfile   # for mkstemp()
 import os         # for close()
 import operator   # for itemgetter()
+import collections # for deque()
+import heapq      # for heappush(), heappop()
+import math       # for hypot()
+from array import array
 
 try:
     import pygtk
@@ -108,11 +124,22 @@ except ImportError:
 else:
     ETREE_INSTALLED = True
 
+try:
+    import numpy # for floyd_warshall()
+except ImportError:
+    NUMPY_INSTALLED = False
+else:
+    NUMPY_INSTALLED = True
+
 class Node(object):
     '''
     Node class. A node object keeps node attributes. Has a method to write
-    node in Dot language grammer.
+    node in Dot language grammer. Nodes do not have a per-instance __dict__
+    and the attribute dictionary is allocated on first write, since large
+    graphs have millions of nodes.
     '''
+    __slots__ = ('name', '_attr')
+
     def __init__(self, name, **attr):
         '''
         API: __init__(self, name, **attrs)
@@ -125,9 +152,32 @@ class Node(object):
             Sets self.name and self.attr.
         '''
         self.name = name
-        self.attr = copy.deepcopy(DEFAULT_NODE_ATTRIBUTES)
-        for a in attr:
-            self.attr[a] = attr[a]
+        if DEFAULT_NODE_ATTRIBUTES:
+            self._attr = copy.deepcopy(DEFAULT_NODE_ATTRIBUTES)
+            self._attr.update(attr)
+        elif attr:
+            # attr is a fresh dictionary created for this call
+            self._attr = attr
+        else:
+            self._attr = None
+
+    @property
+    def attr(self):
+        '''
+        API: attr
+        Description:
+        Attribute dictionary of the node. It is allocated when it is first
+        accessed.
+        Return:
+            Returns attribute dictionary.
+        '''
+        if self._attr is None:
+            self._attr = {}
+        return self._attr
+
+    @attr.setter
+    def attr(self, value):
+        self._attr = value
 
     def get_attr(self, attr):
         '''
@@ -139,10 +189,9 @@ class Node(object):
         Return:
             Returns Node attribute attr if exists returns None, otherwise.
         '''
-        if attr in self.attr:
-            return self.attr[attr]
-        else:
+        if self._attr is None:
             return None
+        return self._attr.get(attr)
 
     def set_attr(self, attr, value):
         '''
@@ -155,7 +204,10 @@ class Node(object):
         Post:
             Updates self.attr[attr].
         '''
-        self.attr[attr] = value
+        if self._attr is None:
+            self._attr = {attr:value}
+        else:
+            self._attr[attr] = value
 
     def to_string(self):
         '''
@@ -169,11 +221,11 @@ class Node(object):
         node.append(quote_if_necessary(str(self.name)))
         node.append(' [')
         flag = False
-        for a in self.attr:
+        for a in self._attr or ():
             flag = True
             node.append(a)
             node.append('=')
-            node.append(quote_if_necessary(str(self.attr[a])))
+            node.append(quote_if_necessary(str(self._attr[a])))
             node.append(', ')
         if flag is True:
             node = node[:-1]
@@ -209,11 +261,12 @@ class Graph(object):
             self.neighbors, self.in_neighbors, self.nodes, self.out_neighbors,
             self.cluster
         '''
-        # graph attributes
-        self.attr = copy.deepcopy(DEFAULT_GRAPH_ATTRIBUTES)
-        # set attributes using constructor
-        for a in attr:
-            self.attr[a] = attr[a]
+        # graph attributes, set using constructor
+        if DEFAULT_GRAPH_ATTRIBUTES:
+            self.attr = copy.deepcopy(DEFAULT_GRAPH_ATTRIBUTES)
+            self.attr.update(attr)
+        else:
+            self.attr = attr
         # set name
         if 'name' in self.attr:
             self.name = self.attr['name']
@@ -221,6 +274,12 @@ class Graph(object):
             self.name = 'G'
         # edge attributes
         self.edge_attr = dict()
+        # typed columns of declared edge attributes, see declare_edge_attr()
+        self.edge_store = None
+        # cached results of euclidean_cost_scale() and
+        # get_max_integer_cost(), see clear_cost_cache()
+        self.cost_scale = None
+        self.max_integer_cost = None
         # we treat type attribute and keep it in a separate class attribute
         if 'type' in self.attr:
             self.graph_type = self.attr['type']
@@ -258,7 +317,7 @@ class Graph(object):
         for n in self.nodes:
             data += str(n)
             data += ' -> '
-            data += self.neighbors[n].__repr__()
+            data += list(self.neighbors[n]).__repr__()
             data += '\n'
         data = data[:-1]
         return data
@@ -301,9 +360,9 @@ class Graph(object):
         '''
         if name in self.neighbors:
             raise MultipleNodeException
-        self.neighbors[name] = list()
+        self.neighbors[name] = {}
         if self.graph_type is DIRECTED_GRAPH:
-            self.in_neighbors[name] = list()
+            self.in_neighbors[name] = {}
         self.nodes[name] = Node(name, **attr)
         return self.nodes[name]
 
@@ -321,19 +380,31 @@ class Graph(object):
         '''
         if name not in self.neighbors:
             raise Exception('Node %s does not exist!' %str(name))
-        for n in self.neighbors[name]:
-            del self.edge_attr[(name, n)]
-            if self.graph_type == UNDIRECTED_GRAPH:
-                self.neighbors[n].remove(name)
-            else:
-                self.in_neighbors[n].remove(name)
+        removed = []
         if self.graph_type is DIRECTED_GRAPH:
+            for n in self.neighbors[name]:
+                removed.append(self.edge_attr.pop((name, n)))
+                if n != name:
+                    del self.in_neighbors[n][name]
             for n in self.in_neighbors[name]:
-                del self.edge_attr[(n, name)]
-                self.neighbors[n].remove(name)
+                if n != name:
+                    removed.append(self.edge_attr.pop((n, name)))
+                    del self.neighbors[n][name]
+            del self.in_neighbors[name]
+        else:
+            for n in self.neighbors[name]:
+                if (name, n) in self.edge_attr:
+                    removed.append(self.edge_attr.pop((name, n)))
+                else:
+                    removed.append(self.edge_attr.pop((n, name)))
+                if n != name:
+                    del self.neighbors[n][name]
+        if self.edge_store is not None:
+            for attr in removed:
+                self.edge_store.remove(attr)
         del self.neighbors[name]
-        del self.in_neighbors[name]
         del self.nodes[name]
+        self.clear_cost_cache()
 
     def add_edge(self, name1, name2, **attr):
         '''
@@ -356,18 +427,26 @@ class Graph(object):
             raise MultipleEdgeException
         if self.graph_type is UNDIRECTED_GRAPH and (name2,name1) in self.edge_attr:
             raise MultipleEdgeException
-        self.edge_attr[(name1,name2)] = copy.deepcopy(DEFAULT_EDGE_ATTRIBUTES)
-        for a in attr:
-            self.edge_attr[(name1,name2)][a] = attr[a]
+        if DEFAULT_EDGE_ATTRIBUTES:
+            self.edge_attr[(name1,name2)] = copy.deepcopy(
+                DEFAULT_EDGE_ATTRIBUTES)
+            self.edge_attr[(name1,name2)].update(attr)
+        else:
+            # attr is a fresh dictionary created for this call
+            self.edge_attr[(name1,name2)] = attr
+        if self.edge_store is not None:
+            self.edge_attr[(name1,name2)] = self.edge_store.add(
+                self.edge_attr[(name1,name2)])
         if name1 not in self.nodes:
             self.add_node(name1)
         if name2 not in self.nodes:
             self.add_node(name2)
-        self.neighbors[name1].append(name2)
+        self.neighbors[name1][name2] = None
         if self.graph_type is UNDIRECTED_GRAPH:
-            self.neighbors[name2].append(name1)
+            self.neighbors[name2][name1] = None
         else:
-            self.in_neighbors[name2].append(name1)
+            self.in_neighbors[name2][name1] = None
+        self.clear_cost_cache()
 
     def del_edge(self, e):
         '''
@@ -383,21 +462,158 @@ class Graph(object):
         '''
         if self.graph_type is DIRECTED_GRAPH:
             try:
-                del self.edge_attr[e]
+                attr = self.edge_attr.pop(e)
             except KeyError:
                 raise Exception('Edge %s does not exists!' %str(e))
-            self.neighbors[e[0]].remove(e[1])
-            self.in_neighbors[e[1]].remove(e[0])
+            del self.neighbors[e[0]][e[1]]
+            del self.in_neighbors[e[1]][e[0]]
         else:
             try:
-                del self.edge_attr[e]
+                attr = self.edge_attr.pop(e)
             except KeyError:
                 try:
-                    del self.edge_attr[(e[1],e[0])]
+                    attr = self.edge_attr.pop((e[1],e[0]))
                 except KeyError:
                     raise Exception('Edge %s does not exists!' %str(e))
-            self.neighbors[e[0]].remove(e[1])
-            self.neighbors[e[1]].remove(e[0])
+            del self.neighbors[e[0]][e[1]]
+            if e[0] != e[1]:
+                del self.neighbors[e[1]][e[0]]
+        if self.edge_store is not None:
+            self.edge_store.remove(attr)
+        self.clear_cost_cache()
+
+    def add_nodes_from(self, names, **attr):
+        '''
+        API: add_nodes_from(self, names, **attr)
+        Description:
+        Adds nodes in names to the graph. Each node gets its own copy of attr.
+        Input:
+            names: Iterable of node names.
+            attr: Node attributes.
+        Pre:
+            Graph should not contain a node with any of these names and names
+            should be distinct. Nodes before the first offending name are
+            added when MultipleNodeException is raised.
+        Post:
+            self.neighbors, self.nodes and self.in_neighbors are updated.
+        '''
+        neighbors = self.neighbors
+        nodes = self.nodes
+        directed = self.graph_type is DIRECTED_GRAPH
+        if directed:
+            in_neighbors = self.in_neighbors
+        if hasattr(names, 'tolist'):
+            names = names.tolist()
+        for name in names:
+            if name in neighbors:
+                raise MultipleNodeException
+            neighbors[name] = {}
+            if directed:
+                in_neighbors[name] = {}
+            if attr:
+                nodes[name] = Node(name, **attr)
+            else:
+                nodes[name] = Node(name)
+
+    def add_edges_from(self, edges, **attr):
+        '''
+        API: add_edges_from(self, edges, **attr)
+        Description:
+        Adds edges to the graph in one pass. Missing end nodes are added.
+        Input:
+            edges: Iterable of edges. An edge is a (name1, name2) tuple or a
+            (name1, name2, attrs) tuple where attrs is a dictionary of
+            attributes of this edge.
+            attr: Edge attributes common to all edges. Values in attrs of an
+            edge override these.
+        Pre:
+            Graph should not already contain any of these edges and edges
+            should be distinct. Edges before the first offending edge are
+            added when MultipleEdgeException is raised.
+        Post:
+            self.edge_attr is updated.
+            self.neighbors, self.nodes and self.in_neighbors are updated.
+        '''
+        # cleared first, edges before an offending edge are added
+        self.clear_cost_cache()
+        edge_attr = self.edge_attr
+        neighbors = self.neighbors
+        nodes = self.nodes
+        store = self.edge_store
+        directed = self.graph_type is DIRECTED_GRAPH
+        if directed:
+            in_neighbors = self.in_neighbors
+        else:
+            in_neighbors = neighbors
+        for e in edges:
+            name1 = e[0]
+            name2 = e[1]
+            key = (name1, name2)
+            if key in edge_attr:
+                raise MultipleEdgeException
+            if not directed and (name2, name1) in edge_attr:
+                raise MultipleEdgeException
+            if DEFAULT_EDGE_ATTRIBUTES:
+                a = copy.deepcopy(DEFAULT_EDGE_ATTRIBUTES)
+                a.update(attr)
+            elif attr:
+                a = attr.copy()
+            else:
+                a = {}
+            if len(e) > 2:
+                a.update(e[2])
+            if store is not None:
+                a = store.add(a)
+            edge_attr[key] = a
+            for name in (name1, name2):
+                if name not in nodes:
+                    neighbors[name] = {}
+                    if directed:
+                        in_neighbors[name] = {}
+                    nodes[name] = Node(name)
+            neighbors[name1][name2] = None
+            in_neighbors[name2][name1] = None
+
+    def add_edges_from_arrays(self, tails, heads, **columns):
+        '''
+        API: add_edges_from_arrays(self, tails, heads, **columns)
+        Description:
+        Adds edges (tails[k], heads[k]) to the graph. Edge attributes are
+        given as parallel columns. Inputs can be lists or NumPy arrays.
+        Input:
+            tails: Sequence of source node names.
+            heads: Sequence of sink node names.
+            columns: Edge attribute columns, ie. cost=costs sets 'cost'
+            attribute of edge k to costs[k].
+        Pre:
+            All sequences should have the same length. See add_edges_from().
+        Post:
+            See add_edges_from().
+        '''
+        # NumPy arrays are converted so that names and values are Python
+        # numbers
+        if hasattr(tails, 'tolist'):
+            tails = tails.tolist()
+        if hasattr(heads, 'tolist'):
+            heads = heads.tolist()
+        if len(tails) != len(heads):
+            raise Exception('tails and heads should have the same length!')
+        names = list(columns)
+        values = []
+        for a in names:
+            column = columns[a]
+            if hasattr(column, 'tolist'):
+                column = column.tolist()
+            if len(column) != len(tails):
+                raise Exception('Column %s should have the same length as'
+                                ' tails!' %str(a))
+            values.append(column)
+        if names:
+            edges = ((t, h, dict(zip(names, v)))
+                     for t, h, v in zip(tails, heads, zip(*values)))
+        else:
+            edges = zip(tails, heads)
+        self.add_edges_from(edges)
 
     def get_node(self, name):
         '''
@@ -531,9 +747,12 @@ class Graph(object):
         Pre:
             Graph should have this node.
         Post:
-            Node attribute will be updated.
+            Node attribute will be updated. Cached cost scale is cleared if
+            attr is 'locationx' or 'locationy', see clear_cost_cache().
         '''
         self.get_node(name).set_attr(attr, value)
+        if attr == 'locationx' or attr == 'locationy':
+            self.clear_cost_cache()
 
     def set_edge_attr(self, n, m, attr, value):
         '''
@@ -548,7 +767,8 @@ class Graph(object):
         Pre:
             Graph should have this edge.
         Post:
-            Edge attribute will be updated.
+            Edge attribute will be updated. Cached cost scale and largest
+            cost are cleared if attr is 'cost', see clear_cost_cache().
         '''
         if self.graph_type is DIRECTED_GRAPH:
             self.edge_attr[(n,m)][attr] = value
@@ -557,12 +777,118 @@ class Graph(object):
                 self.edge_attr[(n,m)][attr] = value
             except KeyError:
                 self.edge_attr[(m,n)][attr] = value
+        if attr == 'cost':
+            self.clear_cost_cache()
+
+    def clear_cost_cache(self):
+        '''
+        API: clear_cost_cache(self)
+        Description:
+        Clears the cached results of euclidean_cost_scale() and
+        get_max_integer_cost(). add_edge(), del_edge(), del_node(),
+        add_edges_from(), set_edge_attr() for 'cost' and set_node_attr() for
+        'locationx' or 'locationy' call it. Callers that write these
+        attributes directly, through edge_attr dictionaries, Node.set_attr()
+        or the column returned by get_edge_column(), must call it before the
+        next search. Otherwise A* uses a stale scale and can return paths
+        that are not shortest, and Dial's algorithm raises Exception when a
+        cost is larger than the stale bound.
+        Post:
+            self.cost_scale and self.max_integer_cost are None.
+        '''
+        self.cost_scale = None
+        self.max_integer_cost = None
+
+    def declare_edge_attr(self, attr, typecode = 'd', default = 0):
+        '''
+        API: declare_edge_attr(self, attr, typecode = 'd', default = 0)
+        Description:
+        Declares numeric edge attribute attr. Values of declared attributes
+        are kept in a typed column indexed by edge id instead of attribute
+        dictionaries of edges, see edge_store.py. Existing values of attr are
+        moved to the column.
+        Input:
+            attr: Attribute name, ie. 'cost', 'capacity' or 'flow'.
+            typecode: 'q' for int64 or 'd' for float64 values.
+            default: Value of attr for edges that do not set it.
+        Pre:
+            attr should not be declared already. All values of attr should
+            fit in typecode.
+        Post:
+            self.edge_store is updated. Values of self.edge_attr are
+            EdgeAttributes instances.
+        '''
+        if self.edge_store is None:
+            self.edge_store = EdgeColumnStore()
+            for e in self.edge_attr:
+                self.edge_attr[e] = self.edge_store.add(self.edge_attr[e])
+        self.edge_store.declare(attr, typecode, default)
+
+    def get_edge_column(self, attr):
+        '''
+        API: get_edge_column(self, attr)
+        Description:
+        Returns typed column of declared edge attribute attr. Column is
+        indexed by edge ids, see get_edge_id(). Changes to the column are
+        changes to the attribute, call clear_cost_cache() after changing
+        'cost' through the column.
+        Input:
+            attr: Attribute name.
+        Pre:
+            attr should be declared using declare_edge_attr().
+        Return:
+            array instance.
+        '''
+        if self.edge_store is None or attr not in self.edge_store.columns:
+            raise Exception('Edge attribute %s is not declared!' %str(attr))
+        return self.edge_store.columns[attr]
+
+    def get_declared_edge_column(self, attr):
+        '''
+        API: get_declared_edge_column(self, attr)
+        Description:
+        Returns typed column of edge attribute attr if it is declared, None
+        otherwise. Algorithms read the column at self.edge_attr[e].id when
+        it is given and edge attribute dictionaries otherwise.
+        Input:
+            attr: Attribute name.
+        Return:
+            array instance or None.
+        '''
+        if self.edge_store is None:
+            return None
+        return self.edge_store.columns.get(attr)
+
+    def get_edge_id(self, n, m):
+        '''
+        API: get_edge_id(self, n, m)
+        Description:
+        Returns id of edge (n,m) in typed edge columns. Ids change when edges
+        are deleted.
+        Input:
+            n: Source node name.
+            m: Sink node name.
+        Pre:
+            Graph should have this edge and at least one declared edge
+            attribute.
+        Return:
+            Edge id.
+        '''
+        if self.edge_store is None:
+            raise Exception('Graph has no declared edge attributes!')
+        if self.graph_type is UNDIRECTED_GRAPH and (n,m) not in self.edge_attr:
+            return self.edge_attr[(m,n)].id
+        return self.edge_attr[(n,m)].id
 
     def get_neighbors(self, name):
         '''
         API: get_neighbors(self, name)
         Description:
-        Returns list of neighbors of given node.
+        Returns list of neighbors of given node. The list is a new copy of
+        self.neighbors[name] in insertion order, so it takes O(degree) time.
+        Later changes to the graph do not change the list and changes to the
+        list do not change the graph. Loops that only iterate over the
+        neighbors should iterate over self.neighbors[name] instead.
         Input:
             name: Node name.
         Pre:
@@ -570,13 +896,17 @@ class Graph(object):
         Return:
             List of neighbor node names.
         '''
-        return self.neighbors[name]
+        return list(self.neighbors[name])
 
     def get_in_neighbors(self, name):
         '''
         API: get_in_neighbors(self, name)
         Description:
-        Returns list of in neighbors of given node.
+        Returns list of in neighbors of given node. The list is a new copy of
+        self.in_neighbors[name] in insertion order, so it takes O(degree) time.
+        Later changes to the graph do not change the list and changes to the
+        list do not change the graph. Loops that only iterate over the in
+        neighbors should iterate over self.in_neighbors[name] instead.
         Input:
             name: Node name.
         Pre:
@@ -584,13 +914,17 @@ class Graph(object):
         Return:
             List of in-neighbor node names.
         '''
-        return self.in_neighbors[name]
+        return list(self.in_neighbors[name])
 
     def get_out_neighbors(self, name):
         '''
         API: get_out_neighbors(self, name)
         Description:
-        Returns list of out-neighbors of given node.
+        Returns list of out-neighbors of given node. The list is a new copy of
+        self.neighbors[name] in insertion order, so it takes O(degree) time.
+        Later changes to the graph do not change the list and changes to the
+        list do not change the graph. Loops that only iterate over the
+        out-neighbors should iterate over self.neighbors[name] instead.
         Input:
             name: Node name.
         Pre:
@@ -598,7 +932,7 @@ class Graph(object):
         Return:
             List of out-neighbor node names.
         '''
-        return self.neighbors[name]
+        return list(self.neighbors[name])
 
     def edge_to_string(self, e):
         '''
@@ -696,6 +1030,24 @@ class Graph(object):
         graph.append( '}\n' )
         return ''.join(graph)
 
+    def freeze(self, node_attrs = None, edge_attrs = None):
+        '''
+        API: freeze(self, node_attrs = None, edge_attrs = None)
+        Description:
+        Returns a read-only compressed sparse row snapshot of the graph. Node
+        names are mapped to dense integer ids and numeric attributes are kept
+        in contiguous arrays. See frozen_graph.py for details.
+        Input:
+            node_attrs: List of node attributes to keep in the snapshot. If
+            not given, all attributes with numeric values are kept.
+            edge_attrs: List of edge attributes to keep in the snapshot. If
+            not given, all attributes with numeric values are kept.
+        Return:
+            Returns a FrozenGraph instance. Results of algorithms run on the
+            snapshot can be written back using its write_back() method.
+        '''
+        return FrozenGraph(self, node_attrs, edge_attrs)
+
     def label_components(self, display = None):
         '''
         API: label_components(self, display=None)
@@ -731,98 +1083,125 @@ class Graph(object):
         API: tarjan(self)
         Description:
         Implements Tarjan's algorithm for determining strongly connected set of
-        nodes.
+        nodes. Runs the iterative FrozenGraph.strong_components() on a
+        snapshot of the graph, so it is linear time and does not recurse.
         Pre:
             self.graph_type should be DIRECTED_GRAPH.
         Post:
             Nodes will have 'component' attribute that will have component
-            number as value. Changes 'index' attribute of nodes.
-        '''
-        index = 0
-        component = 0
-        q = []
-        for n in self.get_node_list():
-            if self.get_node_attr(n, 'index') is None:
-                index, component = self.strong_connect(q, n, index, component)
+            number as value. self.num_components is set.
+        Return:
+            Returns array of component numbers of nodes, in the order of
+            get_node_list().
+        '''
+        snapshot = self.freeze(node_attrs = [], edge_attrs = [])
+        self.num_components, component = snapshot.strong_components()
+        for n, c in zip(snapshot.names, component):
+            self.nodes[n].set_attr('component', c)
+        return component
 
-    def strong_connect(self, q, node, index, component):
+    def label_strong_component(self):
         '''
-        API: strong_connect (self, q, node, index, component)
+        API: label_strong_component(self)
         Description:
-        Used by tarjan method. This method should not be called directly by
-        user.
-        Input:
-            q: Node list.
-            node: Node that is being connected to nodes in q.
-            index: Index used by tarjan method.
-            component: Current component number.
+        This method labels the nodes of a directed graph with component
+        numbers so that each node has the same label as all nodes in the
+        same component.
         Pre:
-            Should be called by tarjan and itself (recursive) only.
+            self.graph_type should be DIRECTED_GRAPH.
         Post:
             Nodes will have 'component' attribute that will have component
-            number as value. Changes 'index' attribute of nodes.
-        Return:
-            Returns new index and component numbers.
-        '''
-        self.set_node_attr(node, 'index', index)
-        self.set_node_attr(node, 'lowlink', index)
-        index += 1
-        q.append(node)
-        for m in self.get_neighbors(node):
-            if self.get_node_attr(m, 'index') is None:
-                index, component = self.strong_connect(q, m, index, component)
-                self.set_node_attr(node, 'lowlink',
-                                   min([self.get_node_attr(node, 'lowlink'),
-                                        self.get_node_attr(m, 'lowlink')]))
-            elif m in q:
-                self.set_node_attr(node, 'lowlink',
-                                   min([self.get_node_attr(node, 'lowlink'),
-                                        self.get_node_attr(m, 'index')]))
-        if self.get_node_attr(node, 'lowlink') == self.get_node_attr(node, 'index'):
-            m = q.pop()
-            self.set_node_attr(m, 'component', component)
-            while (node!=m):
-                m = q.pop()
-                self.set_node_attr(m, 'component', component)
-            component += 1
-            self.num_components = component
-
-        return (index, component)
+            number as value.
+        Return:
+            Returns array of component numbers of nodes, in the order of
+            get_node_list().
+        '''
+        self.num_components = 0
+        return self.tarjan()
 
-    def label_strong_component(self):
+    def kosaraju(self, display = None):
         '''
-        API: label_strong_component(self)
+        API: kosaraju(self, display = None)
         Description:
-        This method labels the nodes of a directed graph with component
-        numbers so that each node has the same label as all nodes in the
-        same component.
+        Implements Kosaraju's algorithm for determining strongly connected
+        set of nodes. The first pass runs dfs() from every undiscovered node,
+        the second pass runs dfs() on the transposed graph from nodes in
+        decreasing order of their finishing times. Neighbor lists of the
+        transposed graph are computed once with get_transpose_order() and
+        passed to every dfs() call of the second pass, so it takes O(n+m)
+        time. tarjan() finds the same components without display.
+        Input:
+            display: display method.
         Pre:
             self.graph_type should be DIRECTED_GRAPH.
         Post:
             Nodes will have 'component' attribute that will have component
-            number as value. Changes 'index' attribute of nodes.
+            number as value. self.num_components is set. Updates 'disc_time'
+            and 'finish_time' attributes of nodes.
+        Return:
+            Returns array of component numbers of nodes, in the order of
+            get_node_list().
         '''
+        nl = self.get_node_list()
+        nodes = self.nodes
+        for n in nl:
+            nodes[n].set_attr('component', None)
+            nodes[n].set_attr('disc_time', None)
+            nodes[n].set_attr('finish_time', None)
+        disc_count = 0
+        finish_count = 1
+        for n in nl:
+            if nodes[n].get_attr('disc_time') is None:
+                disc_count, finish_count = self.dfs(n, disc_count,
+                                                    finish_count,
+                                                    display = display)
+        transpose_order = self.get_transpose_order()
+        # finishing times of the first pass are 1, 2, ..., n
+        order = [None]*len(nl)
+        for n in nl:
+            order[len(nl) - nodes[n].get_attr('finish_time')] = n
         self.num_components = 0
-        self.tarjan()
+        disc_count = 0
+        finish_count = 1
+        for n in order:
+            if nodes[n].get_attr('component') is None:
+                disc_count, finish_count = self.dfs(
+                    n, disc_count, finish_count,
+                    component = self.num_components, transpose = True,
+                    display = display, transpose_order = transpose_order)
+                self.num_components += 1
+        return [nodes[n].get_attr('component') for n in nl]
 
     def dfs(self, root, disc_count = 0, finish_count = 1, component = None,
-            transpose = False, display = None, pred = None):
+            transpose = False, display = None, pred = None,
+            transpose_order = None):
         '''
         API: dfs(self, root, disc_count = 0, finish_count = 1, component=None,
-            transpose=False)
+            transpose=False, display=None, pred=None, transpose_order=None)
         Description:
-        Make a depth-first search starting from node with name root.
+        Make a depth-first search starting from node with name root. Uses an
+        explicit stack, so depth of the search is not limited by the
+        recursion limit. Nodes are discovered and finished in the same order
+        as a recursive depth-first search.
         Input:
             root: Starting node name.
             disc_count: Discovery time.
             finish_count: Finishing time.
             component: component number.
             transpose: Goes in the reverse direction along edges if transpose
-            is True.
+            is True. Neighbors are visited in decreasing order of their
+            'finish_time' attribute, as in the second pass of Kosaraju's
+            algorithm.
+            transpose_order: Neighbor lists of get_transpose_order(), used if
+            transpose is True. Computed in O(n+m) time on every call if not
+            given. kosaraju() computes it once and passes it to every call of
+            its second pass.
         Post:
             Nodes will have 'component' attribute that will have component
             number as value. Updates 'disc_time' and 'finish_time' attributes
             of nodes which represents discovery time and finishing time.
+            'label' and 'color' attributes are updated only if display is not
+            'off'.
         Return:
             Returns a tuple that has discovery time and finish time of the
             last node in the following form (disc_time,finish_time).
@@ -833,49 +1212,98 @@ class Graph(object):
             display = self.attr['display']
         else:
             self.set_display_mode(display)
+        headless = (display == 'off')
         neighbors = self.neighbors
-        if self.graph_type == DIRECTED_GRAPH and transpose:
-            neighbors = self.in_neighbors
-        self.get_node(root).set_attr('component', component)
-        disc_count += 1
-        self.get_node(root).set_attr('disc_time', disc_count)
-        self.get_node(root).set_attr('label', str(disc_count)+',-')
-        self.get_node(root).set_attr('color', 'blue')
-        if root in pred:
-            self.set_edge_attr(pred[root], root, 'color', 'green')
-        self.display()
         if transpose:
-            fTime = []
-            for n in neighbors[root]:
-                fTime.append((n,self.get_node(n).get_attr('finish_time')))
-            neighbor_list = sorted(fTime, key=operator.itemgetter(1))
-            neighbor_list = list(t[0] for t in neighbor_list)
-            neighbor_list.reverse()
-        else:
-            neighbor_list = neighbors[root]
-        for i in neighbor_list:
-            if not transpose:
-                if self.get_node(i).get_attr('disc_time') is None:
-                    pred[i] = root
-                    disc_count, finish_count = self.dfs(i, disc_count,
-                                                        finish_count,
-                                                        component, transpose,
-                                                        pred = pred)
-            else:
-                if self.get_node(i).get_attr('component') is None:
-                    disc_count, finish_count = self.dfs(i, disc_count,
-                                                        finish_count,
-                                                        component, transpose,
-                                                        pred = pred)
-        self.get_node(root).set_attr('finish_time', finish_count)
-        d_time = self.get_node(root).get_attr('disc_time')
-        label = '"' + str(d_time) + ',' + str(finish_count) + '"'
-        self.get_node(root).set_attr('label', label)
-        self.get_node(root).set_attr('color', 'green')
-        self.display()
-        finish_count += 1
+            if transpose_order is None:
+                transpose_order = self.get_transpose_order()
+            neighbors = transpose_order
+        nodes = self.nodes
+        # stack of (node, iterator over its remaining neighbors)
+        stack = []
+        discover = root
+        while True:
+            if discover is not None:
+                n = discover
+                discover = None
+                node = nodes[n]
+                node.set_attr('component', component)
+                disc_count += 1
+                node.set_attr('disc_time', disc_count)
+                if not headless:
+                    node.set_attr('label', str(disc_count)+',-')
+                    node.set_attr('color', 'blue')
+                    if n in pred:
+                        self.set_edge_attr(pred[n], n, 'color', 'green')
+                    self.display()
+                stack.append((n, iter(neighbors[n])))
+            if not stack:
+                break
+            n, remaining = stack[-1]
+            for i in remaining:
+                if not transpose:
+                    if nodes[i].get_attr('disc_time') is None:
+                        pred[i] = n
+                        discover = i
+                        break
+                elif nodes[i].get_attr('component') is None:
+                    discover = i
+                    break
+            if discover is not None:
+                continue
+            stack.pop()
+            node = nodes[n]
+            node.set_attr('finish_time', finish_count)
+            if not headless:
+                d_time = node.get_attr('disc_time')
+                label = '"' + str(d_time) + ',' + str(finish_count) + '"'
+                node.set_attr('label', label)
+                node.set_attr('color', 'green')
+                self.display()
+            finish_count += 1
         return disc_count, finish_count
 
+    def get_transpose_order(self):
+        '''
+        API: get_transpose_order(self)
+        Description:
+        Returns neighbor lists of the transposed graph where neighbors of
+        every node are in decreasing order of their 'finish_time' attribute.
+        Nodes are put in this order once with a counting sort over finish
+        times and appended to the lists of their neighbors in that order, so
+        it takes O(n+m) time. Nodes without 'finish_time' come last. Used by
+        dfs() when transpose is True.
+        Pre:
+            'finish_time' attributes of nodes are integers or None, ie. set
+            by dfs().
+        Return:
+            Returns dictionary of neighbor lists keyed by node names.
+        '''
+        nodes = self.nodes
+        finish = {}
+        order = []
+        unfinished = []
+        for n in nodes:
+            t = nodes[n].get_attr('finish_time')
+            if t is None:
+                unfinished.append(n)
+            else:
+                finish[n] = t
+        if finish:
+            low = min(finish.values())
+            buckets = [[] for i in range(max(finish.values()) - low + 1)]
+            for n in finish:
+                buckets[finish[n] - low].append(n)
+            for bucket in reversed(buckets):
+                order.extend(bucket)
+        order.extend(unfinished)
+        transpose_order = dict((n, []) for n in nodes)
+        # (m,n) arcs are (n,m) arcs of the transposed graph
+        for m in order:
+            for n in self.neighbors[m]:
+                transpose_order[n].append(m)
+        return transpose_order
+
     def bfs(self, root, display = None, component = None):
         '''
         API: bfs(self, root, display = None, component=None)
@@ -916,9 +1344,23 @@ class Graph(object):
             destination: Destination node name.
             display: Display method.
             algo: Algortihm that specifies search. Available algortihms are
-            'DFS', 'BFS', 'Dijkstra' and 'Prim'.
+            'DFS', 'BFS', 'Dijkstra', 'Prim', 'AStar' and
+            'BidirectionalDijkstra'. 'BidirectionalDijkstra' requires
+            destination, it is not displayed and returns the path or None,
+            see bidirectional_dijkstra().
             reverse: Search goes in reverse arc directions if True.
-            kargs: Additional keyword arguments.
+            kargs: Additional keyword arguments. For 'AStar', heuristic is a
+            function that takes a node name and returns a lower bound on the
+            cost of a path from the node to destination. It should be
+            consistent, ie. heuristic(n) <= cost(n,m) + heuristic(m) for
+            every arc (n,m). Defaults to euclidean_heuristic(destination).
+            Landmarks.heuristic() of landmarks() can be used for repeated
+            queries on the same graph. For 'Dijkstra', queue='Dial' uses a
+            BucketQueue (Dial's algorithm) instead of a PriorityQueue when q
+            is not given. Arc costs should be nonnegative integers, see
+            get_max_integer_cost(). max_cost gives the largest arc cost of
+            the bucket queue, get_max_integer_cost() is used if it is not
+            given.
         Post:
             Nodes will have 'component' attribute that will have component
             number as value (if component argument provided). Color attribute
@@ -930,6 +1372,8 @@ class Graph(object):
             If there is no path returns predecessor tree in dictionary form.
             See description section.
         '''
+        if algo == 'BidirectionalDijkstra':
+            return self.bidirectional_dijkstra(source, destination)
         if display == None:
             display = self.attr['display']
         else:
@@ -943,8 +1387,21 @@ class Graph(object):
                 q = Queue()
             self.get_node(source).set_attr('component', component)
         elif algo == 'Dijkstra' or algo == 'Prim':
+            if q is None:
+                if algo == 'Dijkstra' and kargs.get('queue') == 'Dial':
+                    max_cost = kargs.get('max_cost')
+                    if max_cost is None:
+                        max_cost = self.get_max_integer_cost()
+                    q = BucketQueue(max_cost)
+                else:
+                    q = PriorityQueue()
+        elif algo == 'AStar':
+            if destination is None:
+                raise Exception('AStar requires a destination')
             if q is None:
                 q = PriorityQueue()
+            if kargs.get('heuristic') is None:
+                kargs['heuristic'] = self.euclidean_heuristic(destination)
         else:
             print("Unknown search algorithm...exiting")
             return
@@ -1012,6 +1469,391 @@ class Graph(object):
         else:
             return None
 
+    def search_headless(self, source, destination = None, algo = 'DFS',
+                        reverse = False, heuristic = None, queue = None,
+                        max_cost = None):
+        '''
+        API: search_headless(self, source, destination = None, algo = 'DFS',
+                             reverse = False, heuristic = None, queue = None,
+                             max_cost = None)
+        Description:
+        Same search as search() without any visualization bookkeeping. Node
+        and edge attributes are not read or written (except 'cost' for
+        'Dijkstra' and 'Prim'), predecessors and distance labels are kept in
+        local dictionaries. Nodes are visited in the same order as search()
+        and the same predecessor tree is found.
+        Input:
+            source: Search starts from node with this name.
+            destination: Search stops when node with this name is reached.
+            algo: Algortihm that specifies search. Available algortihms are
+            'DFS', 'BFS', 'UnweightedSPT', 'Dijkstra', 'Prim' and 'AStar'.
+            'AStar' requires destination.
+            reverse: Search goes in reverse arc directions if True.
+            heuristic: Heuristic function of 'AStar', see search(). Defaults
+            to euclidean_heuristic(destination).
+            queue: If 'Dial', 'Dijkstra' keeps nodes in circular buckets
+            indexed by distance label instead of a heap (Dial's algorithm).
+            Arc costs should be nonnegative integers, see
+            get_max_integer_cost(). Faster than the heap when the largest
+            cost is small compared to the number of nodes.
+            max_cost: Largest arc cost for queue='Dial'. Defaults to
+            get_max_integer_cost(). Raises Exception if an arc cost that is
+            scanned is larger, negative or not an integer.
+        Return:
+            Returns (pred, distance) where pred is the predecessor tree in
+            dictionary form (source is not a key, as in search()) and distance
+            is the dictionary of distance labels of reached nodes. For 'Prim'
+            distance label of a node is the cost of its tree edge. Use
+            get_path() to get path from source to destination.
+        '''
+        neighbors = self.neighbors
+        if self.graph_type == DIRECTED_GRAPH and reverse:
+            neighbors = self.in_neighbors
+        pred = {}
+        distance = {source:0}
+        done = set()
+        if algo == 'DFS':
+            stack = [source]
+            while stack:
+                current = stack[-1]
+                if current in done:
+                    stack.pop()
+                    continue
+                if current == destination:
+                    break
+                stack.pop()
+                dist = distance[current] + 1
+                for n in neighbors[current]:
+                    if n not in done:
+                        distance[n] = dist
+                        stack.append(n)
+                        pred[n] = current
+                done.add(current)
+        elif algo == 'BFS' or algo == 'UnweightedSPT':
+            q = collections.deque([source])
+            while q:
+                current = q.popleft()
+                if current == destination:
+                    break
+                dist = distance[current] + 1
+                for n in neighbors[current]:
+                    if n not in distance:
+                        distance[n] = dist
+                        q.append(n)
+                        pred[n] = current
+        elif algo == 'Dijkstra' and queue == 'Dial':
+            edge_attr = self.edge_attr
+            cost_column = self.get_declared_edge_column('cost')
+            undirected = self.graph_type == UNDIRECTED_GRAPH
+            # buckets[d % num] lists nodes pushed with label d in push order,
+            # so ties are broken as in the heap below. A node is pushed again
+            # when its label decreases, old entries are skipped.
+            if max_cost is None:
+                max_cost = self.get_max_integer_cost()
+            if int(max_cost) != max_cost:
+                raise Exception('max_cost should be an integer!')
+            num = int(max_cost) + 1
+            buckets = [[] for i in range(num)]
+            buckets[0].append(source)
+            size = 1
+            priority = 0
+            found = False
+            while size and not found:
+                bucket = buckets[priority % num]
+                k = 0
+                # zero cost arcs append to the bucket being scanned
+                while k < len(bucket):
+                    current = bucket[k]
+                    k += 1
+                    size -= 1
+                    if current in done or distance[current] != priority:
+                        continue
+                    if current == destination:
+                        found = True
+                        break
+                    for n in neighbors[current]:
+                        if n in done:
+                            continue
+                        if reverse:
+                            e = (n, current)
+                        else:
+                            e = (current, n)
+                        if undirected and e not in edge_attr:
+                            e = (e[1], e[0])
+                        if cost_column is None:
+                            cost = edge_attr[e]['cost']
+                        else:
+                            cost = cost_column[edge_attr[e].id]
+                        if cost < 0 or cost > max_cost or int(cost) != cost:
+                            raise Exception('Cost of edge %s is out of the '
+                                            'range of the buckets!' %str(e))
+                        estimate = priority + int(cost)
+                        if n in distance and estimate >= distance[n]:
+                            continue
+                        pred[n] = current
+                        distance[n] = estimate
+                        buckets[estimate % num].append(n)
+                        size += 1
+                    done.add(current)
+                del bucket[:]
+                priority += 1
+        elif algo == 'Dijkstra' or algo == 'Prim' or algo == 'AStar':
+            edge_attr = self.edge_attr
+            undirected = self.graph_type == UNDIRECTED_GRAPH
+            cost_column = self.get_declared_edge_column('cost')
+            prim = algo == 'Prim'
+            astar = algo == 'AStar'
+            if astar and destination is None:
+                raise Exception('AStar requires a destination')
+            if astar and heuristic is None:
+                heuristic = self.euclidean_heuristic(destination)
+            removed = object()
+            # entries are [priority, count, node], priority of a node is its
+            # distance label, plus its heuristic value for 'AStar'
+            count = 0
+            if astar:
+                entry = {source:[heuristic(source), count, source]}
+            else:
+                entry = {source:[0, count, source]}
+            heap = [entry[source]]
+            while heap:
+                priority, c, current = heapq.heappop(heap)
+                if current is removed:
+                    continue
+                del entry[current]
+                if astar:
+                    priority = distance[current]
+                else:
+                    distance[current] = priority
+                if current == destination:
+                    break
+                for n in neighbors[current]:
+                    if n in done:
+                        continue
+                    if reverse:
+                        e = (n, current)
+                    else:
+                        e = (current, n)
+                    if undirected and e not in edge_attr:
+                        e = (e[1], e[0])
+                    if cost_column is None:
+                        cost = edge_attr[e]['cost']
+                    else:
+                        cost = cost_column[edge_attr[e].id]
+                    if prim:
+                        estimate = cost
+                    else:
+                        estimate = priority + cost
+                    if n in entry:
+                        if estimate >= distance[n]:
+                            continue
+                        entry[n][2] = removed
+                    elif n == source or n in pred:
+                        continue
+                    pred[n] = current
+                    distance[n] = estimate
+                    count += 1
+                    if astar:
+                        entry[n] = [estimate + heuristic(n), count, n]
+                    else:
+                        entry[n] = [estimate, count, n]
+                    heapq.heappush(heap, entry[n])
+                done.add(current)
+        else:
+            raise Exception('Unknown search algorithm %s' %str(algo))
+        return (pred, distance)
+
+    def multi_source_search(self, sources, algo = 'Dijkstra',
+                            reverse = False):
+        '''
+        API: multi_source_search(self, sources, algo = 'Dijkstra',
+                                 reverse = False)
+        Description:
+        Runs one search seeded with all nodes in sources at distance 0 and
+        finds the nearest source of every node, see
+        FrozenGraph.multi_source_search(). Much faster than a search from
+        every source when only the nearest source matters.
+        Input:
+            sources: List of source node names.
+            algo: 'Dijkstra' or 'BFS'.
+            reverse: Search goes in reverse arc directions if True, so
+            distances to the nearest source are found.
+        Pre:
+            Arcs should have nonnegative 'cost' attribute for 'Dijkstra'.
+        Return:
+            Returns (nearest, pred, distance) dictionaries keyed by reached
+            nodes. nearest is the nearest source, pred is the predecessor
+            tree (sources are not keys, as in search_headless()) and distance
+            is the distance from the nearest source.
+        '''
+        if algo == 'Dijkstra':
+            fg = self.freeze(node_attrs=[], edge_attrs=['cost'])
+        else:
+            fg = self.freeze(node_attrs=[], edge_attrs=[])
+        nearest_id, pred_id, distance_id = fg.multi_source_search(sources,
+                                                                  algo,
+                                                                  reverse)
+        names = fg.names
+        nearest = {}
+        pred = {}
+        distance = {}
+        for i in range(len(names)):
+            if nearest_id[i] == -1:
+                continue
+            nearest[names[i]] = names[nearest_id[i]]
+            distance[names[i]] = distance_id[i]
+            if pred_id[i] != -1:
+                pred[names[i]] = names[pred_id[i]]
+        return (nearest, pred, distance)
+
+    def get_max_integer_cost(self):
+        '''
+        API: get_max_integer_cost(self)
+        Description:
+        Returns the largest 'cost' attribute of edges. Used by search() and
+        search_headless() to size the buckets of Dial's algorithm. The result
+        is kept in self.max_integer_cost and computed again only after
+        clear_cost_cache(). If 'cost' is declared, see declare_edge_attr(),
+        its typed column is scanned instead of edge attribute dictionaries.
+        Pre:
+            Every edge should have 'cost' attribute.
+        Return:
+            Returns the largest cost, 0 if there are no edges. Raises
+            Exception if a cost is negative or not an integer.
+        '''
+        if self.max_integer_cost is not None:
+            return self.max_integer_cost
+        store = self.edge_store
+        if store is not None and 'cost' in store.columns:
+            column = store.columns['cost']
+            if not column:
+                self.max_integer_cost = 0
+                return 0
+            if min(column) >= 0 and (column.typecode == 'q' or
+                                     all(c.is_integer() for c in column)):
+                self.max_integer_cost = int(max(column))
+                return self.max_integer_cost
+            # fall back to edges to report the invalid cost
+        max_cost = 0
+        for e in self.edge_attr:
+            cost = self.edge_attr[e]['cost']
+            if cost < 0 or int(cost) != cost:
+                raise Exception('Cost of edge %s is not a nonnegative '
+                                'integer!' %str(e))
+            max_cost = max(max_cost, int(cost))
+        self.max_integer_cost = max_cost
+        return max_cost
+
+    def get_path(self, pred, source, destination):
+        '''
+        API: get_path(self, pred, source, destination)
+        Description:
+        Returns path from source to destination using predecessor tree.
+        Input:
+            pred: Predecessor tree in dictionary form, as returned by search()
+            and search_headless().
+            source: Source node name.
+            destination: Destination node name.
+        Return:
+            Returns list of node names in the path from source to
+            destination, None if destination is not in the tree.
+        '''
+        path = [destination]
+        current = destination
+        while current != source:
+            if current not in pred:
+                return None
+            current = pred[current]
+            path.append(current)
+        path.reverse()
+        return path
+
+    def bidirectional_dijkstra(self, source, destination):
+        '''
+        API: bidirectional_dijkstra(self, source, destination)
+        Description:
+        Finds a shortest path from source to destination by growing a
+        Dijkstra tree forward from source (over neighbors) and backward from
+        destination (over in_neighbors for directed graphs). The side with
+        the smaller tentative distance is scanned next. mu, the length of the
+        best path found through a node labelled by both searches, is updated
+        when an arc reaches a node labelled by the other search. The search
+        stops when the sum of the smallest tentative distances of the two
+        sides is at least mu. Usually far fewer nodes are scanned than in
+        search(source, destination, algo = 'Dijkstra'). Node attributes are
+        not read or written.
+        Input:
+            source: Source node name.
+            destination: Destination node name.
+        Pre:
+            Arcs should have nonnegative 'cost' attribute.
+        Return:
+            Returns list of node names in a shortest path from source to
+            destination, None if there is no path. Raises Exception if
+            destination is None.
+        '''
+        if destination is None:
+            raise Exception('BidirectionalDijkstra requires a destination')
+        if source == destination:
+            return [source]
+        edge_attr = self.edge_attr
+        cost_column = self.get_declared_edge_column('cost')
+        if self.graph_type == DIRECTED_GRAPH:
+            sides = ((self.neighbors, False), (self.in_neighbors, True))
+        else:
+            sides = ((self.neighbors, False), (self.neighbors, False))
+        undirected = self.graph_type == UNDIRECTED_GRAPH
+        # forward side is 0, backward side is 1
+        distance = ({source:0}, {destination:0})
+        pred = ({}, {})
+        done = (set(), set())
+        # entries are (priority, count, node), count breaks ties so node
+        # names are never compared
+        count = 0
+        heap = ([(0, count, source)], [(0, count, destination)])
+        mu = None
+        meet = None
+        while heap[0] and heap[1]:
+            if mu is not None and heap[0][0][0] + heap[1][0][0] >= mu:
+                break
+            side = 0 if heap[0][0][0] <= heap[1][0][0] else 1
+            priority, c, current = heapq.heappop(heap[side])
+            if current in done[side]:
+                continue
+            done[side].add(current)
+            neighbors, reverse = sides[side]
+            distance_side = distance[side]
+            distance_other = distance[1-side]
+            for n in neighbors[current]:
+                if reverse:
+                    e = (n, current)
+                else:
+                    e = (current, n)
+                if undirected and e not in edge_attr:
+                    e = (e[1], e[0])
+                if cost_column is None:
+                    estimate = priority + edge_attr[e]['cost']
+                else:
+                    estimate = priority + cost_column[edge_attr[e].id]
+                if n not in distance_side or estimate < distance_side[n]:
+                    distance_side[n] = estimate
+                    pred[side][n] = current
+                    count += 1
+                    heapq.heappush(heap[side], (estimate, count, n))
+                if n in distance_other:
+                    length = distance_side[n] + distance_other[n]
+                    if mu is None or length < mu:
+                        mu = length
+                        meet = n
+        if mu is None:
+            return None
+        path = self.get_path(pred[0], source, meet)
+        current = meet
+        while current != destination:
+            current = pred[1][current]
+            path.append(current)
+        return path
+
     def process_node_search(self, node, q, **kwargs):
         '''
         API: process_node_search(self, node, q, **kwargs)
@@ -1025,7 +1867,7 @@ class Graph(object):
         Post:
             'priority' attribute of the node may get updated.
         '''
-        if isinstance(q, PriorityQueue):
+        if isinstance(q, (PriorityQueue, BucketQueue)):
             self.get_node(node).set_attr('priority', q.get_priority(node))
 
     def process_edge_dijkstra(self, current, neighbor, pred, q, component):
@@ -1061,6 +1903,197 @@ class Graph(object):
             self.display()
             self.get_node(neighbor).set_attr('color', 'black')
 
+    def process_edge_astar(self, current, neighbor, pred, q, component,
+                           heuristic):
+        '''
+        API: process_edge_astar(self, current, neighbor, pred, q, component,
+                                heuristic)
+        Description:
+        Used by search() method if the algo argument is 'AStar'. Processes
+        edges along A* algorithm. Same as process_edge_dijkstra() except that
+        the distance label is kept in 'distance' attribute and the priority
+        of a node is its distance label plus its heuristic value. User does
+        not need to call this method directly.
+        Input:
+            current: Name of the current node.
+            neighbor: Name of the neighbor node.
+            pred: Predecessor tree.
+            q: Data structure that holds nodes to be processed in a queue.
+            component: component number.
+            heuristic: Heuristic function, see search().
+        Post:
+            'color' and 'distance' attribute of nodes may change.
+        '''
+        neighbor_node = self.get_node(neighbor)
+        if current is None:
+            neighbor_node.set_attr('color', 'red')
+            neighbor_node.set_attr('label', 0)
+            neighbor_node.set_attr('distance', 0)
+            q.push(neighbor, heuristic(neighbor))
+            self.display()
+            neighbor_node.set_attr('color', 'black')
+            return
+        new_estimate = (self.get_node(current).get_attr('distance') +
+                        self.get_edge_attr(current, neighbor, 'cost'))
+        if (neighbor not in pred or
+            new_estimate < neighbor_node.get_attr('distance')):
+            pred[neighbor] = current
+            neighbor_node.set_attr('color', 'red')
+            neighbor_node.set_attr('label', new_estimate)
+            neighbor_node.set_attr('distance', new_estimate)
+            q.push(neighbor, new_estimate + heuristic(neighbor))
+            self.display()
+            neighbor_node.set_attr('color', 'black')
+
+    def landmarks(self, k = 8, method = 'farthest'):
+        '''
+        API: landmarks(self, k = 8, method = 'farthest')
+        Description:
+        Picks k landmark nodes and computes shortest distances from them and
+        to them with Dijkstra's algorithm on a frozen snapshot. The returned
+        tables give A* lower bounds for any destination, see
+        Landmarks.heuristic(). Preprocessing runs 2k searches (k for
+        undirected graphs).
+        Input:
+            k: Number of landmarks.
+            method: 'farthest' picks the node farthest from the landmarks
+            picked so far (nodes not reachable from them first), starting
+            with the farthest node from the node with the largest degree.
+            'degree' picks the nodes with the largest degree.
+        Pre:
+            Arcs should have nonnegative 'cost' attribute.
+        Return:
+            Returns Landmarks instance. It can be saved with its save()
+            method and read with Landmarks.load().
+        '''
+        fg = self.freeze(node_attrs = [], edge_attrs = ['cost'])
+        n = len(fg.names)
+        k = min(k, n)
+        offsets = fg.out_offsets
+        forward_arcs = fg.sweep_arcs(weighted = True)
+        if self.graph_type == DIRECTED_GRAPH:
+            backward_arcs = fg.sweep_arcs(weighted = True, reverse = True)
+        else:
+            backward_arcs = None
+        degree = lambda i: offsets[i+1]-offsets[i]
+        if method == 'degree':
+            landmarks = sorted(range(n), key = degree, reverse = True)[:k]
+        elif method == 'farthest':
+            landmarks = []
+            if n > 0:
+                start = max(range(n), key = degree)
+                distance, pred, order = sweep(forward_arcs, start)
+                landmarks.append(order[-1])
+            # smallest distance from picked landmarks
+            closest = [float('inf')]*n
+        else:
+            raise Exception('Unknown landmark selection method %s'
+                            %str(method))
+        forward = []
+        backward = []
+        l = 0
+        while l < k:
+            distance = sweep(forward_arcs, landmarks[l])[0]
+            forward.append(distance)
+            if backward_arcs is None:
+                backward.append(distance)
+            else:
+                backward.append(sweep(backward_arcs, landmarks[l])[0])
+            l += 1
+            if method == 'farthest' and l < k:
+                for i in range(n):
+                    if distance[i] < closest[i]:
+                        closest[i] = distance[i]
+                landmarks.append(max(range(n), key = closest.__getitem__))
+        return Landmarks(fg.names, [fg.names[i] for i in landmarks],
+                         forward, backward)
+
+    def contraction_hierarchy(self, witness_limit = 100):
+        '''
+        API: contraction_hierarchy(self, witness_limit = 100)
+        Description:
+        Builds a contraction hierarchy of the graph for fast point to point
+        shortest path queries, see contraction.py. Preprocessing contracts
+        every node, queries only scan nodes of higher rank.
+        Input:
+            witness_limit: Number of nodes a witness search can settle.
+        Pre:
+            Arcs should have nonnegative 'cost' attribute.
+        Return:
+            Returns ContractionHierarchy instance. Its query() method returns
+            shortest paths, its save() method writes it to a file that can
+            be read with ContractionHierarchy.load().
+        '''
+        fg = self.freeze(node_attrs = [], edge_attrs = ['cost'])
+        return ContractionHierarchy.build(fg, witness_limit)
+
+    def euclidean_heuristic(self, destination, scale = None):
+        '''
+        API: euclidean_heuristic(self, destination, scale = None)
+        Description:
+        Returns A* heuristic function that estimates cost of a path from a
+        node to destination by Euclidean distance between 'locationx' and
+        'locationy' attributes of the nodes times scale. The heuristic is
+        consistent if scale is at most euclidean_cost_scale().
+        Input:
+            destination: Destination node name.
+            scale: Multiplier of Euclidean distances, euclidean_cost_scale()
+            if not given. The scale is cached on the graph, so it is computed
+            once for many searches on the same graph.
+        Pre:
+            Nodes should have 'locationx' and 'locationy' attributes.
+        Return:
+            Returns a function that takes a node name and returns estimate.
+        '''
+        if scale is None:
+            scale = self.euclidean_cost_scale()
+        nodes = self.nodes
+        x = nodes[destination].get_attr('locationx')
+        y = nodes[destination].get_attr('locationy')
+        def heuristic(n):
+            node = nodes[n]
+            return scale*math.hypot(node.get_attr('locationx') - x,
+                                    node.get_attr('locationy') - y)
+        return heuristic
+
+    def euclidean_cost_scale(self):
+        '''
+        API: euclidean_cost_scale(self)
+        Description:
+        Returns the largest number s such that cost of every edge is at least
+        s times the Euclidean distance between its end nodes. Euclidean
+        distances times s are lower bounds on path costs, see
+        euclidean_heuristic(). Costs of graphs created by random() with
+        Euclidean = True are rounded, so s can be slightly smaller than the
+        scale_cost argument of random().
+        The scale is kept in self.cost_scale and computed again only after
+        clear_cost_cache().
+        Pre:
+            Nodes should have 'locationx' and 'locationy' attributes, edges
+            should have nonnegative 'cost' attribute.
+        Return:
+            Returns the scale, 0 if the graph has no edges between nodes in
+            different locations.
+        '''
+        if self.cost_scale is not None:
+            return self.cost_scale
+        scale = None
+        nodes = self.nodes
+        for e in self.edge_attr:
+            length = math.hypot(
+                nodes[e[0]].get_attr('locationx') -
+                nodes[e[1]].get_attr('locationx'),
+                nodes[e[0]].get_attr('locationy') -
+                nodes[e[1]].get_attr('locationy'))
+            if length > 0:
+                ratio = self.edge_attr[e]['cost']/length
+                if scale is None or ratio < scale:
+                    scale = ratio
+        if scale is None:
+            scale = 0
+        self.cost_scale = scale
+        return scale
+
     def process_edge_prim(self, current, neighbor, pred, q, component):
         '''
         API: process_edge_prim(self, current, neighbor, pred, q, component)
@@ -1119,6 +2152,9 @@ class Graph(object):
         if algo == 'Prim':
             return self.process_edge_prim(current, neighbor, pred, q,
                                           component)
+        if algo == 'AStar':
+            return self.process_edge_astar(current, neighbor, pred, q,
+                                           component, kargs['heuristic'])
         neighbor_node = self.get_node(neighbor)
         if current == None:
             neighbor_node.set_attr('distance', 0)
@@ -1160,53 +2196,56 @@ class Graph(object):
             neighbor_node.set_attr('label', component)
         self.display()
 
-    def minimum_spanning_tree_prim(self, source, display = None,
-                                   q = PriorityQueue()):
+    def minimum_spanning_tree_prim(self, source, display = None, q = None):
         '''
         API: minimum_spanning_tree_prim(self, source, display = None,
-                                        q = PriorityQueue())
+                                        q = None)
         Description:
         Determines a minimum spanning tree of all nodes reachable
         from source using Prim's Algorithm.
         Input:
             source: Name of source node.
             display: Display method.
-            q: Data structure that holds nodes to be processed in a queue.
+            q: Data structure that holds nodes to be processed in a queue. A
+            new PriorityQueue is used if not given.
         Post:
             'color', 'distance', 'component' attribute of nodes and edges may
             change.
         Return:
-            Returns predecessor tree in dictionary format.
+            Returns predecessor tree in dictionary format. Use
+            minimum_spanning_tree_prim_headless() to get the total cost of
+            the tree too.
         '''
         if display == None:
             display = self.attr['display']
         else:
             self.set_display_mode(display)
-        if isinstance(q, PriorityQueue):
-            addToQ = q.push
-            removeFromQ = q.pop
-            peek = q.peek
-            isEmpty = q.isEmpty
-        neighbors = self.get_neighbors
+        if display == 'off' and q is None:
+            return self.minimum_spanning_tree_prim_headless(source)[0]
+        if q is None:
+            q = PriorityQueue()
+        neighbors = self.neighbors
         pred = {}
-        addToQ(source)
-        done = False
-        while not isEmpty() and not done:
-            current = removeFromQ()
+        done = set()
+        q.push(source, 0)
+        while not q.isEmpty():
+            current = q.pop()
+            done.add(current)
             self.set_node_attr(current, 'color', 'blue')
             if current != source:
                 self.set_edge_attr(pred[current], current, 'color', 'green')
             self.display()
-            for n in neighbors(current):
-                if self.get_node_attr(n, 'color') != 'green':
+            for n in neighbors[current]:
+                if n not in done:
                     self.set_edge_attr(current, n, 'color', 'yellow')
                     self.display()
                     new_estimate = self.get_edge_attr(current, n, 'cost')
-                    if not n in pred or new_estimate < peek(n)[0]:
+                    priority = q.get_priority(n)
+                    if priority is None or new_estimate < priority:
                         pred[n] = current
                         self.set_node_attr(n, 'color', 'red')
                         self.set_node_attr(n, 'label', new_estimate)
-                        addToQ(n, new_estimate)
+                        q.push(n, new_estimate)
                         self.display()
                         self.set_node_attr(n, 'color', 'black')
                     self.set_edge_attr(current, n, 'color', 'black')
@@ -1214,6 +2253,31 @@ class Graph(object):
             self.display()
         return pred
 
+    def minimum_spanning_tree_prim_headless(self, source):
+        '''
+        API: minimum_spanning_tree_prim_headless(self, source)
+        Description:
+        Same as minimum_spanning_tree_prim() without visualization, on a
+        snapshot of the graph, see FrozenGraph.prim(). Every call builds its
+        own heap. Used by minimum_spanning_tree_prim() when display is
+        'off'.
+        Input:
+            source: Name of source node.
+        Pre:
+            Edges should have 'cost' attribute.
+        Return:
+            Returns (pred, weight) where pred is the predecessor tree in
+            dictionary format and weight is the total cost of the tree.
+        '''
+        fg = self.freeze(node_attrs=[], edge_attrs=['cost'])
+        pred_id, weight = fg.prim(source)
+        names = fg.names
+        pred = {}
+        for i in range(len(names)):
+            if pred_id[i] != -1:
+                pred[names[i]] = names[pred_id[i]]
+        return (pred, weight)
+
     def minimum_spanning_tree_kruskal(self, display = None, components = None):
         '''
         API: minimum_spanning_tree_kruskal(self, display = None,
@@ -1233,16 +2297,20 @@ class Graph(object):
             display = self.attr['display']
         else:
             self.set_display_mode(display)
+        if display == 'off' and components is None:
+            return self.minimum_spanning_tree_headless()[0]
         if components is None:
+            # sets are displayed without path halving and union by size
             components = DisjointSet(display = display, layout = 'dot',
-                                     optimize = False)
+                                     optimize = display == 'off')
         sorted_edge_list = sorted(self.get_edge_list(), key=self.get_edge_cost)
         edges = []
-        for n in self.get_node_list():
+        nl = self.get_node_list()
+        for n in nl:
             components.add([n])
         components.display()
         for e in sorted_edge_list:
-            if len(edges) == len(self.get_node_list()) - 1:
+            if len(edges) == len(nl) - 1:
                 break
             self.set_edge_attr(e[0], e[1], 'color', 'yellow')
             self.display()
@@ -1256,10 +2324,61 @@ class Graph(object):
             components.display()
         return edges
 
-    def max_flow_preflowpush(self, source, sink, algo = 'FIFO', display = None):
+    def minimum_spanning_tree_headless(self, algo = 'Kruskal',
+                                       processes = None):
+        '''
+        API: minimum_spanning_tree_headless(self, algo = 'Kruskal',
+                                            processes = None)
+        Description:
+        Finds a minimum spanning tree (forest if the graph is not connected)
+        on a snapshot of the graph without visualization, see
+        FrozenGraph.minimum_spanning_tree(). Node and edge attributes are
+        not changed. Used by minimum_spanning_tree_kruskal() when display is
+        'off'.
+        Input:
+            algo: 'Kruskal', 'FilterKruskal' or 'Boruvka'. 'Boruvka'
+            requires NumPy, see FrozenGraph.boruvka().
+            processes: Number of worker processes of 'Boruvka'.
+        Pre:
+            Edges should have 'cost' attribute.
+        Return:
+            Returns (edges, weight) where edges is the list of tree edges in
+            (source,sink) format and weight is their total cost. 'Kruskal'
+            lists edges in the order minimum_spanning_tree_kruskal() adds
+            them, the others find the same edges in a different order.
+        '''
+        fg = self.freeze(node_attrs=[], edge_attrs=['cost'])
+        tree, weight = fg.minimum_spanning_tree(algo, processes=processes)
+        return ([fg.get_edge(k) for k in tree], weight)
+
+    def dynamic_minimum_spanning_tree(self):
+        '''
+        API: dynamic_minimum_spanning_tree(self)
+        Description:
+        Finds a minimum spanning tree (forest if the graph is not connected)
+        with minimum_spanning_tree_headless() and returns it as a DynamicMST
+        that can be updated with its add_edge(), del_edge() and
+        set_edge_cost() methods instead of being recomputed after every
+        change. The DynamicMST keeps its own copy of edge costs, it is not
+        updated when the graph changes.
+        Pre:
+            (1) Graph should be undirected.
+            (2) Edges should have 'cost' attribute.
+        Return:
+            Returns DynamicMST instance.
+        '''
+        if self.graph_type is not UNDIRECTED_GRAPH:
+            raise Exception('Dynamic minimum spanning tree requires an '
+                            'undirected graph!')
+        edges, weight = self.minimum_spanning_tree_headless()
+        costs = dict((e, self.edge_attr[e]['cost']) for e in self.edge_attr)
+        return DynamicMST(self.get_node_list(), costs, edges)
+
+    def max_flow_preflowpush(self, source, sink, algo = 'FIFO', display = None,
+                             write_state = False):
         '''
         API: max_flow_preflowpush(self, source, sink, algo = 'FIFO',
-                                  display = None)
+                                  display = None, write_state = False)
         Description:
         Finds maximum flow from source to sink by a depth-first search based
         augmenting path algorithm.
@@ -1272,13 +2391,20 @@ class Graph(object):
             sink: Sink node name.
             algo: Algorithm choice, 'FIFO', 'SAP' or 'HighestLabel'.
             display: display method.
+            write_state: Used when display is 'off', see
+            preflowpush_headless().
         Post:
-            The 'flow' attribute of each arc gives a maximum flow.
+            The 'flow' attribute of each arc gives a maximum flow. With
+            display, 'excess' and 'distance' attributes of nodes are also
+            updated.
         '''
         if display == None:
             display = self.attr['display']
         else:
             self.set_display_mode(display)
+        if display == 'off':
+            self.preflowpush_headless(source, sink, algo, write_state)
+            return
         nl = self.get_node_list()
         # set excess of all nodes to 0
         for n in nl:
@@ -1364,6 +2490,39 @@ class Graph(object):
                 elif algo == 'HighestLabel':
                     q.push(n, -self.get_node_attr(n, 'distance'))
 
+    def preflowpush_headless(self, source, sink, algo = 'FIFO',
+                             write_state = False):
+        '''
+        API: preflowpush_headless(self, source, sink, algo = 'FIFO',
+                                  write_state = False)
+        Description:
+        Used by max_flow_preflowpush() when display is off. Runs
+        FrozenGraph.max_flow_preflowpush() on a snapshot of the graph, which
+        pushes and relabels in the same order as max_flow_preflowpush() but
+        keeps excesses, distance labels and flows in per-run arrays. Results
+        are written back to the graph only at the end.
+        Input:
+            source: Source node name.
+            sink: Sink node name.
+            algo: Algorithm choice, 'FIFO', 'SAP' or 'HighestLabel'.
+            write_state: Writes final 'excess' and 'distance' attributes of
+            nodes if True.
+        Pre:
+            See max_flow_preflowpush().
+        Post:
+            The 'flow' attribute of each arc gives a maximum flow. Arcs that
+            do not have 'capacity' attribute get capacity INF.
+        '''
+        snapshot = self.freeze(node_attrs = [], edge_attrs = ['capacity'])
+        flow, excess, distance = snapshot.max_flow_preflowpush(source, sink,
+                                                               algo)
+        self.write_flow_column(flow)
+        if write_state:
+            for n, excess_n, distance_n in zip(snapshot.names, excess,
+                                               distance):
+                self.nodes[n].set_attr('excess', excess_n)
+                self.nodes[n].set_attr('distance', distance_n)
+
     def process_edge_flow(self, source, sink, i, j, algo, q):
         '''
         API: process_edge_flow(self, source, sink, i, j, algo, q)
@@ -1414,12 +2573,12 @@ class Graph(object):
             'distance' attribute of node i is updated.
         '''
         min_distance = 2*len(self.get_node_list()) + 1
-        for j in self.get_neighbors(i):
+        for j in self.neighbors[i]:
             if (self.get_node_attr(j, 'distance') < min_distance and
                 (self.get_edge_attr(i, j, 'flow') <
                  self.get_edge_attr(i, j, 'capacity'))):
                 min_distance = self.get_node_attr(j, 'distance')
-        for j in self.get_in_neighbors(i):
+        for j in self.in_neighbors[i]:
             if (self.get_node_attr(j, 'distance') < min_distance and
                 self.get_edge_attr(j, i, 'flow') > 0):
                 min_distance = self.get_node_attr(j, 'distance')
@@ -1530,10 +2689,11 @@ class Graph(object):
         Description:
             Solves feasible flow problem, stores solution in 'flow' attribute
             or arcs. This method is used to get an initial feasible flow for
-            simplex and cycle canceling algorithms. Uses max_flow() method.
-            Other max flow methods can also be used. Returns True if a feasible
-            flow is found, returns False, if the problem is infeasible. When
-            the problem is infeasible 'flow' attributes of arcs should be
+            simplex and cycle canceling algorithms. Runs the augmenting path
+            algorithm of max_flow() on a FrozenGraph snapshot, see
+            FrozenGraph.feasible_flow(). Returns True if a feasible flow is
+            found, returns False, if the problem is infeasible. When the
+            problem is infeasible 'flow' attributes of arcs should be
             considered as junk.
         Pre:
             (1) 'capacity' attribute of arcs
@@ -1544,32 +2704,15 @@ class Graph(object):
             Returns True if a feasible flow is found, returns False, if the
             problem is infeasible
         '''
-        # establish a feasible flow in the network, to do this add nodes s and
-        # t and solve a max flow problem.
-        nl = self.get_node_list()
-        for i in nl:
-            b_i = self.get_node(i).get_attr('demand')
-            if b_i > 0:
-                # i is a supply node, add (s,i) arc
-                self.add_edge('s', i, capacity=b_i)
-            elif b_i < 0:
-                # i is a demand node, add (i,t) arc
-                self.add_edge(i, 't', capacity=-1*b_i)
-        # solve max flow on this modified graph
-        self.max_flow('s', 't', 'off')
-        # check if all demand is satisfied, i.e. the min cost problem is
-        # feasible or not
-        for i in self.neighbors['s']:
-            flow = self.get_edge_attr('s', i, 'flow')
-            capacity = self.get_edge_attr('s', i, 'capacity')
-            if flow != capacity:
-                self.del_node('s')
-                self.del_node('t')
-                return False
-        # remove node 's' and node 't'
-        self.del_node('s')
-        self.del_node('t')
-        return True
+        # establish a feasible flow in the network, to do this solve a max
+        # flow problem from a virtual source with an arc to every supply node
+        # to a virtual sink with an arc from every demand node. One snapshot
+        # is frozen and nodes are not added to the graph.
+        snapshot = self.freeze(node_attrs = ['demand'],
+                               edge_attrs = ['capacity'])
+        feasible, flow = snapshot.feasible_flow()
+        self.write_flow_column(flow)
+        return feasible
 
     def get_layout(self):
         '''
@@ -1805,8 +2948,14 @@ After installation, ensure that the PATH variable is properly set.''')
             sink: Sink node name.
             display: Display mode.
         Post:
-            The 'flow" attribute of each arc gives a maximum flow.
+            The 'flow" attribute of each arc gives a maximum flow. When
+            display mode is 'off' the algorithm runs on a FrozenGraph snapshot
+            and only 'flow' (and 'capacity' of arcs that do not have one) are
+            written to the graph, see max_flow_headless().
         '''
+        if display is None and self.attr['display'] == 'off' or display == 'off':
+            self.max_flow_headless(source, sink, algo)
+            return
         if display is not None:
             old_display =  self.attr['display']
             self.attr['display'] = display
@@ -1846,7 +2995,7 @@ After installation, ensure that the PATH variable is properly set.''')
                     break
                 out_neighbor = self.neighbors[current]
                 in_neighbor = self.in_neighbors[current]
-                neighbor = out_neighbor+in_neighbor
+                neighbor = list(out_neighbor)+list(in_neighbor)
                 for m in neighbor:
                     if m in explored:
                         continue
@@ -1955,6 +3104,57 @@ After installation, ensure that the PATH variable is properly set.''')
         if display is not None:
             self.attr['display'] = old_display
 
+    def max_flow_headless(self, source, sink, algo = 'DFS'):
+        '''
+        API: max_flow_headless(self, source, sink, algo = 'DFS')
+        Description:
+        Used by max_flow() when display is off. Finds the same augmenting
+        paths as max_flow() but keeps flows and search state in per-run
+        arrays of a FrozenGraph snapshot. Flows are written back to the graph
+        only at the end, no other node or edge attribute is touched.
+        Input:
+            source: Source node name.
+            sink: Sink node name.
+            algo: 'DFS' or 'BFS'.
+        Pre:
+            See max_flow().
+        Post:
+            The 'flow' attribute of each arc gives a maximum flow. Arcs that
+            do not have 'capacity' attribute get capacity INF.
+        Return:
+            Value of the maximum flow.
+        '''
+        snapshot = self.freeze(node_attrs = [], edge_attrs = ['capacity'])
+        value, flow = snapshot.max_flow(source, sink, algo)
+        self.write_flow_column(flow)
+        return value
+
+    def write_flow_column(self, flow):
+        '''
+        API: write_flow_column(self, flow)
+        Description:
+        Writes flows found on a FrozenGraph snapshot of the graph to 'flow'
+        attributes of arcs. Arcs that do not have 'capacity' attribute get
+        capacity INF. Used by max_flow_headless(), preflowpush_headless()
+        and find_feasible_flow().
+        Input:
+            flow: List of flows indexed by edge ids of the snapshot, ie. in
+            the order of self.edge_attr.
+        Post:
+            'flow' attributes of arcs are updated.
+        '''
+        flow_column = self.get_declared_edge_column('flow')
+        capacity_column = self.get_declared_edge_column('capacity')
+        if flow_column is not None and capacity_column is not None:
+            # declared capacities are never missing
+            for attr, flow_e in zip(self.edge_attr.values(), flow):
+                flow_column[attr.id] = flow_e
+            return
+        for attr, flow_e in zip(self.edge_attr.values(), flow):
+            attr['flow'] = flow_e
+            if 'capacity' not in attr:
+                attr['capacity'] = INF
+
     def get_negative_cycle(self):
         '''
         API:
@@ -1963,6 +3163,12 @@ After installation, ensure that the PATH variable is properly set.''')
             Finds and returns negative cost cycle using 'cost' attribute of
             arcs. Return value is a list of nodes representing cycle it is in
             the following form; n_1-n_2-...-n_k, when the cycle has k nodes.
+            Uses queue based Bellman-Ford (FIFO label correcting) from a
+            virtual source that has a 0 cost arc to every node. The
+            predecessor graph is checked for a cycle after every n distance
+            label updates and whenever a path of n arcs is labelled, so the
+            running time is O(nm) in the worst case. Arcs are taken in the
+            orientation they are stored in edge_attr.
         Pre:
             Arcs should have 'cost' attribute.
         Return:
@@ -1970,13 +3176,39 @@ After installation, ensure that the PATH variable is properly set.''')
             returns None otherwise.
         '''
         nl = self.get_node_list()
-        i = nl[0]
-        (valid, distance, nextn) = self.floyd_warshall()
-        if not valid:
-            cycle = self.floyd_warshall_get_cycle(distance, nextn)
-            return cycle
-        else:
-            return None
+        n = len(nl)
+        out_arcs = {}
+        for i in nl:
+            out_arcs[i] = []
+        for e in self.edge_attr:
+            out_arcs[e[0]].append((e[1], self.edge_attr[e]['cost']))
+        # labels from the virtual source
+        distance = dict.fromkeys(nl, 0)
+        pred = dict.fromkeys(nl)
+        # number of arcs on the labelled path
+        length = dict.fromkeys(nl, 0)
+        q = collections.deque(nl)
+        in_q = set(nl)
+        updates = 0
+        while q:
+            i = q.popleft()
+            in_q.discard(i)
+            distance_i = distance[i]
+            for j, c_ij in out_arcs[i]:
+                if distance[j] > distance_i + c_ij:
+                    distance[j] = distance_i + c_ij
+                    pred[j] = i
+                    length[j] = length[i] + 1
+                    updates += 1
+                    if length[j] >= n or updates >= n:
+                        updates = 0
+                        cycle = self.label_correcting_find_cycle(pred)
+                        if cycle is not None:
+                            return cycle
+                    if j not in in_q:
+                        q.append(j)
+                        in_q.add(j)
+        return None
 
     def floyd_warshall(self):
         '''
@@ -1994,13 +3226,22 @@ After installation, ensure that the PATH variable is properly set.''')
             between nodes. Then return value can be represented as (validity,
             distance, nextn) where nextn is the dictionary to retrieve paths.
             distance and nextn can be used as inputs to other methods to get
-            shortest path between nodes.
+            shortest path between nodes. nextn[(i,j)] is the node before j on
+            the shortest path from i to j. distance[(i,j)] is 'infinity' and
+            nextn[(i,j)] is None if there is no path from i to j.
+            If NumPy is installed distances are computed on matrices by
+            floyd_warshall_matrix() and distance and nextn are PairMatrix
+            instances that can be indexed the same way. Distances are ints if
+            all costs are ints and floats otherwise, as in the dictionary
+            version.
         Pre:
             Arcs should have 'cost' attribute.
         Return:
             Returns (validity, distance, nextn). The distances are valid if
             validity is True.
         '''
+        if NUMPY_INSTALLED:
+            return self.floyd_warshall_matrix()
         nl = self.get_node_list()
         el = self.get_edge_list()
         # initialize distance
@@ -2043,13 +3284,74 @@ After installation, ensure that the PATH variable is properly set.''')
                 return (False, distance, nextn)
         return (True, distance, nextn)
 
+    def floyd_warshall_matrix(self):
+        '''
+        API:
+            floyd_warshall_matrix(self)
+        Description:
+            Matrix version of floyd_warshall(). Nodes are given indices
+            0, ..., n-1 in get_node_list() order. Distances are kept in an n by
+            n float64 matrix with inf for missing paths and predecessors in an
+            int32 matrix with -1 for missing paths. For every k the matrix is
+            updated with vectorized comparisons on blocks of rows, so the n^3
+            operations run in NumPy instead of the interpreter.
+        Pre:
+            (1) NumPy is installed.
+            (2) Arcs should have 'cost' attribute.
+        Return:
+            Returns (validity, distance, nextn) like floyd_warshall(), where
+            distance and nextn are PairMatrix instances. distance.matrix and
+            nextn.matrix are the NumPy matrices. distance returns ints if all
+            costs are ints.
+        '''
+        nl = self.get_node_list()
+        n = len(nl)
+        index = dict((name, k) for k, name in enumerate(nl))
+        distance = numpy.full((n, n), numpy.inf)
+        nextn = numpy.full((n, n), -1, dtype=numpy.int32)
+        numpy.fill_diagonal(distance, 0)
+        costs = [self.edge_attr[e]['cost'] for e in self.edge_attr]
+        integer = all(isinstance(c, int) for c in costs)
+        if self.edge_attr:
+            tails = numpy.array([index[e[0]] for e in self.edge_attr],
+                                dtype=numpy.intp)
+            heads = numpy.array([index[e[1]] for e in self.edge_attr],
+                                dtype=numpy.intp)
+            distance[tails, heads] = costs
+            nextn[tails, heads] = tails
+            numpy.fill_diagonal(nextn, -1)
+        # rows are updated in blocks that fit in cache, block_through_k and
+        # block_improved are reused for every block
+        block = 64
+        block_through_k = numpy.empty((block, n))
+        block_improved = numpy.empty((block, n), dtype=bool)
+        for k in range(n):
+            column_k = distance[:, k].copy()
+            distance_k = distance[k].copy()
+            nextn_k = nextn[k].copy()
+            for start in range(0, n, block):
+                end = min(start+block, n)
+                through_k = block_through_k[:end-start]
+                improved = block_improved[:end-start]
+                numpy.add(column_k[start:end, None], distance_k, out=through_k)
+                numpy.less(through_k, distance[start:end], out=improved)
+                if improved.any():
+                    numpy.copyto(nextn[start:end], nextn_k, where=improved)
+                    numpy.minimum(distance[start:end], through_k,
+                                  out=distance[start:end])
+        validity = not (numpy.diagonal(distance) < 0).any()
+        return (validity, PairMatrix(distance, nl, 'infinity',
+                                     integer = integer),
+                PairMatrix(nextn, nl, None))
+
     def floyd_warshall_get_path(self, distance, nextn, i, j):
         '''
         API:
             floyd_warshall_get_path(self, distance, nextn, i, j):
         Description:
             Finds shortest path between i and j using distance and nextn
-            dictionaries.
+            dictionaries. The path is built backwards from j by following
+            nextn.
         Pre:
             (1) distance and nextn are outputs of floyd_warshall method.
             (2) The graph does not have a negative cycle, , ie.
@@ -2059,12 +3361,17 @@ After installation, ensure that the PATH variable is properly set.''')
         '''
         if distance[(i,j)]=='infinity':
             return None
-        k = nextn[(i,j)]
-        path = self.floyd_warshall_get_path
-        if i==k:
-            return [i, j]
-        else:
-            return path(distance, nextn, i,k) + [k] + path(distance, nextn, k,j)
+        n = len(self.neighbors)
+        path = [j]
+        current = j
+        while current != i:
+            current = nextn[(i,current)]
+            path.append(current)
+            if len(path) > n:
+                raise Exception('Path from '+str(i)+' to '+str(j)+
+                                ' has a negative cycle!')
+        path.reverse()
+        return path
 
     def floyd_warshall_get_cycle(self, distance, nextn, element = None):
         '''
@@ -2089,18 +3396,139 @@ After installation, ensure that the PATH variable is properly set.''')
                     break
             else:
                 raise Exception('Graph does not have a negative cycle!')
-        elif distance[(element,element)] >= 0:
-            raise Exception('Graph does not have a negative cycle that contains node '+str(element)+'!')
-        # find the cycle on the path from i to i.
-        cycle = [element]
-        k = nextn[(element,element)]
-        while k not in cycle:
-            cycle.insert(1,k)
-            k = nextn[(element,k)]
-        if k==element:
-            return cycle
+        while True:
+            if distance[(element,element)] >= 0:
+                raise Exception('Graph does not have a negative cycle that contains node '+str(element)+'!')
+            # find the cycle on the path from element to element, walking
+            # backwards from element.
+            walk = []
+            walked = set([element])
+            k = nextn[(element,element)]
+            while k not in walked:
+                walk.append(k)
+                walked.add(k)
+                k = nextn[(element,k)]
+            if k==element:
+                walk.reverse()
+                return [element] + walk
+            # walk entered a cycle that does not contain element
+            element = k
+
+    def johnson(self, processes = None):
+        '''
+        API:
+            johnson(self, processes = None)
+        Description:
+            Finds all pair shortest paths with Johnson's algorithm. Costs are
+            reweighted once with Bellman-Ford and Dijkstra's algorithm is run
+            from every node, see FrozenGraph.johnson(). Runs in O(nm log n)
+            time, which is much faster than floyd_warshall() on sparse
+            graphs. Undirected edges can be used in both directions. Return
+            value has the same form as the return value of floyd_warshall(),
+            so floyd_warshall_get_path() can be used to get paths. Use
+            FrozenGraph.johnson() to get the rows one at a time instead.
+        Pre:
+            Arcs should have 'cost' attribute.
+        Input:
+            processes: If given, Dijkstra runs are distributed to this many
+            worker processes.
+        Return:
+            Returns (validity, distance, nextn). validity is False if the
+            graph has a negative cycle, in that case distance and nextn are
+            None, get_negative_cycle() can be used to find the cycle. If NumPy
+            is installed distance and nextn are PairMatrix instances,
+            otherwise they are dictionaries keyed by (i,j) node pairs.
+            Distances are ints if all costs are ints and floats otherwise, as
+            in floyd_warshall().
+        '''
+        fg = self.freeze(node_attrs=[], edge_attrs=['cost'])
+        potential = fg.johnson_potentials()
+        if potential is None:
+            return (False, None, None)
+        nl = fg.names
+        # the column is array('q') if all costs are ints, distances are then
+        # sums of ints and exact in float64
+        integer = getattr(fg.edge_columns['cost'], 'typecode', None) == 'q'
+        rows = fg.johnson(processes=processes, potential=potential)
+        if NUMPY_INSTALLED:
+            n = len(nl)
+            distance = numpy.empty((n, n))
+            nextn = numpy.empty((n, n), dtype=numpy.int32)
+            for k, (i, pred_i, distance_i) in enumerate(rows):
+                distance[k] = distance_i
+                nextn[k] = pred_i
+            return (True, PairMatrix(distance, nl, 'infinity',
+                                     integer = integer),
+                    PairMatrix(nextn, nl, None))
+        distance = {}
+        nextn = {}
+        inf = float('inf')
+        for i, pred_i, distance_i in rows:
+            for k in range(len(nl)):
+                j = nl[k]
+                if distance_i[k] == inf:
+                    distance[(i,j)] = 'infinity'
+                    nextn[(i,j)] = None
+                else:
+                    if integer:
+                        distance[(i,j)] = int(distance_i[k])
+                    else:
+                        distance[(i,j)] = distance_i[k]
+                    if pred_i[k] == -1:
+                        nextn[(i,j)] = None
+                    else:
+                        nextn[(i,j)] = nl[pred_i[k]]
+        return (True, distance, nextn)
+
+    def distance_matrix(self, sources = None, weighted = True,
+                        reverse = False, processes = None):
+        '''
+        API:
+            distance_matrix(self, sources = None, weighted = True,
+                            reverse = False, processes = None)
+        Description:
+            Finds shortest distances from every source to every node with
+            independent searches on one snapshot of the graph, see
+            FrozenGraph.distance_rows(). Faster than calling search() for
+            every source, which resets attributes of the whole graph each
+            time.
+        Pre:
+            Arcs should have nonnegative 'cost' attribute if weighted.
+        Input:
+            sources: List of source node names, all nodes if not given.
+            weighted: Dijkstra on 'cost' attribute if True, BFS (number of
+            arcs) otherwise.
+            reverse: Distances to sources are found if True.
+            processes: If given, searches are distributed to this many
+            worker processes.
+        Return:
+            Returns distance, distance[(s,j)] is the distance from source s
+            to node j, 'infinity' if j is not reachable. If NumPy is installed
+            distance is a PairMatrix whose rows are sources, otherwise it is
+            a dictionary keyed by (s,j) node pairs.
+        '''
+        if weighted:
+            fg = self.freeze(node_attrs=[], edge_attrs=['cost'])
         else:
-            return self.floyd_warshall_get_cycle(distance, nextn, k)
+            fg = self.freeze(node_attrs=[], edge_attrs=[])
+        nl = fg.names
+        if sources is None:
+            sources = list(nl)
+        rows = fg.distance_rows(sources, weighted, reverse, processes)
+        if NUMPY_INSTALLED:
+            distance = numpy.empty((len(sources), len(nl)))
+            for k in range(len(sources)):
+                distance[k] = rows[k]
+            return PairMatrix(distance, nl, 'infinity', rows=sources)
+        distance = {}
+        inf = float('inf')
+        for i, distance_i in zip(sources, rows):
+            for k in range(len(nl)):
+                if distance_i[k] == inf:
+                    distance[(i,nl[k])] = 'infinity'
+                else:
+                    distance[(i,nl[k])] = distance_i[k]
+        return distance
 
     def find_cycle_capacity(self, cycle):
         '''
@@ -2134,7 +3562,10 @@ After installation, ensure that the PATH variable is properly set.''')
         Description:
             finds shortest path from source to every other node. Returns
             predecessor dictionary. If graph has a negative cycle, detects it
-            and returns to it.
+            and returns to it. Nodes are kept in a FIFO queue at most once at
+            a time and the predecessor graph is checked for a cycle after
+            every n distance label updates, or when a path of n arcs is
+            labelled, so a check costs O(1) amortized time per update.
         Pre:
             (1) 'cost' attribute of arcs. It will be used to compute shortest
             path.
@@ -2148,31 +3579,46 @@ After installation, ensure that the PATH variable is properly set.''')
             and cycle is a list of nodes that represents cycle. It is in
             [n_1, n_2, ..., n_k] form where the cycle has k nodes.
         '''
-        pred = {}
-        self.get_node(source).set_attr('distance', 0)
-        pred[source] = None
-        for n in self.neighbors:
-            if n!=source:
-                self.get_node(n).set_attr('distance', 'inf')
-        q = [source]
+        n = len(self.neighbors)
+        out_arcs = {}
+        for i in self.neighbors:
+            out_arcs[i] = [(j, self.get_edge_attr(i, j, 'cost'))
+                           for j in self.neighbors[i]]
+        pred = {source:None}
+        # nodes that are not labelled yet have infinite distance
+        distance = {source:0}
+        # number of arcs on the labelled path
+        length = {source:0}
+        q = collections.deque([source])
+        in_q = set([source])
+        updates = 0
+        cycle = None
         while q:
-            i = q[0]
-            q = q[1:]
-            for j in self.neighbors[i]:
-                distance_j = self.get_node(j).get_attr('distance')
-                distance_i = self.get_node(i).get_attr('distance')
-                c_ij = self.get_edge_attr(i, j, 'cost')
-                if distance_j > distance_i + c_ij:
-                    self.get_node(j).set_attr('distance', distance_i+c_ij)
-                    if j in pred:
-                        pred[j] = i
-                        cycle = self.label_correcting_check_cycle(j, pred)
+            i = q.popleft()
+            in_q.discard(i)
+            distance_i = distance[i]
+            for j, c_ij in out_arcs[i]:
+                if j not in distance or distance[j] > distance_i + c_ij:
+                    distance[j] = distance_i + c_ij
+                    pred[j] = i
+                    length[j] = length[i] + 1
+                    updates += 1
+                    # checking the predecessor graph takes O(n) time, check it
+                    # once every n updates or when the path can not be simple
+                    if length[j] >= n or updates >= n:
+                        updates = 0
+                        cycle = self.label_correcting_find_cycle(pred)
                         if cycle is not None:
-                            return (False, cycle)
-                    else:
-                        pred[j] = i
-                    if j not in q:
+                            break
+                    if j not in in_q:
                         q.append(j)
+                        in_q.add(j)
+            if cycle is not None:
+                break
+        for i in self.neighbors:
+            self.get_node(i).set_attr('distance', distance.get(i, 'inf'))
+        if cycle is not None:
+            return (False, cycle)
         return (True, pred)
 
     def label_correcting_check_cycle(self, j, pred):
@@ -2203,6 +3649,31 @@ After installation, ensure that the PATH variable is properly set.''')
             current = pred[current]
         return None
 
+    def label_correcting_find_cycle(self, pred):
+        '''
+        API:
+            label_correcting_find_cycle(self, pred)
+        Description:
+            Checks if predecessor dictionary has a cycle by walking from every
+            node towards the root. Every node is walked over once, so the
+            check takes O(n) time.
+        Input:
+            pred: predecessor dictionary, roots have None as predecessor.
+        Return:
+            If there exists a cycle, returns the list that represents the
+            cycle, otherwise it returns to None. See
+            label_correcting_get_cycle() for the form of the list.
+        '''
+        walked = {}
+        for start in pred:
+            current = start
+            while current is not None and current not in walked:
+                walked[current] = start
+                current = pred[current]
+            if current is not None and walked[current] == start:
+                return self.label_correcting_get_cycle(current, pred)
+        return None
+
     def label_correcting_get_cycle(self, j, pred):
         '''
         API:
@@ -2266,10 +3737,10 @@ After installation, ensure that the PATH variable is properly set.''')
             flow_ji = self.edge_attr[(j,i)]['flow']
             self.edge_attr[(j,i)]['flow'] = flow_ji-amount
 
-    def network_simplex(self, display, pivot, root):
+    def network_simplex(self, display, pivot, root, write_state = False):
         '''
         API:
-            network_simplex(self, display, pivot, root)
+            network_simplex(self, display, pivot, root, write_state = False)
         Description:
             Solves minimum cost feasible flow problem using network simplex
             algorithm. It is recommended to use min_cost_flow(algo='simplex')
@@ -2284,8 +3755,13 @@ After installation, ensure that the PATH variable is properly set.''')
             spanning tree.
             root: Root node for the underlying spanning trees that will be
             generated by network simplex algorthm.
+            write_state: Node potentials are kept in a per-run dictionary
+            when display is 'off'. They are written to 'potential' attribute
+            of nodes at the end if write_state is True.
         Post:
             (1) Changes 'flow' attribute of edges.
+            (2) Changes 'potential' attribute of nodes if display is not 'off'
+            or write_state is True.
         Return:
             Returns True when an optimal solution is found, returns
             False otherwise.
@@ -2296,40 +3772,52 @@ After installation, ensure that the PATH variable is properly set.''')
             return False
         t = self.simplex_find_tree()
         self.set_display_mode(display)
-        # mark spanning tree arcs
-        self.simplex_mark_st_arcs(t)
-        # display initial spanning tree
-        t.simplex_redraw(display, root)
-        t.set_display_mode(display)
-        #t.display()
-        self.display()
+        headless = (display == 'off')
+        if headless:
+            # potentials are kept in a per-run dictionary
+            potential = {}
+        else:
+            potential = None
+            # mark spanning tree arcs
+            self.simplex_mark_st_arcs(t)
+            # display initial spanning tree
+            t.simplex_redraw(display, root)
+            t.set_display_mode(display)
+            #t.display()
+            self.display()
         # set predecessor, depth and thread indexes
         t.simplex_search(root, 1)
         # compute potentials
-        self.simplex_compute_potentials(t, root)
+        potential = self.simplex_compute_potentials(t, root, potential)
         # while some nontree arc violates optimality conditions
-        while not self.simplex_optimal(t):
+        while not self.simplex_optimal(t, potential):
             self.display()
             # select an entering arc (k,l)
-            (k,l) = self.simplex_select_entering_arc(t, pivot)
-            self.simplex_mark_entering_arc(k, l)
-            self.display()
+            (k,l) = self.simplex_select_entering_arc(t, pivot, potential)
+            if not headless:
+                self.simplex_mark_entering_arc(k, l)
+                self.display()
             # determine leaving arc
             ((p,q), capacity, cycle)=self.simplex_determine_leaving_arc(t,k,l)
-            # mark leaving arc
-            self.simplex_mark_leaving_arc(p, q)
-            self.display()
+            if not headless:
+                # mark leaving arc
+                self.simplex_mark_leaving_arc(p, q)
+                self.display()
             self.simplex_remove_arc(t, p, q, capacity, cycle)
-            # display after arc removed
-            self.display()
-            self.simplex_mark_st_arcs(t)
-            self.display()
+            if not headless:
+                # display after arc removed
+                self.display()
+                self.simplex_mark_st_arcs(t)
+                self.display()
+                t.simplex_redraw(display, root)
+                #t.display()
             # set predecessor, depth and thread indexes
-            t.simplex_redraw(display, root)
-            #t.display()
             t.simplex_search(root, 1)
             # compute potentials
-            self.simplex_compute_potentials(t, root)
+            potential = self.simplex_compute_potentials(t, root, potential)
+        if headless and write_state:
+            for n in potential:
+                self.nodes[n].set_attr('potential', potential[n])
         return True
 
     def simplex_mark_leaving_arc(self, p, q):
@@ -2373,7 +3861,7 @@ After installation, ensure that the PATH variable is properly set.''')
         index = 0
         # determine last blocking arc
         t.add_edge(k, l)
-        tel = t.get_edge_list()
+        tel = t.edge_attr
         while index < (n-1):
             if (cycle[index], cycle[index+1]) in tel:
                 flow = self.edge_attr[(cycle[index], cycle[index+1])]['flow']
@@ -2432,7 +3920,7 @@ After installation, ensure that the PATH variable is properly set.''')
         Post:
             (1) color attribute of edges.
         '''
-        tel = list(t.edge_attr.keys())
+        tel = t.edge_attr
         for e in self.get_edge_list():
             flow_e = self.edge_attr[e]['flow']
             capacity_e = self.edge_attr[e]['capacity']
@@ -2480,8 +3968,7 @@ After installation, ensure that the PATH variable is properly set.''')
         Return:
             Returns a graph same as self.
         '''
-        nl = self.get_node_list()
-        el = self.get_edge_list()
+        el = self.edge_attr
         new = Graph(type=DIRECTED_GRAPH, layout='dot', display=display)
         pred_i = self.get_node(root).get_attr('pred')
         thread_i = self.get_node(root).get_attr('thread')
@@ -2492,9 +3979,9 @@ After installation, ensure that the PATH variable is properly set.''')
         while q:
             name = q.pop()
             visited.append(name)
-            neighbors = self.neighbors[name] + self.in_neighbors[name]
+            neighbors = list(self.neighbors[name]) + list(self.in_neighbors[name])
             for n in neighbors:
-                if n not in new.get_node_list():
+                if n not in new.nodes:
                     pred_i = self.get_node(n).get_attr('pred')
                     thread_i = self.get_node(n).get_attr('thread')
                     depth_i = self.get_node(n).get_attr('depth')
@@ -2507,7 +3994,7 @@ After installation, ensure that the PATH variable is properly set.''')
                         new.add_edge(n,name)
                 if n not in visited:
                     q.append(n)
-        for e in el:
+        for e in self.get_edge_list():
             flow = self.edge_attr[e]['flow']
             capacity = self.edge_attr[e]['capacity']
             cost = self.edge_attr[e]['cost']
@@ -2536,7 +4023,7 @@ After installation, ensure that the PATH variable is properly set.''')
         '''
         # augment min_capacity along cycle
         n = len(cycle)
-        tel = list(t.edge_attr.keys())
+        tel = t.edge_attr
         index = 0
         while index < (n-1):
             if (cycle[index], cycle[index+1]) in tel:
@@ -2575,30 +4062,43 @@ After installation, ensure that the PATH variable is properly set.''')
             t.edge_attr[e]['label'] = "%d/%d/%d" %(flow,capacity,cost)
             self.edge_attr[e]['label'] = "%d/%d/%d" %(flow,capacity,cost)
 
-    def simplex_select_entering_arc(self, t, pivot):
+    def simplex_select_entering_arc(self, t, pivot, potential = None):
         '''
         API:
-            simplex_select_entering_arc(self, t, pivot)
+            simplex_select_entering_arc(self, t, pivot, potential = None)
         Description:
             Decides and returns entering arc using pivot rule.
         Input:
             t: current spanning tree solution
             pivot: May be one of the following; 'first_eligible' or 'dantzig'.
             'dantzig' is the default value.
+            potential: Dictionary of node potentials. 'potential' attribute
+            of nodes is used if not given.
         Return:
             Returns entering arc tuple (k,l)
         '''
+        if potential is None:
+            potential = self.simplex_get_potentials()
+        columns = self.simplex_get_columns()
+        if columns is not None:
+            flow, capacity, cost = columns
         if pivot=='dantzig':
             # pick the maximum violation
             candidate = {}
-            for e in self.edge_attr:
+            for e, attr in self.edge_attr.items():
                 if e in t.edge_attr:
                     continue
-                flow_ij = self.edge_attr[e]['flow']
-                potential_i = self.get_node(e[0]).get_attr('potential')
-                potential_j = self.get_node(e[1]).get_attr('potential')
-                capacity_ij = self.edge_attr[e]['capacity']
-                c_ij = self.edge_attr[e]['cost']
+                if columns is None:
+                    flow_ij = attr['flow']
+                    capacity_ij = attr['capacity']
+                    c_ij = attr['cost']
+                else:
+                    k = attr.id
+                    flow_ij = flow[k]
+                    capacity_ij = capacity[k]
+                    c_ij = cost[k]
+                potential_i = potential[e[0]]
+                potential_j = potential[e[1]]
                 cpi_ij = c_ij - potential_i + potential_j
                 if flow_ij==0:
                     if cpi_ij < 0:
@@ -2616,14 +4116,20 @@ After installation, ensure that the PATH variable is properly set.''')
                     max_v = abs(candidate[e])
         elif pivot=='first_eligible':
             # pick the first eligible
-            for e in self.edge_attr:
+            for e, attr in self.edge_attr.items():
                 if e in t.edge_attr:
                     continue
-                flow_ij = self.edge_attr[e]['flow']
-                potential_i = self.get_node(e[0]).get_attr('potential')
-                potential_j = self.get_node(e[1]).get_attr('potential')
-                capacity_ij = self.edge_attr[e]['capacity']
-                c_ij = self.edge_attr[e]['cost']
+                if columns is None:
+                    flow_ij = attr['flow']
+                    capacity_ij = attr['capacity']
+                    c_ij = attr['cost']
+                else:
+                    k = attr.id
+                    flow_ij = flow[k]
+                    capacity_ij = capacity[k]
+                    c_ij = cost[k]
+                potential_i = potential[e[0]]
+                potential_j = potential[e[1]]
                 cpi_ij = c_ij - potential_i + potential_j
                 if flow_ij==0:
                     if cpi_ij < 0:
@@ -2637,10 +4143,10 @@ After installation, ensure that the PATH variable is properly set.''')
             raise Exception("Unknown pivot rule.")
         return max_c
 
-    def simplex_optimal(self, t):
+    def simplex_optimal(self, t, potential = None):
         '''
         API:
-            simplex_optimal(self, t)
+            simplex_optimal(self, t, potential = None)
         Description:
             Checks if the current solution is optimal, if yes returns True,
             False otherwise.
@@ -2648,18 +4154,31 @@ After installation, ensure that the PATH variable is properly set.''')
             'flow' attributes represents a solution.
         Input:
             t: Graph instance tat reperesents spanning tree solution.
+            potential: Dictionary of node potentials. 'potential' attribute
+            of nodes is used if not given.
         Return:
             Returns True if the current solution is optimal (optimality
             conditions are satisfied), else returns False
         '''
-        for e in self.edge_attr:
+        if potential is None:
+            potential = self.simplex_get_potentials()
+        columns = self.simplex_get_columns()
+        if columns is not None:
+            flow, capacity, cost = columns
+        for e, attr in self.edge_attr.items():
             if e in t.edge_attr:
                 continue
-            flow_ij = self.edge_attr[e]['flow']
-            potential_i = self.get_node(e[0]).get_attr('potential')
-            potential_j = self.get_node(e[1]).get_attr('potential')
-            capacity_ij = self.edge_attr[e]['capacity']
-            c_ij = self.edge_attr[e]['cost']
+            if columns is None:
+                flow_ij = attr['flow']
+                capacity_ij = attr['capacity']
+                c_ij = attr['cost']
+            else:
+                k = attr.id
+                flow_ij = flow[k]
+                capacity_ij = capacity[k]
+                c_ij = cost[k]
+            potential_i = potential[e[0]]
+            potential_j = potential[e[1]]
             cpi_ij = c_ij - potential_i + potential_j
             if flow_ij==0:
                 if cpi_ij < 0:
@@ -2669,6 +4188,40 @@ After installation, ensure that the PATH variable is properly set.''')
                     return False
         return True
 
+    def simplex_get_columns(self):
+        '''
+        API:
+            simplex_get_columns(self)
+        Description:
+            Returns typed columns of 'flow', 'capacity' and 'cost' edge
+            attributes if all of them are declared, None otherwise. Pricing
+            in simplex_optimal() and simplex_select_entering_arc() reads the
+            columns by edge id when they are given.
+        Return:
+            Returns (flow, capacity, cost) tuple of array instances, or None.
+        '''
+        columns = (self.get_declared_edge_column('flow'),
+                   self.get_declared_edge_column('capacity'),
+                   self.get_declared_edge_column('cost'))
+        if None in columns:
+            return None
+        return columns
+
+    def simplex_get_potentials(self):
+        '''
+        API:
+            simplex_get_potentials(self)
+        Description:
+            Returns dictionary of 'potential' attributes of nodes. Used by
+            simplex methods when they are not given a potential dictionary.
+        Return:
+            Dictionary of node potentials.
+        '''
+        potential = {}
+        for n in self.nodes:
+            potential[n] = self.nodes[n].get_attr('potential')
+        return potential
+
     def simplex_find_tree(self):
         '''
         API:
@@ -2778,7 +4331,8 @@ After installation, ensure that the PATH variable is properly set.''')
             current = q.pop()
             self.get_node(current).set_attr('component', component_nr)
             sequence.append(current)
-            neighbors = self.in_neighbors[current] + self.neighbors[current]
+            neighbors = (list(self.in_neighbors[current]) +
+                         list(self.neighbors[current]))
             for n in neighbors:
                 if n in pred:
                     continue
@@ -2810,7 +4364,7 @@ After installation, ensure that the PATH variable is properly set.''')
         # find amount to augment
         index = 0
         k = len(cycle)
-        el = list(self.edge_attr.keys())
+        el = self.edge_attr
         # check arc (cycle[k-1], cycle[0])
         if (cycle[k-1], cycle[0]) in el:
             min_capacity = self.edge_attr[(cycle[k-1], cycle[0])]['capacity']-\
@@ -2858,8 +4412,8 @@ After installation, ensure that the PATH variable is properly set.''')
             while q:
                 current = q.pop()
                 visited.append(current)
-                neighbors = self.in_neighbors[current] +\
-                    self.neighbors[current]
+                neighbors = (list(self.in_neighbors[current]) +
+                             list(self.neighbors[current]))
                 for n in neighbors:
                     if n==pred[current]:
                         continue
@@ -2925,14 +4479,15 @@ After installation, ensure that the PATH variable is properly set.''')
                 simplex_g.add_edge(e[0], e[1])
         return simplex_g
 
-    def simplex_compute_potentials(self, t, root):
+    def simplex_compute_potentials(self, t, root, potential = None):
         '''
         API:
-            simplex_compute_potentials(self, t, root)
+            simplex_compute_potentials(self, t, root, potential = None)
         Description:
             Computes node potentials for a minimum cost flow problem and stores
-            them as node attribute 'potential'. Based on pseudocode given in
-            Network Flows by Ahuja et al.
+            them as node attribute 'potential', or in potential dictionary if
+            it is given. Based on pseudocode given in Network Flows by Ahuja
+            et al.
         Pre:
             (1) Assumes a directed graph in which each arc has a 'cost'
             attribute.
@@ -2940,21 +4495,33 @@ After installation, ensure that the PATH variable is properly set.''')
         Input:
             t: Current spanning tree solution, its type is Graph.
             root: root node of the tree.
+            potential: Dictionary to keep potentials in. Node attributes are
+            used if not given.
         Post:
-            Keeps the node potentials as 'potential' attribute.
+            Keeps the node potentials as 'potential' attribute if potential
+            is not given.
+        Return:
+            Returns dictionary of node potentials.
         '''
-        self.get_node(root).set_attr('potential', 0)
+        write_attr = potential is None
+        if write_attr:
+            potential = {}
+        potential[root] = 0
         j = t.get_node(root).get_attr('thread')
         while j is not root:
             i = t.get_node(j).get_attr('pred')
-            potential_i = self.get_node(i).get_attr('potential')
+            potential_i = potential[i]
             if (i,j) in self.edge_attr:
                 c_ij = self.edge_attr[(i,j)]['cost']
-                self.get_node(j).set_attr('potential', potential_i-c_ij)
+                potential[j] = potential_i-c_ij
             if (j,i) in self.edge_attr:
                 c_ji = self.edge_attr[(j,i)]['cost']
-                self.get_node(j).set_attr('potential', potential_i+c_ji)
+                potential[j] = potential_i+c_ji
             j = t.get_node(j).get_attr('thread')
+        if write_attr:
+            for n in potential:
+                self.get_node(n).set_attr('potential', potential[n])
+        return potential
 
     def simplex_identify_cycle(self, t, k, l):
         '''
@@ -3033,10 +4600,11 @@ After installation, ensure that the PATH variable is properly set.''')
                 root: valid if algo is 'simlex', specifies the root node for
                     simplex algorithm. It is name of the one of the nodes. It
                     will be chosen randomly if not provided.
+                write_state: valid if algo is 'simplex', writes final node
+                    potentials to 'potential' attribute of nodes when display
+                    is 'off'. False is used if not given.
         Post:
             The 'flow' attribute of each arc gives the optimal flows.
-            'distance' attribute of the nodes are also changed during max flow
-            solution process.
         Examples:
             g.min_cost_flow():
                 solves minimum cost feasible flow problem using simplex
@@ -3062,11 +4630,14 @@ After installation, ensure that the PATH variable is properly set.''')
                 for k in self.neighbors:
                     root = k
                     break
+            write_state = args.get('write_state', False)
             if 'pivot' in args:
-                if not self.network_simplex(display, args['pivot'], root):
+                if not self.network_simplex(display, args['pivot'], root,
+                                            write_state):
                     print('problem is infeasible')
             else:
-                if not self.network_simplex(display, 'dantzig', root):
+                if not self.network_simplex(display, 'dantzig', root,
+                                            write_state):
                     print('problem is infeasible')
         elif algorithm is 'cycle_canceling':
             if not self.cycle_canceling(display):
@@ -3262,9 +4833,9 @@ After installation, ensure that the PATH variable is properly set.''')
             # computes each node PageRank based on inbound links
             for node in nodes:
                 rank = min_value
-                for referring_page in self.get_in_neighbors(node):
+                for referring_page in self.in_neighbors[node]:
                     rank += (damping_factor * pagerank[referring_page] /
-                             len(self.get_neighbors(referring_page)))
+                             len(self.neighbors[referring_page]))
                 diff += abs(pagerank[node] - rank)
                 pagerank[node] = rank
             #stop if PageRank has converged
@@ -3285,12 +4856,12 @@ After installation, ensure that the PATH variable is properly set.''')
         degree = {}
         if self.attr['type'] is not DIRECTED_GRAPH:
             for n in self.get_node_list():
-                degree[n] = len(self.get_neighbors(n))
+                degree[n] = len(self.neighbors[n])
             return degree
         else:
             for n in self.get_node_list():
-                degree[n] = (len(self.get_in_neighbors(n)) +
-                             len(self.get_out_neighbors(n)))
+                degree[n] = (len(self.in_neighbors[n]) +
+                             len(self.neighbors[n]))
 
     def get_in_degrees(self):
         '''
@@ -3307,7 +4878,7 @@ After installation, ensure that the PATH variable is properly set.''')
             print('This function only works for directed graphs')
             return
         for n in self.get_node_list():
-            degree[n] = len(self.get_in_neighbors(n))
+            degree[n] = len(self.in_neighbors[n])
         return degree
 
     def get_out_degrees(self):
@@ -3325,40 +4896,59 @@ After installation, ensure that the PATH variable is properly set.''')
             print('This function only works for directed graphs')
             return
         for n in self.get_node_list():
-            degree[n] = len(self.get_out_neighbors(n))
+            degree[n] = len(self.neighbors[n])
         return degree
 
-    def get_diameter(self):
+    def get_eccentricity(self, n, weighted = False):
+        '''
+        API:
+            get_eccentricity(self, n, weighted = False)
+        Description:
+            Returns eccentricity of node n, the largest shortest path
+            distance from n to any node. Uses one search.
+        Input:
+            n: Node name.
+            weighted: Distances are computed using 'cost' attribute of arcs
+            if True, number of arcs otherwise.
+        Return:
+            Returns eccentricity of n, 'infinity' if some node is not
+            reachable from n.
+        '''
+        if weighted:
+            pred, distance = self.search_headless(n, algo = 'Dijkstra')
+        else:
+            pred, distance = self.search_headless(n, algo = 'BFS')
+        if len(distance) < len(self.neighbors):
+            return 'infinity'
+        return max(distance.values())
+
+    def get_diameter(self, weighted = False, processes = None):
         '''
         API:
-            get_diameter(self)
+            get_diameter(self, weighted = False, processes = None)
         Description:
             Returns diameter of the graph. Diameter is defined as follows.
             distance(n,m): shortest unweighted path from n to m
             eccentricity(n) = $\max _m distance(n,m)$
-            diameter = $\min _n eccentricity(n) = \min _n \max _m distance(n,m)$
+            diameter = $\max _n eccentricity(n) = \max _n \max _m distance(n,m)$
+            Eccentricities are computed on a frozen snapshot and only as
+            many of them as needed are computed, see FrozenGraph.diameter().
+        Input:
+            weighted: Distances are computed using 'cost' attribute of arcs
+            if True, number of arcs otherwise.
+            processes: If given, searches are distributed to this many worker
+            processes.
         Return:
-            Returns diameter of the graph.
+            Returns diameter of the graph, 'infinity' if the graph is not
+            connected.
         '''
-
-        if self.attr['type'] is not UNDIRECTED_GRAPH:
-            print('This function only works for undirected graphs')
-            return
-        diameter = 'infinity'
-        eccentricity_n = 0
-        for n in self.get_node_list():
-            for m in self.get_node_list():
-                path_n_m = self.search(n, destination = m, algo = 'BFS')
-                if path_n_m is None:
-                    # this indicates there is no path from n to m, no diameter
-                    # is defined, since the graph is not connected, return
-                    # 'infinity'
-                    return 'infinity'
-                distance_n_m = len(path_n_m)-1
-                if distance_n_m > eccentricity_n:
-                    eccentricity_n = distance_n_m
-            if diameter is 'infinity' or eccentricity_n > diameter:
-                diameter = eccentricity_n
+        if weighted:
+            fg = self.freeze(node_attrs = [], edge_attrs = ['cost'])
+        else:
+            fg = self.freeze(node_attrs = [], edge_attrs = [])
+        diameter = fg.diameter(weighted, processes)
+        if diameter == float('inf'):
+            return 'infinity'
         return diameter
 
     def create_cluster(self, node_list, cluster_attrs={}, node_attrs={}):
@@ -3392,9 +4982,12 @@ After installation, ensure that the PATH variable is properly set.''')
                               'node_attrs':copy.deepcopy(node_attrs)}
 
 
-class DisjointSet(Graph):
+class DisjointSet(object):
     '''
-    Disjoint set data structure. Inherits Graph class.
+    Disjoint set (union-find) data structure. Items are mapped to dense
+    integer ids, parent links and set sizes are kept in arrays indexed by
+    ids. A Graph of parent links is built only when the sets are displayed,
+    see to_graph().
     '''
     def __init__(self, optimize = True, **attrs):
         '''
@@ -3403,31 +4996,44 @@ class DisjointSet(Graph):
         Description:
             Class constructor.
         Input:
-            optimize: Optimizes find() if True.
-            attrs: Graph attributes.
+            optimize: If True find() halves paths and union() makes the root
+            of the smaller set a child of the other root.
+            attrs: Graph attributes used by display().
         Post:
-            self.optimize will be updated.
+            self.optimize, self.attr, self.index, self.items, self.parent,
+            self.size and self.graph will be updated.
         '''
-        attrs['type'] = DIRECTED_GRAPH
-        Graph.__init__(self, **attrs)
-        self.sizes = {}
         self.optimize = optimize
+        self.attr = attrs
+        # item -> id and id -> item
+        self.index = {}
+        self.items = []
+        # parent[k] is k for roots, size[k] is size of the set of root k
+        self.parent = array('l')
+        self.size = array('l')
+        # graph of parent links, created by display()
+        self.graph = None
 
     def add(self, aList):
         '''
         API:
             add(self, aList)
         Description:
-            Adds items in the list to the set.
+            Adds items in the list to the set as a new set with root
+            aList[0].
         Input:
             aList: List of items.
         Post:
-            self.sizes will be updated.
-        '''
-        self.add_node(aList[0])
-        for i in range(1, len(aList)):
-            self.add_edge(aList[i], aList[0])
-        self.sizes[aList[0]] = len(aList)
+            self.index, self.items, self.parent and self.size will be
+            updated.
+        '''
+        root = len(self.items)
+        for i in aList:
+            self.index[i] = len(self.items)
+            self.items.append(i)
+            self.parent.append(root)
+            self.size.append(1)
+        self.size[root] = len(aList)
 
     def union(self, i, j):
         '''
@@ -3439,19 +5045,22 @@ class DisjointSet(Graph):
             i: Item.
             j: Item.
         Post:
-            self.sizes will be updated.
+            self.parent and self.size will be updated.
+        Return:
+            Returns False if i and j are already in the same set, True
+            otherwise.
         '''
-        roots = (self.find(i), self.find(j))
+        roots = (self.find_id(self.index[i]), self.find_id(self.index[j]))
         if roots[0] == roots[1]:
             return False
-        if self.sizes[roots[0]] <= self.sizes[roots[1]] or not self.optimize:
-            self.add_edge(roots[0], roots[1])
-            self.sizes[roots[1]] += self.sizes[roots[0]]
-            return True
+        size = self.size
+        if size[roots[0]] <= size[roots[1]] or not self.optimize:
+            self.parent[roots[0]] = roots[1]
+            size[roots[1]] += size[roots[0]]
         else:
-            self.add_edge(roots[1], roots[0])
-            self.sizes[roots[0]] += self.sizes[roots[1]]
-            return True
+            self.parent[roots[1]] = roots[0]
+            size[roots[0]] += size[roots[1]]
+        return True
 
     def find(self, i):
         '''
@@ -3464,18 +5073,125 @@ class DisjointSet(Graph):
         Return:
             Returns root of set that has i.
         '''
-        current = i
-        edge_list = []
-        while len(self.get_neighbors(current)) != 0:
-            successor = self.get_neighbors(current)[0]
-            edge_list.append((current, successor))
-            current = successor
+        return self.items[self.find_id(self.index[i])]
+
+    def find_id(self, k):
+        '''
+        API:
+            find_id(self, k)
+        Description:
+            Returns id of root of set that has item with id k. Used by find()
+            and union().
+        '''
+        parent = self.parent
         if self.optimize:
-            for e in edge_list:
-                if e[1] != current:
-                    self.del_edge((e[0], e[1]))
-                    self.add_edge(e[0], current)
-        return current
+            while parent[k] != k:
+                # path halving, link k to its grandparent
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+        else:
+            while parent[k] != k:
+                k = parent[k]
+        return k
+
+    def get_node_list(self):
+        '''
+        API:
+            get_node_list(self)
+        Description:
+            Returns list of items, kept for compatibility with the Graph based
+            DisjointSet.
+        '''
+        return list(self.items)
+
+    def get_edge_list(self):
+        '''
+        API:
+            get_edge_list(self)
+        Description:
+            Returns list of (item, parent) links of items that are not roots,
+            kept for compatibility with the Graph based DisjointSet.
+        '''
+        items = self.items
+        return [(items[k], items[self.parent[k]])
+                for k in range(len(items)) if self.parent[k] != k]
+
+    @property
+    def neighbors(self):
+        '''
+        API: neighbors
+        Description:
+        Dictionary of parent links in the format of Graph.neighbors, kept
+        for compatibility with the Graph based DisjointSet. It is built on
+        every access.
+        Return:
+            Returns dictionary that maps every item to {parent:None}, or to
+            an empty dictionary for roots.
+        '''
+        neighbors = dict((i, {}) for i in self.items)
+        for e in self.get_edge_list():
+            neighbors[e[0]][e[1]] = None
+        return neighbors
+
+    @property
+    def sizes(self):
+        '''
+        API: sizes
+        Description:
+        Dictionary of set sizes, kept for compatibility with the Graph based
+        DisjointSet. It is built on every access.
+        Return:
+            Returns dictionary that maps roots to sizes of their sets.
+        '''
+        items = self.items
+        return dict((items[k], self.size[k]) for k in range(len(items))
+                    if self.parent[k] == k)
+
+    def to_graph(self, graph = None):
+        '''
+        API:
+            to_graph(self, graph = None)
+        Description:
+            Returns a directed Graph with an arc from every item to its
+            parent.
+        Input:
+            graph: If given, its arcs are updated to the current parent links
+            instead of creating a new Graph.
+        Return:
+            Returns the Graph.
+        '''
+        if graph is None:
+            graph = Graph(type = DIRECTED_GRAPH, **self.attr)
+        items = self.items
+        for k in range(len(items)):
+            i = items[k]
+            if i not in graph.neighbors:
+                graph.add_node(i)
+            if self.parent[k] == k:
+                parents = []
+            else:
+                parents = [items[self.parent[k]]]
+            if list(graph.neighbors[i]) != parents:
+                for j in list(graph.neighbors[i]):
+                    graph.del_edge((i, j))
+                for j in parents:
+                    graph.add_edge(i, j)
+        return graph
+
+    def display(self):
+        '''
+        API:
+            display(self)
+        Description:
+            Displays parent links of items using Graph.display(). Does
+            nothing if display attribute is 'off' or not given.
+        Post:
+            self.graph will be updated.
+        '''
+        if self.attr.get('display', 'off') == 'off':
+            return
+        self.graph = self.to_graph(self.graph)
+        self.graph.display()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,137 @@
+'''
+Indexed binary heap of dense integer ids.
+
+heapq does not support changing the priority of an item. Algorithms that
+need it push a new entry and skip the old one later (lazy deletion), so the
+heap can hold one entry per arc instead of one per node. IndexedHeap keeps
+ids 0, 1, ..., n-1 in a binary heap and the position of every id in the heap
+in an array, so an id is found in O(1) time and its priority is decreased in
+place in O(log n) time. The heap never holds more than n entries.
+'''
+from __future__ import absolute_import
+from builtins import object
+from builtins import range
+
+from array import array
+
+class IndexedHeap(object):
+    '''
+    Binary min heap of ids with decrease-key. See module documentation.
+    '''
+    def __init__(self, n):
+        '''
+        API: __init__(self, n)
+        Description:
+        Creates an empty heap for ids 0, 1, ..., n-1.
+        Input:
+            n: Number of ids.
+        Post:
+            Sets self.heap, self.position, self.priority and self.size.
+        '''
+        # heap[0:size] are ids in heap order
+        self.heap = array('l', [0])*n
+        # position[i] is the index of id i in heap, -1 if i is not in heap
+        self.position = array('l', [-1])*n
+        self.priority = [None]*n
+        self.size = 0
+
+    def isEmpty(self):
+        '''
+        API: isEmpty(self)
+        Description:
+        Returns True if the heap has no ids, False otherwise.
+        '''
+        return self.size == 0
+
+    def get_priority(self, i):
+        '''
+        API: get_priority(self, i)
+        Description:
+        Returns priority of id i, None if i is not in the heap.
+        '''
+        if self.position[i] == -1:
+            return None
+        return self.priority[i]
+
+    def push(self, i, priority):
+        '''
+        API: push(self, i, priority)
+        Description:
+        Inserts id i with priority. If i is already in the heap its priority
+        is decreased to priority, it is not changed if priority is not
+        smaller.
+        Input:
+            i: Id.
+            priority: Priority of i.
+        '''
+        k = self.position[i]
+        if k == -1:
+            k = self.size
+            self.size += 1
+        elif priority >= self.priority[i]:
+            return
+        self.priority[i] = priority
+        self.sift_up(i, k)
+
+    def pop(self):
+        '''
+        API: pop(self)
+        Description:
+        Removes the id with the smallest priority.
+        Return:
+            Returns (id, priority).
+        '''
+        heap = self.heap
+        i = heap[0]
+        self.position[i] = -1
+        self.size -= 1
+        if self.size:
+            self.sift_down(heap[self.size], 0)
+        return (i, self.priority[i])
+
+    def sift_up(self, i, k):
+        '''
+        API: sift_up(self, i, k)
+        Description:
+        Places id i at index k or above it. Used by push().
+        '''
+        heap = self.heap
+        position = self.position
+        priority = self.priority
+        p = priority[i]
+        while k > 0:
+            parent = (k-1) >> 1
+            j = heap[parent]
+            if priority[j] <= p:
+                break
+            heap[k] = j
+            position[j] = k
+            k = parent
+        heap[k] = i
+        position[i] = k
+
+    def sift_down(self, i, k):
+        '''
+        API: sift_down(self, i, k)
+        Description:
+        Places id i at index k or below it. Used by pop().
+        '''
+        heap = self.heap
+        position = self.position
+        priority = self.priority
+        p = priority[i]
+        size = self.size
+        child = 2*k + 1
+        while child < size:
+            if (child+1 < size and
+                priority[heap[child+1]] < priority[heap[child]]):
+                child += 1
+            j = heap[child]
+            if p <= priority[j]:
+                break
+            heap[k] = j
+            position[j] = k
+            k = child
+            child = 2*k + 1
+        heap[k] = i
+        position[i] = k
@@ -0,0 +1,126 @@
+'''
+Landmark distance tables for A* search with triangle inequality bounds (ALT).
+
+Graph.landmarks() picks k landmark nodes and computes shortest distances from
+every landmark to every node (forward) and from every node to every landmark
+(backward). For a landmark L and nodes n and t, triangle inequality gives
+
+    d(n,t) >= d(L,t) - d(L,n)  and  d(n,t) >= d(n,L) - d(t,L)
+
+so the largest of these over all landmarks is a consistent lower bound on
+d(n,t). Landmarks.heuristic() returns this bound as an A* heuristic that can
+be given to Graph.search() and Graph.search_headless() with algo = 'AStar'.
+
+Tables take O(kn) memory, distances are kept in array('d') with inf for
+nodes that are not reachable. They can be written to a file with save() and
+read back with load(), so preprocessing is done once for a graph. Tables are
+not updated when the graph changes.
+'''
+from __future__ import absolute_import
+from builtins import object
+from builtins import range
+
+import pickle # for dump(), load()
+
+class Landmarks(object):
+    '''
+    Landmark distance tables of a graph. See module documentation.
+    '''
+    def __init__(self, names, landmarks, forward, backward):
+        '''
+        API: __init__(self, names, landmarks, forward, backward)
+        Description:
+        Should not be called directly, see Graph.landmarks() and load().
+        Input:
+            names: List of node names, distance arrays are indexed in this
+            order.
+            landmarks: List of landmark node names.
+            forward: forward[l][i] is the distance from landmarks[l] to
+            names[i].
+            backward: backward[l][i] is the distance from names[i] to
+            landmarks[l].
+        Post:
+            Sets self.names, self.index, self.landmarks, self.forward and
+            self.backward.
+        '''
+        self.names = names
+        self.index = dict((name, i) for i, name in enumerate(names))
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+
+    def heuristic(self, destination):
+        '''
+        API: heuristic(self, destination)
+        Description:
+        Returns A* heuristic function for paths to destination. Value of node
+        n is the largest landmark lower bound on d(n, destination), 0 if
+        there is none, inf if landmark distances show that destination is
+        not reachable from n.
+        Input:
+            destination: Destination node name.
+        Return:
+            Returns a function that takes a node name and returns estimate.
+        '''
+        inf = float('inf')
+        index = self.index
+        t = index[destination]
+        terms = [(self.forward[l], self.forward[l][t],
+                  self.backward[l], self.backward[l][t])
+                 for l in range(len(self.landmarks))]
+        def heuristic(n):
+            i = index[n]
+            best = 0
+            for forward, forward_t, backward, backward_t in terms:
+                # d(L,t) - d(L,n), n is not reachable from L if d(L,n) is inf
+                forward_n = forward[i]
+                if forward_n != inf:
+                    if forward_t == inf:
+                        return inf
+                    if forward_t - forward_n > best:
+                        best = forward_t - forward_n
+                # d(n,L) - d(t,L), L is not reachable from t if d(t,L) is inf
+                if backward_t != inf:
+                    backward_n = backward[i]
+                    if backward_n == inf:
+                        return inf
+                    if backward_n - backward_t > best:
+                        best = backward_n - backward_t
+            return best
+        return heuristic
+
+    def save(self, filename):
+        '''
+        API: save(self, filename)
+        Description:
+        Writes tables to file filename.
+        Input:
+            filename: Name of the file.
+        '''
+        data = {'names':self.names, 'landmarks':self.landmarks,
+                'forward':self.forward, 'backward':self.backward}
+        f = open(filename, 'wb')
+        try:
+            pickle.dump(data, f, 2)
+        finally:
+            f.close()
+
+    @staticmethod
+    def load(filename):
+        '''
+        API: load(filename)
+        Description:
+        Reads tables written by save(). Only read files from trusted
+        sources, the file is unpickled.
+        Input:
+            filename: Name of the file.
+        Return:
+            Returns Landmarks instance.
+        '''
+        f = open(filename, 'rb')
+        try:
+            data = pickle.load(f)
+        finally:
+            f.close()
+        return Landmarks(data['names'], data['landmarks'], data['forward'],
+                         data['backward'])
@@ -0,0 +1,140 @@
+'''
+Dictionary-like view of a matrix indexed by node pairs.
+
+Graph.floyd_warshall() computes all pair shortest paths on dense NumPy
+matrices when NumPy is installed. Keeping the result in a dictionary keyed by
+(i,j) tuples would need n^2 tuples and boxed values, so the result is returned
+as PairMatrix instances instead. A PairMatrix reads entries of the matrix
+when it is indexed with a node pair, so code written for the dictionaries,
+like distance[(i,j)] or nextn[(i,j)], keeps working. Code that needs speed can
+use the matrix and index attributes directly.
+
+Graph.distance_matrix() returns distances from a list of sources to every
+node, rows of the matrix are indexed by sources in that case.
+'''
+from __future__ import absolute_import
+from builtins import object
+
+class PairMatrix(object):
+    '''
+    Read only dictionary-like view of a matrix whose rows and columns are
+    indexed by nodes. See module documentation.
+    '''
+    def __init__(self, matrix, nodes, missing = None, names = None,
+                 rows = None, integer = False):
+        '''
+        API: __init__(self, matrix, nodes, missing = None, names = None,
+                      rows = None, integer = False)
+        Description:
+        Creates a view of matrix.
+        Input:
+            matrix: NumPy array.
+            nodes: List of node names, nodes[k] is the node of column k and
+            of row k if rows is not given.
+            missing: Value returned for entries that do not exist. These are
+            inf entries of a float matrix and -1 entries of an integer
+            matrix.
+            names: If True, entries of matrix are row indices and they are
+            returned as node names. Defaults to True for integer matrices.
+            rows: List of node names of rows, defaults to nodes.
+            integer: If True, entries of a float matrix are returned as int,
+            ie. when the matrix holds sums of integer costs.
+        Post:
+            Sets self.matrix, self.nodes, self.index, self.rows,
+            self.row_index, self.missing, self.names and self.integer.
+        '''
+        self.matrix = matrix
+        self.nodes = nodes
+        self.index = dict((n, k) for k, n in enumerate(nodes))
+        if rows is None:
+            self.rows = nodes
+            self.row_index = self.index
+        else:
+            self.rows = rows
+            self.row_index = dict((n, k) for k, n in enumerate(rows))
+        self.missing = missing
+        if names is None:
+            names = matrix.dtype.kind in 'iu'
+        self.names = names
+        self.integer = integer
+
+    def __getitem__(self, key):
+        '''
+        API: __getitem__(self, key)
+        Description:
+        Returns entry of node pair key, self.missing if the entry does not
+        exist. Raises KeyError if a node of key is not a row or column.
+        '''
+        value = self.matrix[self.row_index[key[0]], self.index[key[1]]]
+        if self.names:
+            if value < 0:
+                return self.missing
+            return self.nodes[value]
+        if value == float('inf'):
+            return self.missing
+        if self.integer:
+            return int(value)
+        return value.item()
+
+    def __contains__(self, key):
+        '''
+        API: __contains__(self, key)
+        Description:
+        Returns True if key is a pair of a row node and a column node.
+        '''
+        try:
+            i, j = key
+        except (TypeError, ValueError):
+            return False
+        return i in self.row_index and j in self.index
+
+    def __iter__(self):
+        '''
+        API: __iter__(self)
+        Description:
+        Returns iterator over node pairs in the order of keys().
+        '''
+        return iter(self.keys())
+
+    def __len__(self):
+        '''
+        API: __len__(self)
+        Description:
+        Returns number of node pairs, number of rows times number of columns.
+        '''
+        return len(self.rows)*len(self.nodes)
+
+    def get(self, key, default = None):
+        '''
+        API: get(self, key, default = None)
+        Description:
+        Returns entry of node pair key, default if key is not a pair of a
+        row node and a column node.
+        '''
+        if key in self:
+            return self[key]
+        return default
+
+    def keys(self):
+        '''
+        API: keys(self)
+        Description:
+        Returns list of all (row node, column node) pairs, row by row.
+        '''
+        return [(i, j) for i in self.rows for j in self.nodes]
+
+    def values(self):
+        '''
+        API: values(self)
+        Description:
+        Returns list of entries in the order of keys().
+        '''
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        '''
+        API: items(self)
+        Description:
+        Returns list of (pair, entry) tuples in the order of keys().
+        '''
+        return [(key, self[key]) for key in self.keys()]
@@ -0,0 +1,126 @@
+'''
+tests if graphs built with add_nodes_from(), add_edges_from() and
+add_edges_from_arrays() are the same as graphs built one edge at a time.
+'''
+from __future__ import print_function
+from builtins import str
+from builtins import range
+
+from gimpy import Graph, DIRECTED_GRAPH, UNDIRECTED_GRAPH, NUMPY_INSTALLED
+from gimpy import MultipleNodeException, MultipleEdgeException
+import random
+
+def generate_edges(seed, numnode, density, graph_type):
+    random.seed(seed)
+    edges = []
+    for i in range(numnode):
+        for j in range(numnode):
+            if graph_type is UNDIRECTED_GRAPH and j < i:
+                continue
+            if random.random() < density:
+                edges.append((i, j, {'cost':random.randint(1,20)}))
+    random.shuffle(edges)
+    return edges
+
+def same_graph(g, h):
+    '''
+    Returns True if g and h have the same nodes, edges and attributes, with
+    nodes and neighbors in the same order.
+    '''
+    if g.get_node_list() != h.get_node_list() or g.edge_attr != h.edge_attr:
+        return False
+    if list(g.edge_attr) != list(h.edge_attr):
+        return False
+    for n in g.get_node_list():
+        if list(g.neighbors[n]) != list(h.neighbors[n]):
+            return False
+        if g.nodes[n].attr != h.nodes[n].attr:
+            return False
+        if (g.graph_type is DIRECTED_GRAPH and
+            list(g.in_neighbors[n]) != list(h.in_neighbors[n])):
+            return False
+    return True
+
+def raises(exception, method, *args, **kargs):
+    try:
+        method(*args, **kargs)
+    except exception:
+        return True
+    return False
+
+if __name__=='__main__':
+    print('Seed'.ljust(5), 'type'.ljust(11), 'edges'.ljust(6),
+          'arrays'.ljust(7), 'numpy')
+    for seed in range(10):
+        for graph_type in [DIRECTED_GRAPH, UNDIRECTED_GRAPH]:
+            edges = generate_edges(seed, 20, 0.2, graph_type)
+            g = Graph(type=graph_type)
+            for i in range(20):
+                g.add_node(i, color='red')
+            for e in edges:
+                g.add_edge(e[0], e[1], capacity=5, **e[2])
+            h = Graph(type=graph_type)
+            h.add_nodes_from(range(20), color='red')
+            h.add_edges_from(edges, capacity=5)
+            same_edges = same_graph(g, h)
+            # columns are given per edge, shared attributes are not
+            # supported, so compare with a graph without them
+            g = Graph(type=graph_type)
+            for i in range(20):
+                g.add_node(i)
+            for e in edges:
+                g.add_edge(e[0], e[1], **e[2])
+            a = Graph(type=graph_type)
+            a.add_nodes_from(list(range(20)))
+            a.add_edges_from_arrays([e[0] for e in edges],
+                                    [e[1] for e in edges],
+                                    cost=[e[2]['cost'] for e in edges])
+            same_arrays = same_graph(g, a)
+            if NUMPY_INSTALLED:
+                import numpy
+                a = Graph(type=graph_type)
+                a.add_nodes_from(numpy.arange(20))
+                a.add_edges_from_arrays(
+                    numpy.array([e[0] for e in edges]),
+                    numpy.array([e[1] for e in edges]),
+                    cost=numpy.array([e[2]['cost'] for e in edges]))
+                # NumPy scalars are converted to Python numbers
+                same_numpy = (same_graph(g, a) and
+                              all(type(n) is int for n in a.nodes) and
+                              all(type(a.edge_attr[e]['cost']) is int
+                                  for e in a.edge_attr))
+            else:
+                same_numpy = None
+            print(str(seed).ljust(5), graph_type.ljust(11),
+                  str(same_edges).ljust(6), str(same_arrays).ljust(7),
+                  str(same_numpy))
+    # attributes of an edge override the shared ones, every edge gets its own
+    # dictionary
+    g = Graph(type=DIRECTED_GRAPH)
+    g.add_edges_from([(0, 1, {'cost':5}), (1, 2)], cost=1, capacity=2)
+    override = (g.edge_attr[(0, 1)] == {'cost':5, 'capacity':2} and
+                g.edge_attr[(1, 2)] == {'cost':1, 'capacity':2})
+    g.set_edge_attr(1, 2, 'capacity', 7)
+    override = override and g.edge_attr[(0, 1)]['capacity'] == 2
+    print('per edge attributes', override)
+    # multiple edges and nodes are rejected
+    multiple = True
+    for graph_type in [DIRECTED_GRAPH, UNDIRECTED_GRAPH]:
+        g = Graph(type=graph_type)
+        g.add_edges_from([(0, 1), (1, 2)])
+        multiple = (multiple and
+                    raises(MultipleEdgeException, g.add_edges_from,
+                           [(2, 3), (2, 3)]) and
+                    raises(MultipleEdgeException, g.add_edges_from,
+                           [(0, 1)]) and
+                    raises(MultipleEdgeException, g.add_edges_from_arrays,
+                           [0], [1]) and
+                    raises(MultipleNodeException, g.add_nodes_from, [4, 4]))
+        # the reversed pair is the same edge only if the graph is undirected
+        reversed_pair = raises(MultipleEdgeException, g.add_edges_from,
+                               [(1, 0)])
+        if graph_type is UNDIRECTED_GRAPH:
+            multiple = multiple and reversed_pair
+        else:
+            multiple = multiple and not reversed_pair
+    print('multiple edges', multiple)
@@ -0,0 +1,117 @@
+'''
+tests if del_node() and del_edge() keep adjacency dictionaries consistent and
+in insertion order.
+'''
+from __future__ import print_function
+from builtins import str
+from builtins import range
+
+from gimpy import Graph, DIRECTED_GRAPH, UNDIRECTED_GRAPH
+import random
+
+def generate_edges(seed, numnode, density, graph_type):
+    # node 0 is a hub connected to every node, including itself
+    random.seed(seed)
+    edges = [(0, 0)]
+    for i in range(1, numnode):
+        if random.random() < 0.5:
+            edges.append((0, i))
+        else:
+            edges.append((i, 0))
+    for i in range(1, numnode):
+        for j in range(1, numnode):
+            if graph_type is UNDIRECTED_GRAPH and j < i:
+                continue
+            if random.random() < density:
+                edges.append((i, j))
+    random.shuffle(edges)
+    return edges
+
+def build_graph(graph_type, nodes, edges):
+    g = Graph(type=graph_type)
+    for n in nodes:
+        g.add_node(n)
+    for e in edges:
+        g.add_edge(e[0], e[1], cost=e[0]+e[1])
+    return g
+
+def consistent(g):
+    # every edge is in the adjacency of its end nodes and nothing else is
+    arcs = 0
+    for (i, j) in g.edge_attr:
+        if j not in g.neighbors[i]:
+            return False
+        if g.graph_type is DIRECTED_GRAPH:
+            if i not in g.in_neighbors[j]:
+                return False
+            arcs += 1
+        else:
+            if i not in g.neighbors[j]:
+                return False
+            arcs += 2 if i != j else 1
+    if sum(len(g.neighbors[n]) for n in g.neighbors) != arcs:
+        return False
+    if g.graph_type is DIRECTED_GRAPH:
+        if sum(len(g.in_neighbors[n]) for n in g.in_neighbors) != arcs:
+            return False
+        if set(g.in_neighbors) != set(g.nodes):
+            return False
+    return set(g.neighbors) == set(g.nodes)
+
+def same_order(g, h):
+    # nodes, edges and neighbors are in the same order in g and h
+    if list(g.nodes) != list(h.nodes):
+        return False
+    if list(g.edge_attr) != list(h.edge_attr):
+        return False
+    for n in g.nodes:
+        if list(g.neighbors[n]) != list(h.neighbors[n]):
+            return False
+        if (g.graph_type is DIRECTED_GRAPH and
+            list(g.in_neighbors[n]) != list(h.in_neighbors[n])):
+            return False
+        if g.get_neighbors(n) != list(h.neighbors[n]):
+            return False
+    return True
+
+if __name__=='__main__':
+    print('Seed'.ljust(5), 'type'.ljust(8), 'hub'.ljust(6), 'edges'.ljust(6),
+          'readd')
+    for seed in range(10):
+        for graph_type in [DIRECTED_GRAPH, UNDIRECTED_GRAPH]:
+            nodes = list(range(30))
+            edges = generate_edges(seed, 30, 0.15, graph_type)
+            g = build_graph(graph_type, nodes, edges)
+            # deleting the hub leaves the graph built without it
+            g.del_node(0)
+            nodes.remove(0)
+            edges = [e for e in edges if 0 not in e]
+            h = build_graph(graph_type, nodes, edges)
+            same_hub = consistent(g) and same_order(g, h)
+            # delete edges, undirected edges are given in both orientations
+            deleted = random.sample(edges, len(edges)//3)
+            for e in deleted:
+                if graph_type is UNDIRECTED_GRAPH and random.random() < 0.5:
+                    g.del_edge((e[1], e[0]))
+                else:
+                    g.del_edge(e)
+            edges = [e for e in edges if e not in deleted]
+            h = build_graph(graph_type, nodes, edges)
+            same_edges = consistent(g) and same_order(g, h)
+            # edges added again go to the end of the adjacency
+            for e in deleted[:5]:
+                g.add_edge(e[0], e[1], cost=e[0]+e[1])
+            edges.extend(deleted[:5])
+            h = build_graph(graph_type, nodes, edges)
+            same_readd = consistent(g) and same_order(g, h)
+            print(str(seed).ljust(5), graph_type.ljust(8),
+                  str(same_hub).ljust(6), str(same_edges).ljust(6),
+                  str(same_readd))
+    # get_neighbors() returns a copy of the adjacency
+    g = Graph(type=DIRECTED_GRAPH)
+    g.add_edge(0, 1)
+    neighbors = g.get_neighbors(0)
+    neighbors.append(2)
+    g.add_edge(0, 3)
+    print('neighbors copy', neighbors == [1, 2] and
+          g.get_neighbors(0) == [1, 3] and g.get_in_neighbors(1) == [0])
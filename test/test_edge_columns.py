@@ -0,0 +1,63 @@
+'''
+tests if algorithms give the same results when numeric edge attributes are
+declared and kept in typed columns.
+'''
+from __future__ import print_function
+from builtins import str
+from builtins import range
+
+from test_algorithms import generate_graph
+import random
+
+# a generator is in the following form (numnode, density, demand_numnode,
+# supply_numnode, demand_range, cost_range, capacity_range)
+
+if __name__=='__main__':
+    generator = (15, 0.4, 3, 2, (5,10), (1,20), (5,20))
+    print('Seed'.ljust(5), 'columns'.ljust(8), 'search'.ljust(7),
+          'max cost'.ljust(9), 'max flow'.ljust(9), 'simplex')
+    for seed in range(10):
+        g = generate_graph(seed, generator)
+        h = generate_graph(seed, generator)
+        h.declare_edge_attr('cost', 'q')
+        h.declare_edge_attr('capacity', 'd')
+        # delete the same edges from both graphs, ids of h are reused
+        random.seed(seed)
+        for e in random.sample(g.get_edge_list(), 5):
+            g.del_edge(e)
+            h.del_edge(e)
+        # columns hold the attributes of edges
+        cost = h.get_edge_column('cost')
+        capacity = h.get_edge_column('capacity')
+        same_columns = (len(cost) == len(g.edge_attr) and
+                        h.edge_attr == g.edge_attr)
+        for e in g.edge_attr:
+            k = h.get_edge_id(e[0], e[1])
+            if (cost[k] != g.get_edge_attr(e[0], e[1], 'cost') or
+                capacity[k] != g.get_edge_attr(e[0], e[1], 'capacity')):
+                same_columns = False
+        # flow and simplex pricing read declared columns by edge id
+        h.declare_edge_attr('flow', 'd')
+        nl = g.get_node_list()
+        same_search = (g.search_headless(nl[0], algo='Dijkstra') ==
+                       h.search_headless(nl[0], algo='Dijkstra') and
+                       g.search_headless(nl[0], algo='Dijkstra',
+                                         queue='Dial') ==
+                       h.search_headless(nl[0], algo='Dijkstra',
+                                         queue='Dial') and
+                       g.search(nl[0], nl[-1],
+                                algo='BidirectionalDijkstra') ==
+                       h.search(nl[0], nl[-1],
+                                algo='BidirectionalDijkstra'))
+        same_max_cost = g.get_max_integer_cost() == h.get_max_integer_cost()
+        g.max_flow(nl[0], nl[-1])
+        h.max_flow(nl[0], nl[-1])
+        same_flow = all(g.edge_attr[e]['flow'] == h.edge_attr[e]['flow']
+                        for e in g.edge_attr)
+        g.min_cost_flow(algo='simplex', pivot='dantzig')
+        h.min_cost_flow(algo='simplex', pivot='dantzig')
+        same_simplex = all(g.edge_attr[e]['flow'] == h.edge_attr[e]['flow']
+                           for e in g.edge_attr)
+        print(str(seed).ljust(5), str(same_columns).ljust(8),
+              str(same_search).ljust(7), str(same_max_cost).ljust(9),
+              str(same_flow).ljust(9), str(same_simplex))
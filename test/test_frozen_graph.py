@@ -0,0 +1,63 @@
+'''
+tests if algorithms run on a frozen snapshot give the same results as the
+ones run on the mutable graph.
+'''
+from __future__ import print_function
+from builtins import str
+from builtins import range
+
+from test_algorithms import generate_graph
+
+# a generator is in the following form (numnode, density, demand_numnode,
+# supply_numnode, demand_range, cost_range, capacity_range)
+
+if __name__=='__main__':
+    generator = (12, 0.4, 3, 2, (5,10), (1,20), (5,20))
+    print('Seed'.ljust(5), 'search'.ljust(8), 'max flow'.ljust(10),
+          'preflow'.ljust(8), 'simplex'.ljust(8), 'frozen simplex')
+    for seed in range(10):
+        g = generate_graph(seed, generator)
+        fg = g.freeze()
+        nl = g.get_node_list()
+        # search
+        same_search = True
+        for algo in ['DFS', 'BFS', 'Dijkstra']:
+            pred = g.search(nl[0], algo=algo)
+            frozen_pred, distance = fg.search(nl[0], algo=algo)
+            frozen_pred = dict((fg.get_node_name(i),
+                                fg.get_node_name(frozen_pred[i]))
+                               for i in range(len(frozen_pred))
+                               if frozen_pred[i] != -1)
+            if pred != frozen_pred:
+                same_search = False
+        # max flow
+        g.max_flow(nl[0], nl[-1])
+        value, flow = fg.max_flow(nl[0], nl[-1])
+        same_flow = flow == [g.edge_attr[e]['flow'] for e in g.edge_attr]
+        # preflow push with display keeps its state in attributes
+        same_preflow = True
+        for algo in ['FIFO', 'SAP', 'HighestLabel']:
+            g.max_flow_preflowpush(nl[0], nl[-1], algo, display='pygame')
+            flow, excess, distance = fg.max_flow_preflowpush(nl[0], nl[-1],
+                                                             algo)
+            if (flow != [g.edge_attr[e]['flow'] for e in g.edge_attr] or
+                excess != [g.get_node_attr(n, 'excess') for n in fg.names]):
+                same_preflow = False
+        g.set_display_mode('off')
+        # min cost flow
+        g.min_cost_flow(algo="simplex", pivot="dantzig")
+        s_cost = 0
+        for e in g.get_edge_list():
+            s_cost += g.get_edge_attr(e[0], e[1], 'flow')*\
+                g.get_edge_attr(e[0], e[1], 'cost')
+        feasible, flow = fg.network_simplex(pivot='dantzig')
+        fg.write_back(g, edge_values={'flow':flow})
+        f_cost = 0
+        for e in g.get_edge_list():
+            f_cost += g.get_edge_attr(e[0], e[1], 'flow')*\
+                g.get_edge_attr(e[0], e[1], 'cost')
+        if not feasible:
+            f_cost = 'infeasible'
+        print(str(seed).ljust(5), str(same_search).ljust(8),
+              str(same_flow).ljust(10), str(same_preflow).ljust(8),
+              str(s_cost).ljust(8), str(f_cost))
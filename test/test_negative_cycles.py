@@ -0,0 +1,121 @@
+'''
+tests if get_negative_cycle() and fifo_label_correcting() agree with a plain
+Bellman-Ford on graphs with negative arc costs.
+'''
+from __future__ import print_function
+from builtins import str
+from builtins import range
+
+from gimpy import Graph, DIRECTED_GRAPH
+import random
+
+def generate_graph(seed, numnode, density, cost_range):
+    random.seed(seed)
+    g = Graph(type=DIRECTED_GRAPH)
+    for i in range(numnode):
+        g.add_node(i)
+    for i in range(numnode):
+        for j in range(numnode):
+            if i != j and random.random() < density:
+                g.add_edge(i, j, cost=random.randint(*cost_range))
+    return g
+
+def bellman_ford(g, source = None):
+    # n-1 rounds of relaxing every arc from source, or from a virtual source
+    # with a 0 cost arc to every node if source is None. Returns distances of
+    # labelled nodes and True if a negative cycle can be reached.
+    if source is None:
+        distance = dict.fromkeys(g.get_node_list(), 0)
+    else:
+        distance = {source:0}
+    for k in range(len(g.get_node_list()) - 1):
+        for (i, j) in g.edge_attr:
+            if i in distance:
+                c = distance[i] + g.edge_attr[(i, j)]['cost']
+                if j not in distance or c < distance[j]:
+                    distance[j] = c
+    negative = False
+    for (i, j) in g.edge_attr:
+        if i in distance and (j not in distance or
+                              distance[i] + g.edge_attr[(i, j)]['cost'] <
+                              distance[j]):
+            negative = True
+    return distance, negative
+
+def negative_cycle(g, cycle):
+    # True if cycle is a list of nodes of a cycle of g with negative cost
+    if cycle is None or len(cycle) == 0:
+        return False
+    cost = 0
+    for k in range(len(cycle)):
+        e = (cycle[k], cycle[(k+1) % len(cycle)])
+        if e not in g.edge_attr:
+            return False
+        cost += g.edge_attr[e]['cost']
+    return cost < 0
+
+def same_labels(g, source):
+    # compares fifo_label_correcting() with bellman_ford() from source
+    distance, negative = bellman_ford(g, source)
+    valid, result = g.fifo_label_correcting(source)
+    if negative:
+        return not valid and negative_cycle(g, result)
+    if not valid:
+        return False
+    for n in g.get_node_list():
+        d = g.get_node_attr(n, 'distance')
+        if n not in distance:
+            if d != 'inf' or n in result:
+                return False
+        elif d != distance[n]:
+            return False
+        elif n != source and (distance[result[n]] +
+                              g.get_edge_attr(result[n], n, 'cost') != d):
+            return False
+    return True
+
+if __name__=='__main__':
+    # length is the number of nodes of the negative cycle found, - if the
+    # graph has none
+    print('Seed'.ljust(5), 'length'.ljust(7), 'cycle'.ljust(6), 'labels')
+    for seed in range(20):
+        g = generate_graph(seed, 15, 0.2, (-3, 15))
+        distance, negative = bellman_ford(g)
+        cycle = g.get_negative_cycle()
+        if negative:
+            same_cycle = negative_cycle(g, cycle)
+        else:
+            same_cycle = cycle is None
+        same = all(same_labels(g, source) for source in g.get_node_list())
+        if cycle is None:
+            length = '-'
+        else:
+            length = len(cycle)
+        print(str(seed).ljust(5), str(length).ljust(7),
+              str(same_cycle).ljust(6), str(same))
+    # negative cycle 9-10-11 of cost -1 behind a long path
+    g = Graph(type=DIRECTED_GRAPH)
+    for i in range(11):
+        g.add_edge(i, i+1, cost=2)
+    g.add_edge(11, 9, cost=-5)
+    found = negative_cycle(g, g.get_negative_cycle())
+    valid, cycle = g.fifo_label_correcting(0)
+    found = found and not valid and negative_cycle(g, cycle)
+    print('negative cycle', found)
+    # negative arcs without a negative cycle
+    g = Graph(type=DIRECTED_GRAPH)
+    for e, c in [((0, 1), 4), ((0, 2), 1), ((2, 1), -3), ((1, 3), -2),
+                 ((2, 3), 2), ((3, 2), 5)]:
+        g.add_edge(e[0], e[1], cost=c)
+    valid, pred = g.fifo_label_correcting(0)
+    distances = [g.get_node_attr(n, 'distance') for n in range(4)]
+    print('negative arcs', g.get_negative_cycle() is None and valid and
+          distances == [0, -2, 1, -4] and same_labels(g, 0))
+    # a zero cost cycle is not negative
+    g = Graph(type=DIRECTED_GRAPH)
+    for e, c in [((0, 1), 1), ((1, 2), -2), ((2, 0), 1), ((2, 3), 1)]:
+        g.add_edge(e[0], e[1], cost=c)
+    valid, pred = g.fifo_label_correcting(0)
+    distances = [g.get_node_attr(n, 'distance') for n in range(4)]
+    print('zero cost cycle', g.get_negative_cycle() is None and valid and
+          distances == [0, 1, -1, 0] and same_labels(g, 0))
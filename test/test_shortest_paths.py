@@ -0,0 +1,148 @@
+'''
+tests if shortest path methods find the same distances.
+'''
+from __future__ import print_function
+from builtins import str
+from builtins import range
+
+from test_algorithms import generate_graph
+from gimpy import Graph, DIRECTED_GRAPH
+
+# a generator is in the following form (numnode, density, demand_numnode,
+# supply_numnode, demand_range, cost_range, capacity_range)
+
+if __name__=='__main__':
+    generator = (15, 0.3, 3, 2, (5,10), (1,20), (5,20))
+    print('Seed'.ljust(5), 'johnson'.ljust(8), 'diameter'.ljust(9),
+          'bidirectional'.ljust(14), 'landmarks'.ljust(10),
+          'hierarchy'.ljust(10), 'dial'.ljust(5), 'multisource')
+    for seed in range(10):
+        g = generate_graph(seed, generator)
+        nl = g.get_node_list()
+        fw_validity, fw_distance, fw_nextn = g.floyd_warshall()
+        j_validity, j_distance, j_nextn = g.johnson()
+        same_johnson = fw_validity == j_validity
+        for i in nl:
+            for j in nl:
+                # ints for int costs, as in floyd_warshall()
+                if (fw_distance[(i,j)] != j_distance[(i,j)] or
+                    type(fw_distance[(i,j)]) != type(j_distance[(i,j)])):
+                    same_johnson = False
+        # diameter is the largest shortest path distance
+        diameter = 0
+        for i in nl:
+            for j in nl:
+                if fw_distance[(i,j)] == 'infinity':
+                    diameter = 'infinity'
+                elif diameter != 'infinity':
+                    diameter = max(diameter, fw_distance[(i,j)])
+        same_diameter = diameter == g.get_diameter(weighted=True)
+        # path from first node to every other node
+        landmarks = g.landmarks(k=3)
+        hierarchy = g.contraction_hierarchy()
+        same_bidirectional = True
+        same_landmarks = True
+        same_hierarchy = True
+        pred, distance = g.search_headless(nl[0], algo='Dijkstra')
+        same_dial = ((pred, distance) ==
+                     g.search_headless(nl[0], algo='Dijkstra', queue='Dial'))
+        same_dial = same_dial and (g.search(nl[0], algo='Dijkstra',
+                                            queue='Dial') == pred)
+        # distances from first three nodes and from the nearest of them
+        matrix = g.distance_matrix(nl[:3])
+        nearest, pred, distance = g.multi_source_search(nl[:3])
+        same_multisource = True
+        for j in nl:
+            lengths = [fw_distance[(i,j)] for i in nl[:3]
+                       if fw_distance[(i,j)] != 'infinity']
+            if [matrix[(i,j)] for i in nl[:3]] != [fw_distance[(i,j)]
+                                                   for i in nl[:3]]:
+                same_multisource = False
+            if lengths and (distance[j] != min(lengths) or
+                            matrix[(nearest[j],j)] != distance[j]):
+                same_multisource = False
+            if not lengths and j in nearest:
+                same_multisource = False
+        for j in nl:
+            path = g.search(nl[0], j, algo='BidirectionalDijkstra')
+            if path is None:
+                length = 'infinity'
+            else:
+                length = 0
+                for k in range(len(path)-1):
+                    length += g.get_edge_attr(path[k], path[k+1], 'cost')
+            if length != fw_distance[(nl[0],j)]:
+                same_bidirectional = False
+            pred, distance = g.search_headless(nl[0], j, algo='AStar',
+                heuristic=landmarks.heuristic(j))
+            if distance.get(j, 'infinity') != fw_distance[(nl[0],j)]:
+                same_landmarks = False
+            length = hierarchy.distance(nl[0], j)
+            if length == float('inf'):
+                length = 'infinity'
+            if length != fw_distance[(nl[0],j)]:
+                same_hierarchy = False
+        print(str(seed).ljust(5), str(same_johnson).ljust(8),
+              str(same_diameter).ljust(9), str(same_bidirectional).ljust(14),
+              str(same_landmarks).ljust(10), str(same_hierarchy).ljust(10),
+              str(same_dial).ljust(5), str(same_multisource))
+    # equal cost paths through nodes whose names can not be compared
+    g = Graph(type=DIRECTED_GRAPH)
+    for e in [('s', 1), ('s', 'a'), (1, 't'), ('a', 't')]:
+        g.add_edge(e[0], e[1], cost=1)
+    path = g.search('s', 't', algo='BidirectionalDijkstra')
+    print('mixed names', path is not None and len(path) == 3)
+    # A* after costs are changed with set_edge_attr(), and directly in
+    # edge_attr followed by clear_cost_cache(). A stale scale overestimates
+    # the cost from 'a', so A* would return the direct arc (s,t)
+    g = Graph(type=DIRECTED_GRAPH)
+    for n, x, y in [('s', 0, 0), ('a', 1, 1), ('t', 2, 0)]:
+        g.add_node(n, locationx=x, locationy=y)
+    for e, c in [(('s', 'a'), 1.5), (('a', 't'), 1.5), (('s', 't'), 2)]:
+        g.add_edge(e[0], e[1], cost=c)
+    g.search_headless('s', 't', algo='AStar')
+    g.set_edge_attr('a', 't', 'cost', 0.2)
+    same_astar = (g.search_headless('s', 't', algo='AStar')[1]['t'] ==
+                  g.search_headless('s', 't', algo='Dijkstra')[1]['t'])
+    g.edge_attr[('a', 't')]['cost'] = 0.1
+    g.clear_cost_cache()
+    same_astar = same_astar and (
+        g.search_headless('s', 't', algo='AStar')[1]['t'] ==
+        g.search_headless('s', 't', algo='Dijkstra')[1]['t'])
+    print('astar after cost change', same_astar)
+    # Dial after a cost is changed with set_edge_attr(), and directly in
+    # edge_attr with and without clear_cost_cache(). A stale or too small
+    # max_cost raises instead of returning wrong distances.
+    g = Graph(type=DIRECTED_GRAPH)
+    for e, c in [((0, 1), 3), ((1, 2), 3), ((0, 2), 5)]:
+        g.add_edge(e[0], e[1], cost=c)
+    g.search_headless(0, algo='Dijkstra', queue='Dial')
+    g.set_edge_attr(0, 2, 'cost', 7)
+    same_dial = (g.search_headless(0, algo='Dijkstra', queue='Dial') ==
+                 g.search_headless(0, algo='Dijkstra'))
+    g.edge_attr[(0, 1)]['cost'] = 8
+    try:
+        g.search_headless(0, algo='Dijkstra', queue='Dial')
+        stale_max_cost = False
+    except Exception:
+        stale_max_cost = True
+    g.clear_cost_cache()
+    same_dial = same_dial and (
+        g.search_headless(0, algo='Dijkstra', queue='Dial') ==
+        g.search_headless(0, algo='Dijkstra'))
+    try:
+        g.search_headless(0, algo='Dijkstra', queue='Dial', max_cost=3)
+        small_max_cost = False
+    except Exception:
+        small_max_cost = True
+    print('dial after cost change', same_dial, stale_max_cost and
+          small_max_cost)
+    # bidirectional search needs a destination
+    try:
+        g.search(0, algo='BidirectionalDijkstra')
+        no_destination = False
+    except KeyError:
+        no_destination = False
+    except Exception:
+        no_destination = True
+    print('bidirectional without destination', no_destination)
@@ -0,0 +1,62 @@
+'''
+tests if minimum spanning tree methods find the same trees.
+'''
+from __future__ import print_function
+from builtins import str
+from builtins import range
+
+from gimpy import Graph, DisjointSet, UNDIRECTED_GRAPH, NUMPY_INSTALLED
+import random
+
+def generate_graph(seed, numnode, density, cost_range):
+    random.seed(seed)
+    g = Graph(type=UNDIRECTED_GRAPH)
+    for i in range(numnode):
+        g.add_node(i)
+    for i in range(numnode):
+        for j in range(i+1, numnode):
+            if random.random() < density:
+                g.add_edge(i, j, cost=random.randint(*cost_range))
+    return g
+
+if __name__=='__main__':
+    print('Seed'.ljust(5), 'headless'.ljust(9), 'filter'.ljust(7),
+          'prim'.ljust(5), 'boruvka'.ljust(8), 'dynamic')
+    for seed in range(10):
+        g = generate_graph(seed, 60, 0.2, (1,10))
+        # textbook version with the displayed union-find
+        edges = g.minimum_spanning_tree_kruskal(
+            components=DisjointSet(optimize=False))
+        weight = sum(g.get_edge_cost(e) for e in edges)
+        same_headless = (g.minimum_spanning_tree_headless() ==
+                         (edges, weight))
+        tree, tree_weight = g.minimum_spanning_tree_headless('FilterKruskal')
+        same_filter = sorted(tree) == sorted(edges) and tree_weight == weight
+        pred, tree_weight = g.minimum_spanning_tree_prim_headless(0)
+        same_prim = (len(pred) == len(edges) and tree_weight == weight and
+                     pred == g.minimum_spanning_tree_prim(0))
+        if NUMPY_INSTALLED:
+            tree, tree_weight = g.minimum_spanning_tree_headless('Boruvka')
+            same_boruvka = (sorted(tree) == sorted(edges) and
+                            tree_weight == weight)
+        else:
+            same_boruvka = None
+        # update edges and compare with a tree of the changed graph
+        dynamic = g.dynamic_minimum_spanning_tree()
+        same_dynamic = dynamic.get_weight() == weight
+        for k in range(20):
+            e = random.choice(g.get_edge_list())
+            if k % 4 == 0:
+                g.del_edge(e)
+                dynamic.del_edge(e)
+            else:
+                cost = random.randint(1,10)
+                g.set_edge_attr(e[0], e[1], 'cost', cost)
+                dynamic.set_edge_cost(e, cost)
+            tree, tree_weight = g.minimum_spanning_tree_headless()
+            if (dynamic.get_weight() != tree_weight or
+                len(dynamic.get_edge_list()) != len(tree)):
+                same_dynamic = False
+        print(str(seed).ljust(5), str(same_headless).ljust(9),
+              str(same_filter).ljust(7), str(same_prim).ljust(5),
+              str(same_boruvka).ljust(8), str(same_dynamic))
@@ -38,3 +38,13 @@ if __name__=='__main__':
     for n in g.get_node_list():
         print(n, g.get_node_attr(n, 'component'))
     g.display()
+    # Kosaraju's algorithm finds the same components as Tarjan's
+    for g in [generate_test_instance1(), generate_test_instance2()]:
+        tarjan = g.tarjan()
+        kosaraju = g.kosaraju(display='off')
+        same = True
+        for i in range(len(tarjan)):
+            for j in range(len(tarjan)):
+                if (tarjan[i] == tarjan[j]) != (kosaraju[i] == kosaraju[j]):
+                    same = False
+        print('kosaraju', same, g.num_components == max(tarjan) + 1)